@@ -1,9 +1,22 @@
 __version__ = "0.0.3"
 
+from .backends import Backend, get_backend, list_backends, register_backend
+
 from .base import BaseRequest
 
 from .coverage import CoverageSample, CoverageRequest, CoverageRecord, CoverageResponse
 
+from .crosslinks import (
+    CrosslinkSample,
+    CrosslinkRequest,
+    CrosslinkRecord,
+    CrosslinkResponse,
+)
+
+from .datavolume import DataVolumeTimeline
+
+from .ephemeris import EphemerisStore
+
 from .geometry import (
     Longitude,
     Latitude,
@@ -27,24 +40,49 @@ from .geometry import (
     FeatureCollection,
 )
 
-from .grids import UniformAngularGrid
+from .grids import EqualAreaGrid, UniformAngularGrid
+
+from .instrumentation import Tracer
+
+from .intervals import IntervalArray
+
+from .io import read_features, write_features
 
 from .access import (
+    AccessConstraints,
     AccessSample,
     AccessRequest,
     AccessRecord,
     AccessResponse,
+    AccessIndex,
+    RepeatTilingRecord,
+    SampleTable,
 )
 
 from .orbits import GeneralPerturbationsOrbitState, Propagator
 
+from .rasters import CoverageRaster
+
 from .satellites import Satellite, Payload
 
+from .service import AnalysisService
+
+from .sketches import RevisitSketch
+
 from .instruments import BasicSensor
 
-from .targets import TargetPoint
+from .targets import TargetPoint, TargetRegion, target_index, target_weights
+
+from .zones import ZoneIndex
 
-from .pointing import PointingSample, PointingRequest, PointingRecord, PointingResponse
+from .pointing import (
+    PointingSample,
+    PointingRequest,
+    PointingRecord,
+    PointingResponse,
+    TrackingMode,
+    TrackingWindow,
+)
 
 from .propagation import (
     PropagationSample,
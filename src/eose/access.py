@@ -1,17 +1,88 @@
-from typing import List, Optional
-from datetime import timedelta
+import json
+from datetime import datetime, timedelta
+from itertools import groupby
+from os import PathLike
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
 
+import numpy as np
 from geopandas import GeoDataFrame
-from pandas import to_timedelta
-from pydantic import AwareDatetime, BaseModel, Field
+from pandas import to_datetime, to_timedelta
+from pydantic import AwareDatetime, BaseModel, Field, PrivateAttr
+import shapely
 
 from .base import BaseRequest
 from .geometry import Point, Feature, FeatureCollection
-from .targets import TargetPoint
-from .utils import Identifier
+from .instrumentation import count, instrumented
+from .io import PathOrStream, write_features
+from .orbits import RepeatCycle
+from .targets import TargetPoint, target_index
+from .utils import CachedValue, Identifier, keyed_cached_property
 from .propagation import PropagationRecord
 
 
+def _target_geometry(targets: List[TargetPoint]) -> np.ndarray:
+    """
+    Builds an array of `shapely` points (one per target) in a single pass.
+    """
+    geometry = np.empty(len(targets), dtype=object)
+    for dimension in (2, 3):
+        index = [
+            i for i, target in enumerate(targets) if len(target.position) == dimension
+        ]
+        if index:
+            geometry[index] = shapely.points(
+                np.array([targets[i].position for i in index], dtype=float)
+            )
+    return geometry
+
+
+def _records_key(response: "AccessResponse") -> tuple:
+    """
+    Returns a snapshot of the target records of a response from which derived
+    values are built (see `keyed_cached_property`).
+    """
+    return (
+        response.start,
+        tuple(
+            (record.target_id, len(record.samples))
+            for record in response.target_records
+        ),
+        tuple(
+            (sample.satellite_id, sample.instrument_id, sample.start, sample.duration)
+            for record in response.target_records
+            for sample in record.samples
+        ),
+    )
+
+
+class AccessConstraints(BaseModel):
+    """
+    Constraints (in addition to the payload field of view) required for access.
+    """
+
+    max_solar_zenith: Optional[float] = Field(
+        None,
+        ge=0,
+        le=180,
+        description="Maximum solar zenith angle (degrees) at the target, e.g., 90 for daylight.",
+    )
+    min_elevation: Optional[float] = Field(
+        None,
+        ge=0,
+        le=90,
+        description="Minimum elevation angle (degrees) of the satellite above the target horizon.",
+    )
+    max_range: Optional[float] = Field(
+        None, gt=0, description="Maximum slant range (meters) to the target."
+    )
+    max_look_angle: Optional[float] = Field(
+        None,
+        ge=0,
+        le=90,
+        description="Maximum look (off-nadir) angle (degrees) from the satellite to the target.",
+    )
+
+
 class AccessRequest(BaseRequest):
     targets: List[TargetPoint] = Field(..., description="Target points.")
     payload_ids: List[Identifier] = Field(
@@ -21,6 +92,9 @@ class AccessRequest(BaseRequest):
         None,
         description="Optional propagation records input, which can be utilized in access calculations.",
     )
+    constraints: Optional[AccessConstraints] = Field(
+        None, description="Optional constraints required for access."
+    )
 
 
 class AccessSample(BaseModel):
@@ -60,33 +134,561 @@ class AccessRecord(BaseModel):
         """
         return target.as_geometry()
 
+    @classmethod
+    def iter_from_features(
+        cls, features: Iterable[Feature]
+    ) -> Iterator[Tuple[TargetPoint, "AccessRecord"]]:
+        """
+        Incrementally creates target points and access records from an iterable
+        of access sample GeoJSON `Feature` objects (see `AccessResponse.iter_features`).
+
+        Consecutive features with the same `target_id` are grouped into one record.
+        """
+        for target_id, group in groupby(
+            features, key=lambda feature: feature.properties.get("target_id")
+        ):
+            group = list(group)
+            yield (
+                TargetPoint(id=target_id, position=group[0].geometry.coordinates),
+                cls(
+                    target_id=target_id,
+                    samples=[
+                        {
+                            key: value
+                            for key, value in feature.properties.items()
+                            if key != "target_id"
+                        }
+                        for feature in group
+                    ],
+                ),
+            )
+
+
+class RepeatTilingRecord(BaseModel):
+    satellite_id: Identifier = Field(..., description="Satellite identifier.")
+    cycle: RepeatCycle = Field(
+        ..., description="Repeat ground track cycle from which access is tiled."
+    )
+    drift: float = Field(
+        ...,
+        ge=0,
+        description="Ground track drift accumulated over the request (decimal degrees of longitude at the equator), bounding the error of tiled access.",
+    )
+    time_error: timedelta = Field(
+        ...,
+        ge=0,
+        description="Maximum shift of tiled access samples snapped to the time grid.",
+    )
+
 
 class AccessResponse(AccessRequest):
     target_records: List[AccessRecord] = Field([], description="Access results")
+    tiling_records: List[RepeatTilingRecord] = Field(
+        [],
+        description="Satellites whose access is tiled from a repeat ground track cycle.",
+    )
+
+    _index_cache: CachedValue = PrivateAttr(default_factory=CachedValue)
+
+    def iter_features(self) -> Iterator[Feature]:
+        """
+        Iterates over this access response as GeoJSON `Feature` objects (one per sample).
+        """
+        targets = {target.id: target for target in self.targets}
+        for record in self.target_records:
+            for sample in record.samples:
+                yield sample.as_feature(targets[record.target_id])
 
     def as_features(self) -> FeatureCollection:
         """
         Converts this access response to a GeoJSON `FeatureCollection`.
         """
         return FeatureCollection(
-            type="FeatureCollection",
-            features=[
-                sample.as_feature(
-                    next(
-                        target
-                        for target in self.targets
-                        if target.id == record.target_id
-                    )
-                )
-                for record in self.target_records
-                for sample in record.samples
-            ],
+            type="FeatureCollection", features=list(self.iter_features())
         )
 
+    def write_features(
+        self, path_or_stream: PathOrStream, newline_delimited: bool = False
+    ) -> None:
+        """
+        Writes this response as GeoJSON (or newline-delimited GeoJSON) features
+        to a file path or text stream without building a `FeatureCollection`.
+        """
+        write_features(self.iter_features(), path_or_stream, newline_delimited)
+
+    @keyed_cached_property(_records_key)
+    def index(self) -> "AccessIndex":
+        """
+        Returns a temporal index of this access response (built on first use
+        and rebuilt if records or samples change).
+        """
+        return AccessIndex.from_response(self)
+
+    def to_sample_table(self) -> "SampleTable":
+        """
+        Encodes the samples of this response as a `SampleTable`.
+        """
+        return SampleTable.from_records(self.start, self.target_records)
+
+    @instrumented()
+    def to_compact(self) -> dict:
+        """
+        Converts this response to a JSON-compatible dictionary with
+        dictionary-encoded samples (see `SampleTable`) in place of the samples
+        of each record. Only the fields of access (and coverage) samples are
+        encoded.
+        """
+        data = self.model_dump(
+            mode="json", exclude={"target_records": {"__all__": {"samples"}}}
+        )
+        data["samples"] = self.to_sample_table().as_dict()
+        return data
+
+    @classmethod
+    @instrumented()
+    def from_compact(cls, data: dict) -> "AccessResponse":
+        """
+        Creates a response from a dictionary with dictionary-encoded samples
+        (see `to_compact`).
+        """
+        data = dict(data)
+        table = SampleTable.from_dict(data.pop("samples"))
+        data["target_records"] = [
+            dict(record, samples=samples)
+            for record, samples in zip(data["target_records"], table.iter_samples())
+        ]
+        count("samples", len(table))
+        return cls.model_validate(data)
+
+    @instrumented()
     def as_dataframe(self) -> GeoDataFrame:
         """
         Converts this access response to a `geopandas.GeoDataFrame`.
         """
-        gdf = GeoDataFrame.from_features(self.as_features())
-        gdf["duration"] = to_timedelta(gdf["duration"])  # helper for type coersion
-        return gdf
+        samples = [
+            (record.target_id, sample)
+            for record in self.target_records
+            for sample in record.samples
+        ]
+        target_ids = [target_id for target_id, _ in samples]
+        count("samples", len(samples))
+        return GeoDataFrame(
+            {
+                "target_id": target_ids,
+                "satellite_id": [sample.satellite_id for _, sample in samples],
+                "instrument_id": [sample.instrument_id for _, sample in samples],
+                "start": to_datetime([sample.start for _, sample in samples], utc=True),
+                "duration": to_timedelta([sample.duration for _, sample in samples]),
+            },
+            geometry=_target_geometry(self.targets)[
+                target_index(self.targets, target_ids)
+            ],
+        )
+
+
+class SampleTable:
+    """
+    Dictionary-encoded access (or coverage) samples of a response.
+
+    Satellite and instrument identifiers are stored once in lookup tables and
+    referenced by integer codes; sample start times are integer microseconds
+    from the response start and durations (and revisits, `-1` if undefined)
+    are integer microseconds (the full precision of `timedelta`). Samples are
+    ordered by record (target index) as in the response (see
+    `AccessResponse.to_compact`).
+    """
+
+    def __init__(
+        self,
+        start: datetime,
+        target_ids: List[Identifier],
+        satellite_ids: List[Identifier],
+        instrument_ids: List[Identifier],
+        target: np.ndarray,
+        satellite: np.ndarray,
+        instrument: np.ndarray,
+        sample_start: np.ndarray,
+        duration: np.ndarray,
+        revisit: Optional[np.ndarray] = None,
+    ):
+        self.start = start
+        self.target_ids = target_ids
+        self.satellite_ids = satellite_ids
+        self.instrument_ids = instrument_ids
+        self.target = np.asarray(target, dtype=np.int32)
+        self.satellite = np.asarray(satellite, dtype=np.int32)
+        self.instrument = np.asarray(instrument, dtype=np.int32)
+        self.sample_start = np.asarray(sample_start, dtype=np.int64)
+        self.duration = np.asarray(duration, dtype=np.int64)
+        self.revisit = None if revisit is None else np.asarray(revisit, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.sample_start)
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Returns the number of bytes of the sample arrays.
+        """
+        return sum(
+            array.nbytes
+            for array in (
+                self.target,
+                self.satellite,
+                self.instrument,
+                self.sample_start,
+                self.duration,
+                self.revisit,
+            )
+            if array is not None
+        )
+
+    @classmethod
+    def from_records(
+        cls, start: datetime, records: List[AccessRecord], revisit: bool = False
+    ) -> "SampleTable":
+        """
+        Encodes the samples of access (or, with `revisit`, coverage) records.
+        """
+        samples = [sample for record in records for sample in record.samples]
+        satellite_codes = {}
+        instrument_codes = {}
+        satellite = np.array(
+            [
+                satellite_codes.setdefault(sample.satellite_id, len(satellite_codes))
+                for sample in samples
+            ],
+            dtype=np.int32,
+        )
+        instrument = np.array(
+            [
+                instrument_codes.setdefault(sample.instrument_id, len(instrument_codes))
+                for sample in samples
+            ],
+            dtype=np.int32,
+        )
+        unit = timedelta(microseconds=1)
+        return cls(
+            start,
+            [record.target_id for record in records],
+            list(satellite_codes),
+            list(instrument_codes),
+            np.repeat(
+                np.arange(len(records)), [len(record.samples) for record in records]
+            ),
+            satellite,
+            instrument,
+            np.array(
+                [(sample.start - start) // unit for sample in samples], dtype=np.int64
+            ),
+            np.array([sample.duration // unit for sample in samples], dtype=np.int64),
+            (
+                np.array(
+                    [
+                        (-1 if sample.revisit is None else sample.revisit // unit)
+                        for sample in samples
+                    ],
+                    dtype=np.int64,
+                )
+                if revisit
+                else None
+            ),
+        )
+
+    def iter_samples(self) -> Iterator[List[dict]]:
+        """
+        Iterates over the decoded sample fields of each record.
+        """
+        bounds = np.searchsorted(self.target, np.arange(len(self.target_ids) + 1))
+        columns = [
+            [self.satellite_ids[k] for k in self.satellite.tolist()],
+            [self.instrument_ids[k] for k in self.instrument.tolist()],
+            self.sample_start.tolist(),
+            self.duration.tolist(),
+            [None] * len(self) if self.revisit is None else self.revisit.tolist(),
+        ]
+        for i, j in zip(bounds[:-1].tolist(), bounds[1:].tolist()):
+            yield [
+                dict(
+                    satellite_id=satellite_id,
+                    instrument_id=instrument_id,
+                    start=self.start + timedelta(microseconds=start),
+                    duration=timedelta(microseconds=duration),
+                    **(
+                        {}
+                        if self.revisit is None
+                        else {
+                            "revisit": (
+                                None if revisit < 0 else timedelta(microseconds=revisit)
+                            )
+                        }
+                    ),
+                )
+                for satellite_id, instrument_id, start, duration, revisit in zip(
+                    *(column[i:j] for column in columns)
+                )
+            ]
+
+    def as_dict(self) -> dict:
+        """
+        Converts this table to a JSON-compatible dictionary (with the number of
+        samples of each record in place of target indices).
+        """
+        return dict(
+            start=self.start.isoformat(),
+            target_ids=self.target_ids,
+            satellite_ids=self.satellite_ids,
+            instrument_ids=self.instrument_ids,
+            number_samples=np.bincount(
+                self.target, minlength=len(self.target_ids)
+            ).tolist(),
+            satellite=self.satellite.tolist(),
+            instrument=self.instrument.tolist(),
+            start_offset=self.sample_start.tolist(),
+            duration=self.duration.tolist(),
+            **({} if self.revisit is None else {"revisit": self.revisit.tolist()}),
+        )
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "SampleTable":
+        """
+        Creates a table from a dictionary (see `as_dict`).
+        """
+        return cls(
+            datetime.fromisoformat(data["start"]),
+            data["target_ids"],
+            data["satellite_ids"],
+            data["instrument_ids"],
+            np.repeat(np.arange(len(data["target_ids"])), data["number_samples"]),
+            data["satellite"],
+            data["instrument"],
+            data["start_offset"],
+            data["duration"],
+            data.get("revisit"),
+        )
+
+
+class AccessIndex:
+    """
+    Temporal index of access samples by satellite.
+
+    Samples are stored as arrays sorted by satellite and start time (integer
+    microseconds from the response start) so that window and point-in-time
+    queries cost O(log n + k) for n samples of a satellite and k results.
+    """
+
+    def __init__(
+        self,
+        start: datetime,
+        satellite_ids: List[Identifier],
+        instrument_ids: List[Identifier],
+        target_ids: List[Identifier],
+        sample_start: np.ndarray,
+        sample_end: np.ndarray,
+        satellite: np.ndarray,
+        instrument: np.ndarray,
+        target: np.ndarray,
+    ):
+        self.start = start
+        self.satellite_ids = satellite_ids
+        self.instrument_ids = instrument_ids
+        self.target_ids = target_ids
+        self.sample_start = sample_start
+        self.sample_end = sample_end
+        self.satellite = satellite
+        self.instrument = instrument
+        self.target = target
+        self._satellite_codes = {
+            value: code for code, value in enumerate(satellite_ids)
+        }
+        self._bounds = np.searchsorted(satellite, np.arange(len(satellite_ids) + 1))
+        # longest sample per satellite bounds the search for overlapping samples
+        self._max_duration = np.array(
+            [
+                np.max(sample_end[i:j] - sample_start[i:j], initial=0)
+                for i, j in zip(self._bounds[:-1], self._bounds[1:])
+            ],
+            dtype=np.int64,
+        )
+
+    def __len__(self) -> int:
+        return len(self.sample_start)
+
+    @classmethod
+    def from_response(cls, response: AccessResponse) -> "AccessIndex":
+        """
+        Builds a temporal index of an access response.
+        """
+        samples = [
+            (k, sample)
+            for k, record in enumerate(response.target_records)
+            for sample in record.samples
+        ]
+        satellite_ids = list(
+            dict.fromkeys(sample.satellite_id for _, sample in samples)
+        )
+        instrument_ids = list(
+            dict.fromkeys(sample.instrument_id for _, sample in samples)
+        )
+        satellite_codes = {value: code for code, value in enumerate(satellite_ids)}
+        instrument_codes = {value: code for code, value in enumerate(instrument_ids)}
+        unit = timedelta(microseconds=1)
+        start = np.array(
+            [(sample.start - response.start) // unit for _, sample in samples],
+            dtype=np.int64,
+        )
+        end = start + np.array(
+            [sample.duration // unit for _, sample in samples], dtype=np.int64
+        )
+        satellite = np.array(
+            [satellite_codes[sample.satellite_id] for _, sample in samples],
+            dtype=np.int32,
+        )
+        order = np.lexsort((start, satellite))
+        return cls(
+            response.start,
+            satellite_ids,
+            instrument_ids,
+            [record.target_id for record in response.target_records],
+            start[order],
+            end[order],
+            satellite[order],
+            np.array(
+                [instrument_codes[sample.instrument_id] for _, sample in samples],
+                dtype=np.int32,
+            )[order],
+            np.array([k for k, _ in samples], dtype=np.int32)[order],
+        )
+
+    def _offset(self, time: datetime) -> int:
+        return (time - self.start) // timedelta(microseconds=1)
+
+    def query(
+        self,
+        start: datetime,
+        end: Optional[datetime] = None,
+        satellite_id: Optional[Identifier] = None,
+        instrument_id: Optional[Identifier] = None,
+    ) -> np.ndarray:
+        """
+        Returns the positions of samples overlapping a time window (or a point
+        in time if `end` is not defined) for one or all satellites.
+        """
+        lower = self._offset(start)
+        upper = lower if end is None else self._offset(end)
+        if satellite_id is None:
+            codes = range(len(self.satellite_ids))
+        elif satellite_id in self._satellite_codes:
+            codes = [self._satellite_codes[satellite_id]]
+        else:
+            codes = []
+        positions = []
+        for code in codes:
+            i, j = self._bounds[code], self._bounds[code + 1]
+            first = i + np.searchsorted(
+                self.sample_start[i:j], lower - self._max_duration[code], side="left"
+            )
+            last = i + np.searchsorted(self.sample_start[i:j], upper, side="right")
+            candidates = np.arange(first, last)
+            positions.append(candidates[self.sample_end[candidates] >= lower])
+        positions = (
+            np.concatenate(positions) if positions else np.empty(0, dtype=np.int64)
+        )
+        if instrument_id is not None:
+            positions = positions[
+                self.instrument[positions]
+                == (
+                    self.instrument_ids.index(instrument_id)
+                    if instrument_id in self.instrument_ids
+                    else -1
+                )
+            ]
+        return positions
+
+    def get_samples(
+        self,
+        start: datetime,
+        end: Optional[datetime] = None,
+        satellite_id: Optional[Identifier] = None,
+        instrument_id: Optional[Identifier] = None,
+    ) -> List[Tuple[Identifier, AccessSample]]:
+        """
+        Returns the (target identifier, access sample) pairs overlapping a time
+        window (or a point in time if `end` is not defined).
+        """
+        return [
+            (
+                self.target_ids[self.target[k]],
+                AccessSample(
+                    satellite_id=self.satellite_ids[self.satellite[k]],
+                    instrument_id=self.instrument_ids[self.instrument[k]],
+                    start=self.start
+                    + timedelta(microseconds=int(self.sample_start[k])),
+                    duration=timedelta(
+                        microseconds=int(self.sample_end[k] - self.sample_start[k])
+                    ),
+                ),
+            )
+            for k in self.query(start, end, satellite_id, instrument_id).tolist()
+        ]
+
+    def get_target_ids(
+        self,
+        start: datetime,
+        end: Optional[datetime] = None,
+        satellite_id: Optional[Identifier] = None,
+        instrument_id: Optional[Identifier] = None,
+    ) -> List[Identifier]:
+        """
+        Returns the identifiers of targets accessed during a time window (or at
+        a point in time if `end` is not defined).
+        """
+        return [
+            self.target_ids[k]
+            for k in np.unique(
+                self.target[self.query(start, end, satellite_id, instrument_id)]
+            ).tolist()
+        ]
+
+    def save(self, path: Union[str, PathLike]) -> None:
+        """
+        Saves this index to a NumPy `.npz` file.
+        """
+        with open(path, "wb") as file:
+            np.savez_compressed(
+                file,
+                header=np.array(
+                    json.dumps(
+                        {
+                            "start": self.start.isoformat(),
+                            "satellite_ids": self.satellite_ids,
+                            "instrument_ids": self.instrument_ids,
+                            "target_ids": self.target_ids,
+                        }
+                    )
+                ),
+                sample_start=self.sample_start,
+                sample_end=self.sample_end,
+                satellite=self.satellite,
+                instrument=self.instrument,
+                target=self.target,
+            )
+
+    @classmethod
+    def load(cls, path: Union[str, PathLike]) -> "AccessIndex":
+        """
+        Loads an index from a NumPy `.npz` file.
+        """
+        with np.load(path) as data:
+            header = json.loads(str(data["header"]))
+            return cls(
+                datetime.fromisoformat(header["start"]),
+                header["satellite_ids"],
+                header["instrument_ids"],
+                header["target_ids"],
+                data["sample_start"],
+                data["sample_end"],
+                data["satellite"],
+                data["instrument"],
+                data["target"],
+            )
@@ -0,0 +1,1351 @@
+"""
+Built-in reference implementations of the analysis functions.
+
+Provides vectorized, in-memory implementations of SGP4 propagation, fixed
+pointing, geometric access, coverage, crosslink visibility and basic data
+metrics analyses so that the request and response models can be exercised
+without an external toolkit.
+
+Access is purely geometric: a target is accessed at a time step if it lies
+within the payload field of view (for a nadir-pointing spacecraft) and above
+the local horizon. Accesses are sampled at the request `time_step`, so each
+access sample spans its first to last visible time step. Access of satellites
+in repeat ground track orbits is computed for one cycle and tiled in time.
+"""
+
+import math
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from sgp4.api import SatrecArray, jday
+
+from .access import (
+    AccessConstraints,
+    AccessRecord,
+    AccessRequest,
+    AccessResponse,
+    AccessSample,
+    RepeatTilingRecord,
+)
+from .base import BaseRequest
+from .coverage import CoverageRecord, CoverageRequest, CoverageResponse, CoverageSample
+from .crosslinks import (
+    CrosslinkRecord,
+    CrosslinkRequest,
+    CrosslinkResponse,
+    CrosslinkSample,
+)
+from .datametrics import (
+    BasicSensorDataMetricsInstantaneous,
+    DataMetricsRecord,
+    DataMetricsRequest,
+    DataMetricsResponse,
+    DataMetricsSample,
+)
+from .frames import (
+    geodetic_to_itrs,
+    get_sun_position,
+    itrs_to_geodetic,
+    time_grid,
+    transform,
+)
+from .grids import UniformAngularGrid
+from .instrumentation import count, instrumented, span
+from .intervals import IntervalArray, merge_runs
+from .instruments import (
+    BasicSensor,
+    CircularGeometry,
+    PassiveOpticalScanner,
+    RectangularGeometry,
+    SinglePolStripMapSAR,
+)
+from .orbits import GeneralPerturbationsOrbitState, Propagator, RepeatCycle
+from .pointing import (
+    PointingRecord,
+    PointingRequest,
+    PointingResponse,
+    PointingSample,
+    TrackingMode,
+)
+from .propagation import (
+    PropagationRecord,
+    PropagationRequest,
+    PropagationResponse,
+    PropagationSample,
+)
+from .rasters import CoverageRaster
+from .satellites import Payload, Satellite
+from .targets import TargetPoint, target_weights
+from .utils import CartesianReferenceFrame, FixedOrientation, Identifier
+
+AnyPayload = Union[Payload, BasicSensor, PassiveOpticalScanner, SinglePolStripMapSAR]
+
+#: Maximum number of (time step, target) pairs screened at once during access.
+ACCESS_CHUNK_SIZE = 2**22
+
+#: Maximum ground track drift (decimal degrees of longitude at the equator)
+#: accumulated over a request to tile access from a repeat ground track cycle.
+REPEAT_TOLERANCE = 0.01
+
+#: Maximum repeat ground track cycle length (nodal days) detected.
+REPEAT_MAX_DAYS = 30
+
+#: Radius (m) of the spherical Earth occluding crosslinks (WGS 84 equatorial).
+EARTH_RADIUS = 6378137.0
+
+# forward neighbor cell offsets (with the same cell) of a cubic spatial hash
+_NEIGHBOR_OFFSETS = [
+    (dx, dy, dz)
+    for dx in (-1, 0, 1)
+    for dy in (-1, 0, 1)
+    for dz in (-1, 0, 1)
+    if (dx, dy, dz) >= (0, 0, 0)
+]
+
+
+def get_time_grid(request: BaseRequest) -> Tuple[datetime, ...]:
+    """
+    Enumerates the propagation time steps of a request.
+    """
+    return time_grid(request.start, request.duration, request.time_step)
+
+
+@instrumented()
+def propagate_states(
+    satellites: Sequence[Satellite],
+    times: Sequence[datetime],
+    frame: CartesianReferenceFrame = CartesianReferenceFrame.ICRF,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Propagates satellites with SGP4 to an array of times.
+
+    Returns (S,N,3) position (m) and velocity (m/s) arrays in a frame, with
+    `NaN` values where SGP4 reports an error (e.g., orbit decay).
+    """
+    times = tuple(times)
+    epoch = times[0].astimezone(timezone.utc)
+    jd, fr = jday(
+        epoch.year,
+        epoch.month,
+        epoch.day,
+        epoch.hour,
+        epoch.minute,
+        epoch.second + epoch.microsecond / 1e6,
+    )
+    offsets = np.array([(time - times[0]).total_seconds() for time in times])
+    error, position, velocity = SatrecArray(
+        [satellite.orbit.to_satrec() for satellite in satellites]
+    ).sgp4(np.full(len(times), jd), fr + offsets / 86400)
+    position[error != 0] = np.nan
+    velocity[error != 0] = np.nan
+    return transform(
+        position * 1000, velocity * 1000, CartesianReferenceFrame.TEME, frame, times
+    )
+
+
+@instrumented()
+def propagate(request: PropagationRequest) -> PropagationResponse:
+    """
+    Propagates the satellites of a request on its time grid with SGP4.
+    """
+    if request.propagator != Propagator.SGP4:
+        raise RuntimeError("Built-in propagation only supports SGP4 propagator.")
+    times = get_time_grid(request)
+    position, velocity = propagate_states(request.satellites, times, request.frame)
+    return assemble_propagation(request, times, position, velocity)
+
+
+def assemble_propagation(
+    request: PropagationRequest,
+    times: Sequence[datetime],
+    position: np.ndarray,
+    velocity: np.ndarray,
+) -> PropagationResponse:
+    """
+    Assembles a propagation response from (S,N,3) position (m) and velocity
+    (m/s) arrays of the request satellites at each time.
+    """
+    count("satellites", len(request.satellites))
+    count("samples", len(request.satellites) * len(times))
+    with span("PropagationResponse.validate"):
+        return PropagationResponse(
+            **request.model_dump(exclude="satellite_records"),
+            satellite_records=[
+                PropagationRecord(
+                    satellite_id=satellite.id,
+                    samples=[
+                        PropagationSample(time=time, position=r, velocity=v)
+                        for time, r, v in zip(
+                            times, position[i].tolist(), velocity[i].tolist()
+                        )
+                    ],
+                )
+                for i, satellite in enumerate(request.satellites)
+            ],
+        )
+
+
+@instrumented()
+def pointing(request: PointingRequest) -> PointingResponse:
+    """
+    Assigns the requested fixed orientation to every propagation sample or,
+    in target tracking mode, tracks targets (see `track_targets`).
+    """
+    if request.mode == TrackingMode.TARGET_TRACKING:
+        return track_targets(request)
+    count("samples", sum(len(record.samples) for record in request.satellite_records))
+    return PointingResponse(
+        **request.model_dump(exclude="satellite_records"),
+        satellite_records=[
+            PointingRecord(
+                **record.model_dump(exclude="samples"),
+                samples=[
+                    PointingSample(
+                        **sample.model_dump(
+                            exclude=["body_orientation", "view_orientation"]
+                        ),
+                        body_orientation=request.mode,
+                        view_orientation=[0, 0, 0, 1],
+                    )
+                    for sample in record.samples
+                ],
+            )
+            for record in request.satellite_records
+        ],
+    )
+
+
+def view_quaternions(line_of_sight: np.ndarray) -> np.ndarray:
+    """
+    Computes (K,4) (x,y,z,w) quaternions of the shortest rotations from the
+    body-fixed Z-axis to (K,3) lines of sight in the body-fixed frame.
+    """
+    u = line_of_sight / np.linalg.norm(line_of_sight, axis=-1, keepdims=True)
+    quaternion = np.column_stack((-u[:, 1], u[:, 0], np.zeros(len(u)), 1 + u[:, 2]))
+    # rotate about the X-axis if the line of sight is opposite the Z-axis
+    quaternion[quaternion[:, 3] < 1e-12] = [1, 0, 0, 0]
+    return quaternion / np.linalg.norm(quaternion, axis=-1, keepdims=True)
+
+
+@instrumented()
+def track_targets(request: PointingRequest) -> PointingResponse:
+    """
+    Points the instrument view of nadir-pointing satellites at targets during
+    tracking windows.
+
+    At each sample, a satellite tracks the target of its first (highest
+    priority) active window if the target is above the local horizon;
+    otherwise the view remains along the body-fixed Z-axis. View quaternions,
+    slew angles and slew rates (angle between consecutive view directions
+    over elapsed time) are computed for all samples of a satellite at once.
+    Windows whose peak slew rate (including acquisition from the prior
+    sample) exceeds `max_slew_rate` are flagged as infeasible.
+    """
+    targets, normals = _target_positions(request.targets)
+    lookup = {target.id: k for k, target in enumerate(request.targets)}
+    unit = timedelta(microseconds=1)
+    records = []
+    for record in request.satellite_records:
+        times = tuple(sample.time for sample in record.samples)
+        position, velocity = transform(
+            np.array([sample.position for sample in record.samples]).reshape(-1, 3),
+            np.array([sample.velocity for sample in record.samples]).reshape(-1, 3),
+            request.frame,
+            CartesianReferenceFrame.ITRS,
+            times,
+        )
+        offsets = np.array([(time - request.start) // unit for time in times])
+        windows = [
+            window
+            for window in request.windows
+            if window.satellite_id is None or window.satellite_id == record.satellite_id
+        ]
+        first = np.searchsorted(
+            offsets, [(w.start - request.start) // unit for w in windows], side="left"
+        )
+        last = np.searchsorted(
+            offsets,
+            [(w.start + w.duration - request.start) // unit for w in windows],
+            side="right",
+        )
+        target = np.full(len(times), -1)
+        for window, i, j in reversed(list(zip(windows, first, last))):
+            target[i:j] = lookup[window.target_id]
+        active = np.flatnonzero(target >= 0)
+        line_of_sight = targets[target[active]] - position[active]
+        hidden = np.einsum("ij,ij->i", -line_of_sight, normals[target[active]]) <= 0
+        target[active[hidden]] = -1
+        active, line_of_sight = active[~hidden], line_of_sight[~hidden]
+        axes = nadir_frame(position, velocity, FixedOrientation.NADIR_GEOCENTRIC)
+        body = np.einsum("kij,kj->ki", axes[active], line_of_sight)
+        view = np.tile([0.0, 0.0, 0.0, 1.0], (len(times), 1))
+        view[active] = view_quaternions(body)
+        direction = np.tile([0.0, 0.0, 1.0], (len(times), 1))
+        direction[active] = body / np.linalg.norm(body, axis=-1, keepdims=True)
+        slew_angle = np.degrees(np.arccos(np.clip(direction[:, 2], -1, 1)))
+        slew_rate = np.zeros(len(times))
+        slew_rate[1:] = np.degrees(
+            np.arccos(
+                np.clip(np.einsum("ij,ij->i", direction[1:], direction[:-1]), -1, 1)
+            )
+        ) / np.maximum(np.diff(offsets) * 1e-6, 1e-6)
+        evaluated = []
+        for window, i, j in zip(windows, first, last):
+            rates = slew_rate[i:j][target[i:j] == lookup[window.target_id]]
+            peak = None if len(rates) == 0 else float(np.max(rates))
+            evaluated.append(
+                window.model_copy(
+                    update=dict(
+                        peak_slew_rate=peak,
+                        feasible=(
+                            None
+                            if peak is None or request.max_slew_rate is None
+                            else peak <= request.max_slew_rate
+                        ),
+                    )
+                )
+            )
+        count("samples", len(times))
+        count("windows", len(windows))
+        target_ids = [None if k < 0 else request.targets[k].id for k in target.tolist()]
+        records.append(
+            PointingRecord(
+                **record.model_dump(exclude=["samples", "windows"]),
+                samples=[
+                    PointingSample(
+                        **sample.model_dump(
+                            exclude=[
+                                "body_orientation",
+                                "view_orientation",
+                                "target_id",
+                                "slew_angle",
+                            ]
+                        ),
+                        body_orientation=FixedOrientation.NADIR_GEOCENTRIC,
+                        view_orientation=q,
+                        target_id=target_id,
+                        slew_angle=None if target_id is None else angle,
+                    )
+                    for sample, q, target_id, angle in zip(
+                        record.samples, view.tolist(), target_ids, slew_angle.tolist()
+                    )
+                ],
+                windows=evaluated,
+            )
+        )
+    return PointingResponse(
+        **request.model_dump(exclude="satellite_records"), satellite_records=records
+    )
+
+
+def quaternion_matrix(quaternion: Sequence[float]) -> np.ndarray:
+    """
+    Converts a (x,y,z,w) quaternion to a (3,3) rotation matrix.
+    """
+    x, y, z, w = np.asarray(quaternion, dtype=float) / np.linalg.norm(quaternion)
+    return np.array(
+        [
+            [1 - 2 * (y * y + z * z), 2 * (x * y - z * w), 2 * (x * z + y * w)],
+            [2 * (x * y + z * w), 1 - 2 * (x * x + z * z), 2 * (y * z - x * w)],
+            [2 * (x * z - y * w), 2 * (y * z + x * w), 1 - 2 * (x * x + y * y)],
+        ]
+    )
+
+
+def nadir_frame(
+    position: np.ndarray, velocity: np.ndarray, orientation: FixedOrientation
+) -> np.ndarray:
+    """
+    Computes (N,3,3) nadir-pointing frame axes (rows X, Y, Z) from (N,3) ITRS
+    positions and velocities (see `FixedOrientation`).
+    """
+    if orientation == FixedOrientation.NADIR_GEODETIC:
+        coordinates = np.radians(itrs_to_geodetic(position)[:, :2])
+        z = -np.column_stack(
+            (
+                np.cos(coordinates[:, 1]) * np.cos(coordinates[:, 0]),
+                np.cos(coordinates[:, 1]) * np.sin(coordinates[:, 0]),
+                np.sin(coordinates[:, 1]),
+            )
+        )
+    else:
+        z = -position / np.linalg.norm(position, axis=-1, keepdims=True)
+    x = -np.cross(z, velocity)
+    x /= np.linalg.norm(x, axis=-1, keepdims=True)
+    y = np.cross(z, x)
+    return np.stack((x, y, z), axis=-2)
+
+
+def _field_of_view(
+    payload: AnyPayload,
+) -> Tuple[Union[CircularGeometry, RectangularGeometry], np.ndarray]:
+    """
+    Returns the field of view geometry and sensor-to-body rotation of a payload.
+    """
+    if isinstance(payload, Payload):
+        return CircularGeometry(diameter=min(payload.field_of_view, 179.9)), np.eye(3)
+    if isinstance(payload, SinglePolStripMapSAR):
+        if payload.scene_field_of_view is None:
+            raise ValueError(
+                f"Payload {payload.id} does not define a scene field of view."
+            )
+        return payload.scene_field_of_view, quaternion_matrix(payload.orientation)
+    return payload.field_of_view, quaternion_matrix(payload.orientation)
+
+
+def _max_off_nadir(
+    field_of_view: Union[CircularGeometry, RectangularGeometry], rotation: np.ndarray
+) -> float:
+    """
+    Returns the maximum off-nadir angle (radians) that a field of view can observe.
+    """
+    if isinstance(field_of_view, CircularGeometry):
+        half_angle = np.radians(field_of_view.diameter / 2)
+    else:
+        half_angle = np.arctan(
+            np.hypot(
+                np.tan(np.radians(field_of_view.angle_height / 2)),
+                np.tan(np.radians(field_of_view.angle_width / 2)),
+            )
+        )
+    tilt = np.arccos(np.clip(rotation[2, 2], -1, 1))
+    return min(half_angle + tilt, np.pi / 2)
+
+
+def _in_field_of_view(
+    line_of_sight: np.ndarray,
+    field_of_view: Union[CircularGeometry, RectangularGeometry],
+) -> np.ndarray:
+    """
+    Tests whether (K,3) line-of-sight vectors in the sensor frame are within a
+    field of view about the sensor Z-axis.
+    """
+    x, y, z = line_of_sight.T
+    if isinstance(field_of_view, CircularGeometry):
+        return np.arctan2(np.hypot(x, y), z) <= np.radians(field_of_view.diameter / 2)
+    return (
+        (z > 0)
+        & (np.abs(np.arctan2(y, z)) <= np.radians(field_of_view.angle_height / 2))
+        & (np.abs(np.arctan2(x, z)) <= np.radians(field_of_view.angle_width / 2))
+    )
+
+
+def _target_positions(targets: Sequence[TargetPoint]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Returns (M,3) ITRS positions (m) and geodetic surface normals of targets.
+    """
+    coordinates = np.array(
+        [
+            tuple(target.position) + (0.0,) * (3 - len(target.position))
+            for target in targets
+        ],
+        dtype=float,
+    ).reshape(-1, 3)
+    longitude, latitude = np.radians(coordinates[:, 0]), np.radians(coordinates[:, 1])
+    return geodetic_to_itrs(coordinates), np.column_stack(
+        (
+            np.cos(latitude) * np.cos(longitude),
+            np.cos(latitude) * np.sin(longitude),
+            np.sin(latitude),
+        )
+    )
+
+
+def constraint_mask(
+    position: np.ndarray,
+    line_of_sight: np.ndarray,
+    normals: np.ndarray,
+    constraints: AccessConstraints,
+    sun: Optional[np.ndarray] = None,
+    step: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    Tests access constraints for (K,3) ITRS satellite positions (m), lines of
+    sight to targets (m) and target surface normals, with (N,3) ITRS Sun
+    directions indexed by (K,) time steps for the solar zenith angle.
+    """
+    distance = np.linalg.norm(line_of_sight, axis=-1)
+    mask = np.ones(len(line_of_sight), dtype=bool)
+    if constraints.max_range is not None:
+        mask &= distance <= constraints.max_range
+    if constraints.min_elevation is not None:
+        mask &= np.einsum("ij,ij->i", -line_of_sight, normals) >= distance * np.sin(
+            np.radians(constraints.min_elevation)
+        )
+    if constraints.max_look_angle is not None:
+        mask &= np.einsum(
+            "ij,ij->i", line_of_sight, -position
+        ) >= distance * np.linalg.norm(position, axis=-1) * np.cos(
+            np.radians(constraints.max_look_angle)
+        )
+    if constraints.max_solar_zenith is not None:
+        if sun is None:
+            raise ValueError("Solar zenith constraint requires Sun directions.")
+        mask &= np.einsum("ij,ij->i", sun[step], normals) >= np.cos(
+            np.radians(constraints.max_solar_zenith)
+        )
+    return mask
+
+
+@instrumented()
+def visible_pairs(
+    position: np.ndarray,
+    velocity: np.ndarray,
+    targets: np.ndarray,
+    normals: np.ndarray,
+    payload: AnyPayload,
+    orientation: FixedOrientation = FixedOrientation.NADIR_GEOCENTRIC,
+    constraints: Optional[AccessConstraints] = None,
+    sun: Optional[np.ndarray] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Finds the (time step, target) index pairs at which targets are accessed.
+
+    Takes (N,3) ITRS satellite positions (m) and velocities (m/s) and (M,3)
+    ITRS target positions (m) and surface normals. Candidate pairs are
+    screened by Earth central angle in chunks of time steps before the exact
+    field of view test. Optional access constraints are evaluated as masks
+    over the candidate pairs, using (N,3) ITRS Sun directions for the solar
+    zenith angle.
+    """
+    field_of_view, rotation = _field_of_view(payload)
+    radius = np.linalg.norm(position, axis=-1)
+    # Earth central angle observable at the maximum off-nadir angle
+    off_nadir = _max_off_nadir(field_of_view, rotation)
+    earth_angle = np.arcsin(
+        np.clip(
+            np.min(np.linalg.norm(targets, axis=-1), initial=np.inf) / radius, -1, 1
+        )
+    )
+    elevation = np.arccos(np.clip(np.sin(off_nadir) / np.sin(earth_angle), -1, 1))
+    central_angle = np.where(
+        off_nadir >= earth_angle,
+        np.pi / 2 - earth_angle,
+        np.pi / 2 - off_nadir - elevation,
+    )
+    min_cosine = np.cos(np.minimum(central_angle + np.radians(1), np.pi))
+    unit_targets = targets / np.linalg.norm(targets, axis=-1, keepdims=True)
+    unit_position = position / radius[:, None]
+
+    steps, indices = [], []
+    chunk = max(1, ACCESS_CHUNK_SIZE // max(1, len(targets)))
+    for i in range(0, len(position), chunk):
+        step, index = np.nonzero(
+            unit_position[i : i + chunk] @ unit_targets.T
+            >= min_cosine[i : i + chunk, None]
+        )
+        steps.append(step + i)
+        indices.append(index)
+    step = np.concatenate(steps or [np.empty(0, dtype=np.int64)])
+    index = np.concatenate(indices or [np.empty(0, dtype=np.int64)])
+
+    line_of_sight = targets[index] - position[step]
+    above_horizon = np.einsum("ij,ij->i", -line_of_sight, normals[index]) > 0
+    step, index, line_of_sight = (
+        step[above_horizon],
+        index[above_horizon],
+        line_of_sight[above_horizon],
+    )
+    if constraints is not None:
+        valid = constraint_mask(
+            position[step], line_of_sight, normals[index], constraints, sun, step
+        )
+        step, index, line_of_sight = step[valid], index[valid], line_of_sight[valid]
+    axes = nadir_frame(position, velocity, orientation)
+    sensor = np.einsum(
+        "ji,kj->ki", rotation, np.einsum("kij,kj->ki", axes[step], line_of_sight)
+    )
+    visible = _in_field_of_view(sensor, field_of_view)
+    return step[visible], index[visible]
+
+
+def contiguous_runs(
+    step: np.ndarray, index: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Groups (time step, target) index pairs into runs of consecutive time steps.
+
+    Returns arrays of target index, first time step and last time step per run,
+    sorted by target then time.
+    """
+    order = np.lexsort((step, index))
+    step, index = step[order], index[order]
+    breaks = np.flatnonzero((np.diff(index) != 0) | (np.diff(step) != 1)) + 1
+    first = np.concatenate(([0], breaks)) if len(step) else np.empty(0, dtype=int)
+    last = np.concatenate((breaks - 1, [len(step) - 1])) if len(step) else first
+    return index[first], step[first], step[last]
+
+
+def _body_orientation(satellite: Satellite) -> FixedOrientation:
+    """
+    Returns the fixed body orientation of a satellite.
+    """
+    orientation = (
+        FixedOrientation.NADIR_GEOCENTRIC
+        if satellite.satellite_bus is None
+        else satellite.satellite_bus.orientation
+    )
+    if not isinstance(orientation, FixedOrientation):
+        raise ValueError("Built-in analysis only supports fixed body orientations.")
+    return orientation
+
+
+@instrumented()
+def access_intervals(
+    request: AccessRequest,
+    states: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+) -> Tuple[
+    List[Tuple[Satellite, AnyPayload]], np.ndarray, np.ndarray, np.ndarray, np.ndarray
+]:
+    """
+    Computes the access intervals of a request as arrays.
+
+    Returns the list of (satellite, payload) pairs considered and arrays of
+    pair index, target index, first time step and last time step per access.
+    Optional `states` are the (S,N,3) ITRS positions (m) and velocities (m/s)
+    of the request satellites on its time grid (see `propagate_states`), e.g.,
+    to evaluate several sets of targets without propagating again.
+    """
+    if request.propagator != Propagator.SGP4:
+        raise RuntimeError("Built-in access only supports SGP4 propagator.")
+    times = get_time_grid(request)
+    pairs = [
+        (satellite, payload)
+        for satellite in request.satellites
+        for payload in satellite.payloads
+        if payload.id in request.payload_ids
+    ]
+    targets, normals = _target_positions(request.targets)
+    satellites = list({id(satellite): satellite for satellite, _ in pairs}.values())
+    if not satellites:
+        position = velocity = None
+    elif states is None:
+        position, velocity = propagate_states(
+            satellites, times, CartesianReferenceFrame.ITRS
+        )
+    else:
+        rows = {id(satellite): s for s, satellite in enumerate(request.satellites)}
+        rows = [rows[id(satellite)] for satellite in satellites]
+        position, velocity = states[0][rows], states[1][rows]
+    constraints = request.constraints
+    sun = None
+    if constraints is not None and constraints.max_solar_zenith is not None:
+        # Sun directions computed once per time step for all satellites
+        sun, _ = transform(
+            get_sun_position(times),
+            None,
+            CartesianReferenceFrame.ICRF,
+            CartesianReferenceFrame.ITRS,
+            times,
+        )
+        sun /= np.linalg.norm(sun, axis=-1, keepdims=True)
+    columns = []
+    for k, (satellite, payload) in enumerate(pairs):
+        s = satellites.index(satellite)
+        valid = np.all(np.isfinite(position[s]), axis=-1)
+        step, index = visible_pairs(
+            position[s][valid],
+            velocity[s][valid],
+            targets,
+            normals,
+            payload,
+            _body_orientation(satellite),
+            constraints,
+            None if sun is None else sun[valid],
+        )
+        index, first, last = contiguous_runs(np.flatnonzero(valid)[step], index)
+        columns.append((np.full(len(index), k), index, first, last))
+    if not columns:
+        empty = np.empty(0, dtype=np.int64)
+        return pairs, empty, empty, empty, empty
+    pair, index, first, last = (np.concatenate(column) for column in zip(*columns))
+    order = np.lexsort((pair, first, index))
+    return pairs, pair[order], index[order], first[order], last[order]
+
+
+def get_repeat_cycles(
+    request: AccessRequest,
+    tolerance: float = REPEAT_TOLERANCE,
+    max_days: int = REPEAT_MAX_DAYS,
+) -> Dict[Identifier, RepeatCycle]:
+    """
+    Detects the satellites of a request whose access can be tiled from a
+    repeat ground track cycle.
+
+    A satellite qualifies if its accumulated ground track drift over the
+    request duration (`RepeatCycle.get_drift`, the error bound of tiling) is
+    within `tolerance` (decimal degrees of longitude at the equator) and the
+    request spans at least two cycles. Requests constrained by solar zenith
+    angle (which does not repeat with the ground track) are never tiled.
+    """
+    if not 0 <= tolerance < math.inf:
+        raise ValueError("Repeat tolerance must be non-negative and finite.")
+    cycles = {}
+    if (
+        request.constraints is not None
+        and request.constraints.max_solar_zenith is not None
+    ):
+        return cycles
+    for satellite in request.satellites:
+        if not isinstance(satellite.orbit, GeneralPerturbationsOrbitState):
+            continue
+        cycle = satellite.orbit.get_repeat_cycle(max_days, tolerance, request.duration)
+        if cycle is not None and 2 * cycle.duration <= request.duration:
+            cycles[satellite.id] = cycle
+    return cycles
+
+
+def get_tiling_records(
+    request: AccessRequest, cycles: Dict[Identifier, RepeatCycle]
+) -> List[RepeatTilingRecord]:
+    """
+    Reports the repeat ground track cycles from which access of satellites of
+    a request is tiled (see `get_repeat_cycles`) with their error bounds: the
+    ground track drift accumulated over the request and half a time step.
+    """
+    return [
+        RepeatTilingRecord(
+            satellite_id=satellite_id,
+            cycle=cycle,
+            drift=cycle.get_drift(request.duration),
+            time_error=request.time_step / 2,
+        )
+        for satellite_id, cycle in cycles.items()
+    ]
+
+
+def merge_intervals(
+    index: np.ndarray, start: np.ndarray, end: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Merges overlapping (target index, start, end) intervals per target.
+
+    Times are integer offsets (e.g., microseconds) from the analysis start.
+    Returns the merged intervals sorted by target then time and the order
+    and first position (in that order) of the intervals merged into each
+    (see `merge_runs`).
+    """
+    order, runs = merge_runs(start, end, index)
+    index, start, end = index[order], start[order], end[order]
+    if len(index) == 0:
+        return index, start, end, order, runs
+    return index[runs], start[runs], np.maximum.reduceat(end, runs), order, runs
+
+
+def tile_intervals(
+    index: np.ndarray,
+    start: np.ndarray,
+    end: np.ndarray,
+    period: int,
+    duration: int,
+    time_step: int = 1,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Repeats (target index, start, end) intervals computed over at least one
+    period to fill a duration, merging overlapping intervals per target.
+
+    Times are integer offsets (e.g., microseconds) from the analysis start.
+    Each copy is shifted by a whole number of periods and snapped to the
+    nearest multiple of `time_step` (a shift error of at most half a time
+    step), so that tiled intervals stay on the time grid of untiled access.
+    """
+    copies = np.arange(math.ceil(duration / period) + 1)
+    shift = (period * copies + time_step // 2) // time_step * time_step
+    index = np.repeat(index[np.newaxis], len(copies), axis=0).ravel()
+    start = (start[np.newaxis] + shift[:, np.newaxis]).ravel()
+    end = np.minimum((end[np.newaxis] + shift[:, np.newaxis]).ravel(), duration)
+    keep = start <= duration
+    return merge_intervals(index[keep], start[keep], end[keep])[:3]
+
+
+@instrumented()
+def payload_intervals(
+    request: AccessRequest,
+    tile_repeats: bool = True,
+    repeat_tolerance: float = REPEAT_TOLERANCE,
+    cycles: Optional[Dict[Identifier, RepeatCycle]] = None,
+) -> List[Tuple[Satellite, AnyPayload, np.ndarray, np.ndarray, np.ndarray]]:
+    """
+    Computes the access intervals of each (satellite, payload) pair of a request.
+
+    Returns a list of satellite, payload and arrays of target index, start
+    and end time (integer microseconds from the request start) per access.
+    Unless `tile_repeats` is disabled, access of satellites in repeat ground
+    track orbits (see `get_repeat_cycles`) is computed over one cycle and
+    tiled over the remaining duration, approximating access within the
+    accumulated ground track drift (`RepeatCycle.get_drift`, at most
+    `repeat_tolerance`) and half a time step. Precomputed `cycles` (e.g., to
+    report with `get_tiling_records`) take precedence over detection.
+    """
+    time_step = request.time_step // timedelta(microseconds=1)
+    duration = request.duration // request.time_step * time_step
+    if cycles is None:
+        cycles = get_repeat_cycles(request, repeat_tolerance) if tile_repeats else {}
+    intervals = []
+    for satellites, cycle in [
+        ([s for s in request.satellites if s.id not in cycles], None)
+    ] + [([s], cycles[s.id]) for s in request.satellites if s.id in cycles]:
+        if not satellites:
+            continue
+        period = None if cycle is None else cycle.duration // timedelta(microseconds=1)
+        pairs, pair, index, first, last = access_intervals(
+            request.model_copy(
+                update=dict(
+                    satellites=satellites,
+                    duration=(
+                        request.duration
+                        if cycle is None
+                        else math.ceil(period / time_step) * request.time_step
+                    ),
+                )
+            )
+        )
+        start, end = first * time_step, last * time_step
+        for k, (satellite, payload) in enumerate(pairs):
+            selected = pair == k
+            if cycle is None:
+                tiled = index[selected], start[selected], end[selected]
+            else:
+                tiled = tile_intervals(
+                    index[selected],
+                    start[selected],
+                    end[selected],
+                    period,
+                    duration,
+                    time_step,
+                )
+                count("tiled_samples", len(tiled[0]))
+            intervals.append((satellite, payload) + tiled)
+    return intervals
+
+
+def assemble_access(
+    request: AccessRequest,
+    intervals: Sequence[
+        Tuple[Identifier, Identifier, np.ndarray, np.ndarray, np.ndarray]
+    ],
+    tiling_records: Optional[List[RepeatTilingRecord]] = None,
+) -> AccessResponse:
+    """
+    Assembles an access response from the satellite identifier, instrument
+    identifier and arrays of target index, start and end time (integer
+    microseconds from the request start) of each (satellite, payload) pair
+    and the records of satellites whose access is tiled (if any).
+    """
+    if intervals:
+        pair, index, start, end = (
+            np.concatenate(column)
+            for column in zip(
+                *(
+                    (np.full(len(index), k), index, start, end)
+                    for k, (_, _, index, start, end) in enumerate(intervals)
+                )
+            )
+        )
+    else:
+        pair = index = start = end = np.empty(0, dtype=np.int64)
+    order = np.lexsort((pair, start, index))
+    pair, index, start, end = pair[order], index[order], start[order], end[order]
+    bounds = np.searchsorted(index, np.arange(len(request.targets) + 1))
+    ids = [(str(item[0]), str(item[1])) for item in intervals]
+    count("targets", len(request.targets))
+    count("samples", len(index))
+    with span("AccessResponse.validate"):
+        return AccessResponse(
+            **request.model_dump(exclude={"target_records", "tiling_records"}),
+            tiling_records=tiling_records or [],
+            target_records=[
+                AccessRecord(
+                    target_id=target.id,
+                    samples=[
+                        AccessSample(
+                            satellite_id=ids[k][0],
+                            instrument_id=ids[k][1],
+                            start=request.start + timedelta(microseconds=i),
+                            duration=timedelta(microseconds=j - i),
+                        )
+                        for k, i, j in zip(
+                            pair[bounds[m] : bounds[m + 1]].tolist(),
+                            start[bounds[m] : bounds[m + 1]].tolist(),
+                            end[bounds[m] : bounds[m + 1]].tolist(),
+                        )
+                    ],
+                )
+                for m, target in enumerate(request.targets)
+            ],
+        )
+
+
+@instrumented()
+def access(
+    request: AccessRequest,
+    tile_repeats: bool = True,
+    repeat_tolerance: float = REPEAT_TOLERANCE,
+) -> AccessResponse:
+    """
+    Computes geometric access between the satellite payloads and targets of a request.
+
+    Unless `tile_repeats` is disabled, access of satellites in repeat ground
+    track orbits (see `get_repeat_cycles`) is computed over one cycle and
+    tiled over the remaining duration (see `payload_intervals`); the applied
+    cycles and their error bounds are reported as tiling records.
+    """
+    cycles = get_repeat_cycles(request, repeat_tolerance) if tile_repeats else {}
+    return assemble_access(
+        request,
+        [
+            (satellite.id, payload.id, index, start, end)
+            for satellite, payload, index, start, end in payload_intervals(
+                request, cycles=cycles
+            )
+        ],
+        get_tiling_records(request, cycles),
+    )
+
+
+def _harmonic_mean(
+    values: Sequence[timedelta], weights: Optional[Sequence[float]] = None
+) -> Optional[timedelta]:
+    seconds = np.array([value.total_seconds() for value in values])
+    weights = np.ones(len(seconds)) if weights is None else np.asarray(weights)
+    if len(seconds) == 0:
+        return None
+    if np.any(seconds == 0):
+        return timedelta(0)
+    return timedelta(seconds=np.sum(weights) / np.sum(weights / seconds))
+
+
+def _coverage_intervals(request: CoverageRequest) -> Tuple[np.ndarray, IntervalArray]:
+    """
+    Returns the target index and intervals (relative to the request start) of
+    the access samples of a request which are not omitted.
+    """
+    records = {record.target_id: record for record in request.target_records}
+    omit_satellite_ids = {str(value) for value in request.omit_satellite_ids}
+    omit_payload_ids = {str(value) for value in request.omit_payload_ids}
+    samples = [
+        (m, sample)
+        for m, target in enumerate(request.targets)
+        if target.id in records
+        for sample in records[target.id].samples
+        if sample.satellite_id not in omit_satellite_ids
+        and sample.instrument_id not in omit_payload_ids
+    ]
+    satellite_codes, instrument_codes = {}, {}
+    unit = timedelta(microseconds=1)
+    start = np.array(
+        [(sample.start - request.start) // unit for _, sample in samples],
+        dtype=np.int64,
+    )
+    return np.array([m for m, _ in samples], dtype=np.int64), IntervalArray(
+        request.start,
+        start,
+        start
+        + np.array([sample.duration // unit for _, sample in samples], dtype=np.int64),
+        [
+            satellite_codes.setdefault(sample.satellite_id, len(satellite_codes))
+            for _, sample in samples
+        ],
+        [
+            instrument_codes.setdefault(sample.instrument_id, len(instrument_codes))
+            for _, sample in samples
+        ],
+        list(satellite_codes),
+        list(instrument_codes),
+    )
+
+
+def assemble_coverage(
+    request: CoverageRequest,
+    index: np.ndarray,
+    intervals: IntervalArray,
+    target_records: Optional[Dict[int, CoverageRecord]] = None,
+) -> CoverageResponse:
+    """
+    Assembles a coverage response from merged access intervals and the target
+    index of each, sorted by target then time (see `IntervalArray.coalesce_by`).
+
+    Targets in `target_records` (by target index, e.g., reused from a previous
+    response) keep their records; other targets without intervals have empty
+    records. Aggregate statistics are weighted by target area if every
+    target defines one.
+    """
+    target_records = dict(target_records or {})
+    intervals = intervals.shift(request.start)
+    index = np.asarray(index, dtype=np.int64)
+    start, end = intervals.start, intervals.end
+    # revisits since the end of the prior interval of the same target
+    revisited = np.zeros(len(index), dtype=bool)
+    revisited[1:] = index[1:] == index[:-1]
+    revisit = np.zeros(len(index), dtype=np.int64)
+    revisit[1:] = start[1:] - end[:-1]
+    revisit_sum = np.bincount(
+        index[revisited],
+        weights=revisit[revisited],
+        minlength=len(request.targets),
+    ).astype(np.int64)
+    bounds = np.searchsorted(index, np.arange(len(request.targets) + 1))
+    # convert times to datetime objects with (object) array arithmetic
+    satellite_ids = [str(value) for value in intervals.satellite_ids]
+    instrument_ids = [str(value) for value in intervals.instrument_ids]
+    columns = [
+        [satellite_ids[k] for k in intervals.satellite.tolist()],
+        [instrument_ids[k] for k in intervals.instrument.tolist()],
+        (start.astype("timedelta64[us]").astype(object) + request.start).tolist(),
+        (end - start).astype("timedelta64[us]").astype(object).tolist(),
+        np.where(
+            revisited, revisit.astype("timedelta64[us]").astype(object), None
+        ).tolist(),
+    ]
+    for m, target in enumerate(request.targets):
+        if m in target_records:
+            continue
+        samples = [
+            CoverageSample(
+                satellite_id=satellite_id,
+                instrument_id=instrument_id,
+                start=sample_start,
+                duration=duration,
+                revisit=gap,
+            )
+            for satellite_id, instrument_id, sample_start, duration, gap in zip(
+                *(column[bounds[m] : bounds[m + 1]] for column in columns)
+            )
+        ]
+        target_records[m] = CoverageRecord(
+            target_id=target.id,
+            samples=samples,
+            mean_revisit=(
+                None
+                if len(samples) < 2
+                else timedelta(microseconds=int(revisit_sum[m])) / (len(samples) - 1)
+            ),
+            number_samples=len(samples),
+        )
+    target_records = [target_records[m] for m in range(len(request.targets))]
+    weights = target_weights(request.targets)
+    revisited = [
+        k for k, record in enumerate(target_records) if record.mean_revisit is not None
+    ]
+    count("targets", len(target_records))
+    count("samples", len(index))
+    with span("CoverageResponse.validate"):
+        return CoverageResponse(
+            **request.model_dump(
+                exclude=["target_records", "harmonic_mean_revisit", "coverage_fraction"]
+            ),
+            target_records=target_records,
+            harmonic_mean_revisit=_harmonic_mean(
+                [target_records[k].mean_revisit for k in revisited],
+                weights[revisited],
+            ),
+            coverage_fraction=(
+                0
+                if not target_records
+                else np.sum(
+                    weights[[record.number_samples > 0 for record in target_records]]
+                )
+                / np.sum(weights)
+            ),
+        )
+
+
+@instrumented()
+def coverage(request: CoverageRequest) -> CoverageResponse:
+    """
+    Computes coverage statistics from the access records of a request.
+
+    Overlapping access samples (e.g., from different satellites) are merged
+    before computing the revisit (elapsed time since the prior access).
+    Aggregate statistics are weighted by target area if every target defines
+    one.
+    """
+    index, intervals = _coverage_intervals(request)
+    return assemble_coverage(request, *intervals.coalesce_by(index))
+
+
+@instrumented()
+def coverage_raster(
+    request: CoverageRequest, grid: UniformAngularGrid
+) -> CoverageRaster:
+    """
+    Computes raster coverage metrics from the access records of a request for
+    targets generated by a grid, without creating coverage records.
+    """
+    raster = CoverageRaster(grid, request.start)
+    index, intervals = _coverage_intervals(request)
+    raster.set_target_intervals(
+        [target.id for target in request.targets],
+        index,
+        intervals.start,
+        intervals.end,
+    )
+    count("targets", len(request.targets))
+    return raster
+
+
+def basic_sensor_metrics(
+    position: np.ndarray,
+    velocity: np.ndarray,
+    target: np.ndarray,
+    sun: np.ndarray,
+) -> np.ndarray:
+    """
+    Computes basic sensor data metrics from (N,3) ITRS satellite positions (m),
+    velocities (m/s), target positions (m) and Sun positions (m).
+
+    Returns an (N,4) array of incidence angle (degrees), look angle (degrees),
+    observation range (km) and solar zenith angle (degrees), assuming a
+    spherical Earth.
+    """
+    line_of_sight = target - position
+    observation_range = np.linalg.norm(line_of_sight, axis=-1)
+    up = target / np.linalg.norm(target, axis=-1, keepdims=True)
+    nadir = -position / np.linalg.norm(position, axis=-1, keepdims=True)
+    look = np.arccos(
+        np.clip(np.einsum("ij,ij->i", nadir, line_of_sight) / observation_range, -1, 1)
+    )
+    side = np.sign(np.einsum("ij,ij->i", np.cross(position, velocity), line_of_sight))
+    incidence = np.arccos(
+        np.clip(np.einsum("ij,ij->i", up, -line_of_sight) / observation_range, -1, 1)
+    )
+    to_sun = sun - target
+    solar_zenith = np.arccos(
+        np.clip(
+            np.einsum("ij,ij->i", up, to_sun) / np.linalg.norm(to_sun, axis=-1), -1, 1
+        )
+    )
+    return np.column_stack(
+        (
+            np.degrees(incidence),
+            np.where(side < 0, -1, 1) * np.degrees(look),
+            observation_range / 1000,
+            np.degrees(solar_zenith),
+        )
+    )
+
+
+@instrumented()
+def datametrics(request: DataMetricsRequest) -> DataMetricsResponse:
+    """
+    Computes instantaneous data metrics at each time step of each access sample.
+
+    Metrics are computed for `BasicSensor` payloads; samples of other payload
+    types are returned without instantaneous metrics.
+    """
+    # samples identify satellites and payloads by string identifiers
+    satellites = {str(satellite.id): satellite for satellite in request.satellites}
+    payloads = {
+        (str(satellite.id), str(payload.id)): payload
+        for satellite in request.satellites
+        for payload in satellite.payloads
+    }
+    targets = {target.id: target for target in request.targets}
+    positions = (
+        dict(zip(targets, _target_positions(list(targets.values()))[0]))
+        if targets
+        else {}
+    )
+
+    # gather the metric times for every sample of each satellite
+    queries = {}
+    for m, record in enumerate(request.target_records):
+        for n, sample in enumerate(record.samples):
+            if isinstance(
+                payloads.get((sample.satellite_id, sample.instrument_id)), BasicSensor
+            ):
+                steps = sample.duration // request.time_step + 1
+                for step in range(steps):
+                    queries.setdefault(sample.satellite_id, []).append(
+                        (m, n, sample.start + step * request.time_step)
+                    )
+
+    metrics = {}
+    for satellite_id, query in queries.items():
+        times = [time for _, _, time in query]
+        position, velocity = propagate_states(
+            [satellites[satellite_id]], times, CartesianReferenceFrame.ITRS
+        )
+        sun, _ = transform(
+            get_sun_position(times),
+            None,
+            CartesianReferenceFrame.ICRF,
+            CartesianReferenceFrame.ITRS,
+            times,
+        )
+        values = basic_sensor_metrics(
+            position[0],
+            velocity[0],
+            np.array(
+                [positions[request.target_records[m].target_id] for m, _, _ in query]
+            ),
+            sun,
+        )
+        for (m, n, time), value in zip(query, values.tolist()):
+            metrics.setdefault((m, n), []).append(
+                BasicSensorDataMetricsInstantaneous(
+                    time=time,
+                    incidence_angle=value[0],
+                    look_angle=value[1],
+                    observation_range=value[2],
+                    solar_zenith=value[3],
+                )
+            )
+
+    count("samples", sum(len(query) for query in queries.values()))
+    with span("DataMetricsResponse.validate"):
+        return DataMetricsResponse(
+            **request.model_dump(exclude="target_records"),
+            target_records=[
+                DataMetricsRecord(
+                    target_id=record.target_id,
+                    samples=[
+                        DataMetricsSample(
+                            **sample.model_dump(
+                                include={
+                                    "satellite_id",
+                                    "instrument_id",
+                                    "start",
+                                    "duration",
+                                }
+                            ),
+                            instantaneous_metrics=metrics.get((m, n), []),
+                        )
+                        for n, sample in enumerate(record.samples)
+                    ],
+                )
+                for m, record in enumerate(request.target_records)
+            ],
+        )
+
+
+@instrumented()
+def crosslink_pairs(
+    position: np.ndarray,
+    grazing_radius: float,
+    max_range: Optional[float] = None,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Finds the (time step, satellite, other satellite) index triples at which
+    pairs of satellites are visible to each other.
+
+    Takes (S,N,3) satellite positions (m) in any Earth-centered frame. A pair
+    is visible if the line of sight does not pass within `grazing_radius` of
+    the Earth center and (optionally) the range is within `max_range`.
+    Candidate pairs are screened by a spatial hash of cubic cells sized to
+    the maximum visible range (the sum of the distances to the grazing
+    horizon of the highest satellite, or `max_range`), so only satellites in
+    the same or neighboring cells are tested. Returns satellite index pairs
+    with the first index less than the second.
+
+    Without `max_range`, cells span twice the grazing horizon distance (about
+    4,600 km at 500 km altitude for a 100 km grazing altitude), so a few
+    cells cover all orbits and nearly every pair remains a candidate; the
+    screening only prunes effectively with a `max_range` well below it.
+    """
+    number_satellites, number_steps = position.shape[:2]
+    radius = np.linalg.norm(position, axis=-1)
+    horizon = np.sqrt(np.maximum(radius**2 - grazing_radius**2, 0))
+    size = 2 * np.max(horizon, initial=0)
+    if max_range is not None:
+        size = min(size, max_range)
+    size = max(size, 1)
+
+    steps, firsts, seconds = [], [], []
+    chunk = max(1, ACCESS_CHUNK_SIZE // max(1, number_satellites**2))
+    for i in range(0, number_steps, chunk):
+        points = position[:, i : i + chunk].transpose(1, 0, 2).reshape(-1, 3)
+        number = len(points) // max(number_satellites, 1)
+        step = np.repeat(np.arange(number), number_satellites)
+        cells = np.floor(points / size).astype(np.int64)
+        # pad cells so that neighbor keys neither wrap nor collide
+        cells -= np.min(cells, axis=0, initial=0) - 1
+        extent = np.max(cells, axis=0, initial=0) + 2
+        key = np.ravel_multi_index((step, *cells.T), (number, *extent))
+        order = np.argsort(key, kind="stable")
+        sorted_key = key[order]
+        for dx, dy, dz in _NEIGHBOR_OFFSETS:
+            neighbor = sorted_key + (dx * extent[1] + dy) * extent[2] + dz
+            lower = np.searchsorted(sorted_key, neighbor, side="left")
+            upper = np.searchsorted(sorted_key, neighbor, side="right")
+            if (dx, dy, dz) == (0, 0, 0):
+                # pair each satellite with later satellites of the same cell
+                lower = np.maximum(lower, np.arange(len(order)) + 1)
+            number = np.maximum(upper - lower, 0)
+            first = np.repeat(np.arange(len(order)), number)
+            second = (
+                np.arange(np.sum(number))
+                - np.repeat(np.cumsum(number) - number, number)
+                + np.repeat(lower, number)
+            )
+            first, second = order[first], order[second]
+            count("candidates", len(first))
+            start, end = points[first], points[second]
+            line_of_sight = end - start
+            distance = np.einsum("ij,ij->i", line_of_sight, line_of_sight)
+            # closest point of the line of sight to the Earth center
+            fraction = np.clip(
+                -np.einsum("ij,ij->i", start, line_of_sight)
+                / np.where(distance > 0, distance, 1),
+                0,
+                1,
+            )
+            closest = start + fraction[:, np.newaxis] * line_of_sight
+            visible = np.einsum("ij,ij->i", closest, closest) > grazing_radius**2
+            if max_range is not None:
+                visible &= distance <= max_range**2
+            first, second = first[visible], second[visible]
+            steps.append(step[first] + i)
+            firsts.append(np.minimum(first, second) % number_satellites)
+            seconds.append(np.maximum(first, second) % number_satellites)
+    return tuple(
+        np.concatenate(column or [np.empty(0, dtype=np.int64)])
+        for column in (steps, firsts, seconds)
+    )
+
+
+@instrumented()
+def crosslinks(request: CrosslinkRequest) -> CrosslinkResponse:
+    """
+    Computes the visibility intervals between pairs of satellites from the
+    propagation records of a request.
+
+    Satellites are visible to each other at a time step if the line of sight
+    clears the Earth (`EARTH_RADIUS`) by `grazing_altitude` and is within
+    `max_range`. Records must share one time grid; each crosslink sample
+    spans its first to last visible time step.
+    """
+    records = request.satellite_records
+    times = [sample.time for sample in records[0].samples] if records else []
+    if any([sample.time for sample in record.samples] != times for record in records):
+        raise ValueError("Propagation records must share one time grid.")
+    position = np.array(
+        [[sample.position for sample in record.samples] for record in records],
+        dtype=float,
+    ).reshape(len(records), len(times), 3)
+    step, first, second = crosslink_pairs(
+        position, EARTH_RADIUS + request.grazing_altitude, request.max_range
+    )
+    number_satellites = max(len(records), 1)
+    pair, start, end = contiguous_runs(step, first * number_satellites + second)
+    bounds = np.r_[np.flatnonzero(np.diff(pair, prepend=-1)), len(pair)]
+    count("satellites", len(records))
+    count("samples", len(pair))
+    with span("CrosslinkResponse.validate"):
+        return CrosslinkResponse(
+            **request.model_dump(exclude="pair_records"),
+            pair_records=[
+                CrosslinkRecord(
+                    satellite_id=records[pair[i] // number_satellites].satellite_id,
+                    other_satellite_id=records[
+                        pair[i] % number_satellites
+                    ].satellite_id,
+                    samples=[
+                        CrosslinkSample(start=times[k], duration=times[m] - times[k])
+                        for k, m in zip(start[i:j].tolist(), end[i:j].tolist())
+                    ],
+                )
+                for i, j in zip(bounds[:-1].tolist(), bounds[1:].tolist())
+            ],
+        )
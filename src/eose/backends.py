@@ -0,0 +1,327 @@
+"""
+Registry of analysis backends dispatched by name.
+
+A backend adapts an analysis engine (e.g., the built-in SGP4 implementation
+or TAT-C) through two array-level hooks: `propagate_states` returns (S,N,3)
+position and velocity arrays and `access_intervals` returns arrays of target
+index, start and end time per (satellite, payload) pair. Responses are
+assembled from these arrays by the built-in routines, so results of every
+backend are normalized to the same records without file round trips.
+Backends are instantiated once (on first use) and reused across calls so
+that engine setup is not repeated per request.
+"""
+
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from . import analysis
+from .access import AccessRequest, AccessResponse, RepeatTilingRecord
+from .coverage import CoverageRequest, CoverageResponse
+from .datametrics import DataMetricsRequest, DataMetricsResponse
+from .frames import transform
+from .instrumentation import count, instrumented
+from .orbits import Propagator
+from .propagation import PropagationRequest, PropagationResponse
+from .satellites import Satellite
+from .utils import CartesianReferenceFrame, Identifier
+
+#: Name of the backend used when none is specified.
+DEFAULT_BACKEND = "builtin"
+
+Intervals = Tuple[Identifier, Identifier, np.ndarray, np.ndarray, np.ndarray]
+
+
+class Backend(ABC):
+    """
+    Analysis backend adapter.
+
+    Subclasses implement `propagate_states` and `access_intervals`; coverage
+    and data metrics derive from access records and default to the built-in
+    analysis.
+    """
+
+    @abstractmethod
+    def propagate_states(
+        self, request: PropagationRequest, times: Sequence[datetime]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns (S,N,3) position (m) and velocity (m/s) arrays of the request
+        satellites at each time in the request frame.
+        """
+
+    @abstractmethod
+    def access_intervals(self, request: AccessRequest) -> List[Intervals]:
+        """
+        Returns the satellite identifier, instrument identifier and arrays of
+        target index, start and end time (integer microseconds from the
+        request start) of each (satellite, payload) pair.
+        """
+
+    def tiling_records(self, request: AccessRequest) -> List[RepeatTilingRecord]:
+        """
+        Returns the records of satellites whose access intervals are tiled
+        from a repeat ground track cycle (none by default).
+        """
+        return []
+
+    def propagate(self, request: PropagationRequest) -> PropagationResponse:
+        """
+        Propagates the satellites of a request on its time grid.
+        """
+        times = analysis.get_time_grid(request)
+        position, velocity = self.propagate_states(request, times)
+        return analysis.assemble_propagation(request, times, position, velocity)
+
+    def access(self, request: AccessRequest) -> AccessResponse:
+        """
+        Computes access between the satellite payloads and targets of a request.
+        """
+        return analysis.assemble_access(
+            request, self.access_intervals(request), self.tiling_records(request)
+        )
+
+    def coverage(self, request: CoverageRequest) -> CoverageResponse:
+        """
+        Computes coverage statistics from the access records of a request.
+        """
+        return analysis.coverage(request)
+
+    def datametrics(self, request: DataMetricsRequest) -> DataMetricsResponse:
+        """
+        Computes data metrics from the access records of a request.
+        """
+        return analysis.datametrics(request)
+
+
+class BuiltinBackend(Backend):
+    """
+    Backend of the built-in (vectorized SGP4 and geometric access) analysis.
+
+    Access of satellites in repeat ground track orbits is tiled from one
+    cycle unless `tile_repeats` is disabled (see `analysis.payload_intervals`).
+    """
+
+    def __init__(
+        self,
+        tile_repeats: bool = True,
+        repeat_tolerance: float = analysis.REPEAT_TOLERANCE,
+    ):
+        self.tile_repeats = tile_repeats
+        self.repeat_tolerance = repeat_tolerance
+
+    def propagate_states(
+        self, request: PropagationRequest, times: Sequence[datetime]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        if request.propagator != Propagator.SGP4:
+            raise RuntimeError("Built-in propagation only supports SGP4 propagator.")
+        return analysis.propagate_states(request.satellites, times, request.frame)
+
+    def access_intervals(self, request: AccessRequest) -> List[Intervals]:
+        return [
+            (satellite.id, payload.id, index, start, end)
+            for satellite, payload, index, start, end in analysis.payload_intervals(
+                request, self.tile_repeats, self.repeat_tolerance
+            )
+        ]
+
+    def tiling_records(self, request: AccessRequest) -> List[RepeatTilingRecord]:
+        if not self.tile_repeats:
+            return []
+        return analysis.get_tiling_records(
+            request, analysis.get_repeat_cycles(request, self.repeat_tolerance)
+        )
+
+
+class TatcBackend(Backend):
+    """
+    Backend of the Tradespace Analysis Toolkit for Constellations (TAT-C).
+
+    Requires the optional `tatc` package. Orbit tracks and observations are
+    converted from TAT-C data frames to arrays in memory; payload fields of
+    view are converted to TAT-C fields of regard (cone angles) with the same
+    geometry as the built-in analysis.
+    """
+
+    def __init__(self):
+        try:
+            from tatc import analysis as tatc_analysis
+            from tatc import schemas as tatc_schemas
+        except ImportError as error:
+            raise ImportError("The TAT-C backend requires tatc.") from error
+        self._analysis = tatc_analysis
+        self._schemas = tatc_schemas
+        self._satellites = {}
+
+    def _satellite(self, satellite: Satellite, payload_ids: Sequence[Identifier]):
+        key = (satellite.model_dump_json(), tuple(payload_ids))
+        if key not in self._satellites:
+            self._satellites[key] = self._schemas.Satellite(
+                name=str(satellite.id),
+                orbit=self._schemas.TwoLineElements(tle=satellite.orbit.to_tle()),
+                instruments=[
+                    self._schemas.Instrument(
+                        name=str(payload.id),
+                        field_of_regard=np.degrees(
+                            2
+                            * analysis._max_off_nadir(*analysis._field_of_view(payload))
+                        ),
+                    )
+                    for payload in satellite.payloads
+                    if payload.id in payload_ids
+                ],
+            )
+        return self._satellites[key]
+
+    @instrumented()
+    def propagate_states(
+        self, request: PropagationRequest, times: Sequence[datetime]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        from pandas import DatetimeIndex
+        from shapely import get_coordinates
+
+        if request.propagator != Propagator.SGP4:
+            raise RuntimeError("TAT-C only supports SGP4 propagator.")
+        position = np.empty((len(request.satellites), len(times), 3))
+        velocity = np.empty((len(request.satellites), len(times), 3))
+        for i, satellite in enumerate(request.satellites):
+            track = self._analysis.collect_orbit_track(
+                self._satellite(satellite, []),
+                self._schemas.Instrument(name="Instrument"),
+                DatetimeIndex(times),
+                coordinates=self._analysis.OrbitCoordinate.ECI,
+                orbit_output=self._analysis.OrbitOutput.POSITION_VELOCITY,
+            )
+            position[i] = get_coordinates(np.asarray(track.geometry), include_z=True)
+            velocity[i] = get_coordinates(np.asarray(track.velocity), include_z=True)
+        count("samples", position.shape[0] * position.shape[1])
+        return transform(
+            position, velocity, CartesianReferenceFrame.ICRF, request.frame, times
+        )
+
+    @instrumented()
+    def access_intervals(self, request: AccessRequest) -> List[Intervals]:
+        from pandas import Timedelta, Timestamp
+
+        if request.propagator != Propagator.SGP4:
+            raise RuntimeError("TAT-C only supports SGP4 propagator.")
+        satellites = [
+            self._satellite(satellite, request.payload_ids)
+            for satellite in request.satellites
+        ]
+        satellite_ids = {
+            str(satellite.id): satellite.id for satellite in request.satellites
+        }
+        payload_ids = {
+            str(payload_id): payload_id for payload_id in request.payload_ids
+        }
+        columns = {}
+        for i, target in enumerate(request.targets):
+            observations = self._analysis.collect_multi_observations(
+                self._schemas.Point(
+                    id=i,
+                    longitude=target.position[0],
+                    latitude=target.position[1],
+                    altitude=(target.position[2] if len(target.position) > 2 else 0),
+                ),
+                satellites,
+                request.start,
+                request.start + request.duration,
+            )
+            if observations.empty:
+                continue
+            start = (observations["start"] - Timestamp(request.start)) // Timedelta(
+                microseconds=1
+            )
+            end = (observations["end"] - Timestamp(request.start)) // Timedelta(
+                microseconds=1
+            )
+            for key, selected in observations.groupby(
+                ["satellite", "instrument"]
+            ).indices.items():
+                columns.setdefault(key, []).append(
+                    (
+                        np.full(len(selected), i),
+                        start.to_numpy(np.int64)[selected],
+                        end.to_numpy(np.int64)[selected],
+                    )
+                )
+        count("targets", len(request.targets))
+        return [
+            (satellite_ids[satellite], payload_ids[instrument])
+            + tuple(np.concatenate(column) for column in zip(*arrays))
+            for (satellite, instrument), arrays in columns.items()
+        ]
+
+
+_FACTORIES: Dict[str, Callable[[], Backend]] = {}
+_BACKENDS: Dict[str, Backend] = {}
+
+
+def register_backend(name: str, factory: Callable[[], Backend]) -> None:
+    """
+    Registers a backend factory (e.g., a `Backend` subclass) by name,
+    replacing (and discarding the instance of) any backend of the same name.
+    """
+    _FACTORIES[name] = factory
+    _BACKENDS.pop(name, None)
+
+
+def get_backend(name: str = DEFAULT_BACKEND) -> Backend:
+    """
+    Returns the (shared) instance of a registered backend.
+    """
+    if name not in _FACTORIES:
+        raise KeyError(
+            f"Unknown backend {name!r} (registered: {', '.join(_FACTORIES)})."
+        )
+    if name not in _BACKENDS:
+        _BACKENDS[name] = _FACTORIES[name]()
+    return _BACKENDS[name]
+
+
+def list_backends() -> List[str]:
+    """
+    Returns the names of registered backends.
+    """
+    return list(_FACTORIES)
+
+
+def propagate(
+    request: PropagationRequest, backend: str = DEFAULT_BACKEND
+) -> PropagationResponse:
+    """
+    Propagates the satellites of a request with a named backend.
+    """
+    return get_backend(backend).propagate(request)
+
+
+def access(request: AccessRequest, backend: str = DEFAULT_BACKEND) -> AccessResponse:
+    """
+    Computes access of a request with a named backend.
+    """
+    return get_backend(backend).access(request)
+
+
+def coverage(
+    request: CoverageRequest, backend: str = DEFAULT_BACKEND
+) -> CoverageResponse:
+    """
+    Computes coverage statistics of a request with a named backend.
+    """
+    return get_backend(backend).coverage(request)
+
+
+def datametrics(
+    request: DataMetricsRequest, backend: str = DEFAULT_BACKEND
+) -> DataMetricsResponse:
+    """
+    Computes data metrics of a request with a named backend.
+    """
+    return get_backend(backend).datametrics(request)
+
+
+register_backend("builtin", BuiltinBackend)
+register_backend("tatc", TatcBackend)
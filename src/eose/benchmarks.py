@@ -0,0 +1,368 @@
+"""
+Benchmark suite for the analysis pipeline.
+
+Times propagation, pointing, access, coverage and data metrics analyses (using
+the built-in implementations in `eose.analysis`) and every `as_dataframe`,
+`as_features` and `model_dump_json` export on synthetic Walker constellations
+and uniform angular grids, reporting throughput (samples per second) and peak
+memory. Reports are saved as JSON and can be compared against a baseline.
+
+Runs offline from the command line::
+
+    python -m eose.benchmarks --suite scaling --output report.json --baseline baseline.json
+"""
+
+import argparse
+import json
+import math
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+from pydantic import AwareDatetime, BaseModel, Field
+
+from . import __version__, analysis
+from .access import AccessRequest
+from .coverage import CoverageRequest
+from .datametrics import DataMetricsRequest
+from .grids import UniformAngularGrid
+from .instruments import BasicSensor, CircularGeometry
+from .orbits import GeneralPerturbationsOrbitState, Propagator
+from .pointing import PointingRequest
+from .propagation import PropagationRequest
+from .satellites import Satellite
+
+EARTH_MU = 3.986004418e14  # m^3/s^2
+EARTH_RADIUS = 6378137.0  # m
+EPOCH = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def walker_constellation(
+    number_satellites: int,
+    number_planes: int,
+    relative_spacing: int = 1,
+    inclination: float = 60.0,
+    altitude: float = 550e3,
+    field_of_view: float = 60.0,
+    epoch: datetime = EPOCH,
+) -> List[Satellite]:
+    """
+    Generates a Walker delta constellation (i:t/p/f) of circular orbits with
+    one nadir-pointing `BasicSensor` per satellite.
+    """
+    per_plane = math.ceil(number_satellites / number_planes)
+    semimajor_axis = EARTH_RADIUS + altitude
+    mean_motion = math.sqrt(EARTH_MU / semimajor_axis**3) * 86400 / (2 * math.pi)
+    return [
+        Satellite(
+            id=f"SAT-{i:04d}",
+            orbit=GeneralPerturbationsOrbitState(
+                object_name=f"SAT-{i:04d}",
+                epoch=epoch.replace(tzinfo=None),
+                mean_motion=mean_motion,
+                eccentricity=0.0,
+                inclination=inclination,
+                ra_of_asc_node=(360 * plane / number_planes) % 360,
+                arg_of_pericenter=0.0,
+                mean_anomaly=(
+                    360 * slot / per_plane
+                    + 360 * relative_spacing * plane / number_satellites
+                )
+                % 360,
+                norad_cat_id=i,
+                element_set_no=999,
+                rev_at_epoch=0,
+            ),
+            payloads=[
+                BasicSensor(
+                    id="sensor",
+                    field_of_view=CircularGeometry(diameter=field_of_view),
+                    data_rate=10.0,
+                    bits_per_pixel=16,
+                )
+            ],
+        )
+        for i in range(number_satellites)
+        for plane, slot in [divmod(i, per_plane)]
+    ]
+
+
+class BenchmarkCase(BaseModel):
+    """
+    Synthetic benchmark scenario.
+    """
+
+    name: str = Field(..., description="Case name.")
+    number_satellites: int = Field(..., gt=0, description="Number of satellites.")
+    number_planes: int = Field(..., gt=0, description="Number of orbital planes.")
+    grid_resolution: float = Field(
+        ..., gt=0, description="Target grid spacing (decimal degrees)."
+    )
+    duration: timedelta = Field(..., gt=0, description="Analysis duration.")
+    time_step: timedelta = Field(
+        timedelta(seconds=60), gt=0, description="Propagation time step duration."
+    )
+
+
+class BenchmarkResult(BaseModel):
+    """
+    Measurement of one pipeline stage for one benchmark case.
+    """
+
+    case: str = Field(..., description="Case name.")
+    stage: str = Field(..., description="Pipeline stage name.")
+    number_satellites: int = Field(..., description="Number of satellites.")
+    number_targets: int = Field(..., description="Number of targets.")
+    number_steps: int = Field(..., description="Number of propagation time steps.")
+    samples: int = Field(..., ge=0, description="Number of samples processed.")
+    seconds: float = Field(..., ge=0, description="Elapsed wall-clock time (s).")
+    throughput: float = Field(..., ge=0, description="Samples processed per second.")
+    peak_memory: int = Field(
+        ..., ge=0, description="Peak traced memory allocated (bytes)."
+    )
+
+
+class BenchmarkReport(BaseModel):
+    """
+    Collection of benchmark results with environment metadata.
+    """
+
+    created: AwareDatetime = Field(..., description="Report creation time.")
+    version: str = Field(__version__, description="eose version.")
+    python: str = Field(platform.python_version(), description="Python version.")
+    platform: str = Field(platform.platform(), description="Platform description.")
+    results: List[BenchmarkResult] = Field([], description="Benchmark results.")
+
+
+SUITES: Dict[str, List[BenchmarkCase]] = {
+    "smoke": [
+        BenchmarkCase(
+            name="smoke",
+            number_satellites=2,
+            number_planes=1,
+            grid_resolution=30,
+            duration=timedelta(hours=6),
+        )
+    ],
+    "standard": [
+        BenchmarkCase(
+            name=f"walker-{t}-{resolution}deg",
+            number_satellites=t,
+            number_planes=p,
+            grid_resolution=resolution,
+            duration=timedelta(days=1),
+        )
+        for t, p in [(6, 3), (24, 6)]
+        for resolution in [10, 5]
+    ],
+    "scaling": (
+        [
+            BenchmarkCase(
+                name=f"satellites-{t}",
+                number_satellites=t,
+                number_planes=min(t, 8),
+                grid_resolution=10,
+                duration=timedelta(days=1),
+            )
+            for t in [1, 4, 16, 64]
+        ]
+        + [
+            BenchmarkCase(
+                name=f"targets-{resolution}deg",
+                number_satellites=8,
+                number_planes=4,
+                grid_resolution=resolution,
+                duration=timedelta(days=1),
+            )
+            for resolution in [20, 10, 5, 2.5]
+        ]
+        + [
+            BenchmarkCase(
+                name=f"duration-{days}d",
+                number_satellites=8,
+                number_planes=4,
+                grid_resolution=10,
+                duration=timedelta(days=days),
+            )
+            for days in [1, 2, 4, 8]
+        ]
+    ),
+}
+
+
+def _measure(function: Callable[[], object]) -> Tuple[object, float, int]:
+    """
+    Calls a function and returns its result, elapsed time and peak traced memory.
+
+    Time and peak memory are measured in separate calls so that the elapsed
+    time does not include the overhead of memory tracing.
+    """
+    start = time.perf_counter()
+    result = function()
+    seconds = time.perf_counter() - start
+    tracemalloc.start()
+    try:
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, seconds, peak
+
+
+def run_case(case: BenchmarkCase) -> List[BenchmarkResult]:
+    """
+    Runs every pipeline stage for a benchmark case.
+    """
+    satellites = walker_constellation(case.number_satellites, case.number_planes)
+    targets = UniformAngularGrid(
+        delta_longitude=case.grid_resolution, delta_latitude=case.grid_resolution
+    ).as_targets()
+    number_steps = case.duration // case.time_step + 1
+    common = dict(
+        start=EPOCH,
+        duration=case.duration,
+        time_step=case.time_step,
+        satellites=satellites,
+        propagator=Propagator.SGP4,
+    )
+    results = []
+
+    def record(stage: str, function: Callable[[], object], samples: int) -> object:
+        result, seconds, peak = _measure(function)
+        results.append(
+            BenchmarkResult(
+                case=case.name,
+                stage=stage,
+                number_satellites=len(satellites),
+                number_targets=len(targets),
+                number_steps=number_steps,
+                samples=samples,
+                seconds=seconds,
+                throughput=samples / seconds if seconds > 0 else 0,
+                peak_memory=peak,
+            )
+        )
+        return result
+
+    def exports(name: str, response, samples: int) -> None:
+        record(f"{name}.as_dataframe", response.as_dataframe, samples)
+        record(f"{name}.as_features", response.as_features, samples)
+        record(f"{name}.model_dump_json", response.model_dump_json, samples)
+
+    propagation = record(
+        "propagate",
+        lambda: analysis.propagate(PropagationRequest(**common)),
+        len(satellites) * number_steps,
+    )
+    exports("propagation", propagation, len(satellites) * number_steps)
+
+    pointing_request = PointingRequest(**propagation.model_dump())
+    pointing = record(
+        "pointing",
+        lambda: analysis.pointing(pointing_request),
+        len(satellites) * number_steps,
+    )
+    exports("pointing", pointing, len(satellites) * number_steps)
+
+    access = record(
+        "access",
+        lambda: analysis.access(
+            AccessRequest(**common, targets=targets, payload_ids=["sensor"])
+        ),
+        len(satellites) * len(targets) * number_steps,
+    )
+    access_samples = sum(len(record.samples) for record in access.target_records)
+    exports("access", access, access_samples)
+    record("access.to_compact", lambda: json.dumps(access.to_compact()), access_samples)
+
+    coverage_request = CoverageRequest(**access.model_dump())
+    coverage = record(
+        "coverage", lambda: analysis.coverage(coverage_request), access_samples
+    )
+    exports("coverage", coverage, len(targets))
+
+    datametrics_request = DataMetricsRequest(**access.model_dump())
+    datametrics = record(
+        "datametrics",
+        lambda: analysis.datametrics(datametrics_request),
+        access_samples,
+    )
+    exports("datametrics", datametrics, access_samples)
+    return results
+
+
+def run(cases: List[BenchmarkCase]) -> BenchmarkReport:
+    """
+    Runs a list of benchmark cases.
+    """
+    return BenchmarkReport(
+        created=datetime.now(timezone.utc),
+        results=[result for case in cases for result in run_case(case)],
+    )
+
+
+def compare(
+    report: BenchmarkReport, baseline: BenchmarkReport, tolerance: float = 0.25
+) -> List[str]:
+    """
+    Compares a report against a baseline and describes each (case, stage) whose
+    elapsed time or peak memory grew by more than a relative tolerance.
+    """
+    reference = {(result.case, result.stage): result for result in baseline.results}
+    regressions = []
+    for result in report.results:
+        prior = reference.get((result.case, result.stage))
+        if prior is None:
+            continue
+        for name in ["seconds", "peak_memory"]:
+            before, after = getattr(prior, name), getattr(result, name)
+            if before > 0 and after > before * (1 + tolerance):
+                regressions.append(
+                    f"{result.case} {result.stage}: {name} {before:.4g} -> {after:.4g} "
+                    f"({after / before - 1:+.0%})"
+                )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Command-line entry point; returns a non-zero status if regressions are found.
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m eose.benchmarks", description=__doc__.split("\n\n")[0]
+    )
+    parser.add_argument("--suite", choices=list(SUITES), default="standard")
+    parser.add_argument("--output", help="Path to save the JSON report.")
+    parser.add_argument("--baseline", help="Path of a JSON report to compare against.")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Relative slowdown (or memory growth) reported as a regression.",
+    )
+    args = parser.parse_args(argv)
+
+    report = run(SUITES[args.suite])
+    for result in report.results:
+        print(
+            f"{result.case:<20} {result.stage:<28} {result.seconds:>9.3f} s "
+            f"{result.throughput:>12.4g} samples/s {result.peak_memory / 2**20:>9.1f} MiB"
+        )
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(report.model_dump_json(indent=2))
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as file:
+            baseline = BenchmarkReport.model_validate_json(file.read())
+        regressions = compare(report, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"regression: {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,12 +1,21 @@
-from typing import List, Optional
+from typing import Iterable, Iterator, List, Optional, Tuple
 from datetime import timedelta
 
+import numpy as np
 from geopandas import GeoDataFrame
 from pandas import to_timedelta
 from pydantic import Field
 
-from .geometry import FeatureCollection
-from .access import AccessSample, AccessRecord, AccessResponse
+from .geometry import Feature, FeatureCollection
+from .instrumentation import count, instrumented
+from .targets import TargetPoint, target_index
+from .access import (
+    AccessSample,
+    AccessRecord,
+    AccessResponse,
+    SampleTable,
+    _target_geometry,
+)
 from .utils import Identifier
 
 
@@ -34,40 +43,81 @@ class CoverageRecord(AccessRecord):
     )
     number_samples: int = Field(0, ge=0, description="Number of access samples.")
 
+    @classmethod
+    def iter_from_features(
+        cls, features: Iterable[Feature]
+    ) -> Iterator[Tuple[TargetPoint, "CoverageRecord"]]:
+        """
+        Incrementally creates target points and coverage records from an iterable
+        of coverage record GeoJSON `Feature` objects (see `CoverageResponse.iter_features`).
+        """
+        for feature in features:
+            record = cls.model_validate(feature.properties)
+            yield (
+                TargetPoint(id=record.target_id, position=feature.geometry.coordinates),
+                record,
+            )
+
 
 class CoverageResponse(CoverageRequest):
     target_records: List[CoverageRecord] = Field([], description="Coverage results.")
     harmonic_mean_revisit: Optional[timedelta] = Field(
-        None, ge=0, description="Harmonic mean revisit time over all targets."
+        None,
+        ge=0,
+        description="Harmonic mean revisit time over all targets (weighted by area, if defined).",
     )
     coverage_fraction: float = Field(
-        0, ge=0, le=1, description="Fraction of targets accessed at least once."
+        0,
+        ge=0,
+        le=1,
+        description="Fraction of targets (weighted by area, if defined) accessed at least once.",
     )
 
+    def to_sample_table(self) -> SampleTable:
+        """
+        Encodes the samples (with revisits) of this response as a `SampleTable`.
+        """
+        return SampleTable.from_records(self.start, self.target_records, revisit=True)
+
+    def iter_features(self) -> Iterator[Feature]:
+        """
+        Iterates over this coverage response as GeoJSON `Feature` objects (one per record).
+        """
+        targets = {target.id: target for target in self.targets}
+        for record in self.target_records:
+            yield record.as_feature(targets[record.target_id])
+
     def as_features(self) -> FeatureCollection:
         """
         Converts this coverage response to a GeoJSON `FeatureCollection`.
         """
         return FeatureCollection(
-            type="FeatureCollection",
-            features=[
-                record.as_feature(
-                    next(
-                        target
-                        for target in self.targets
-                        if target.id == record.target_id
-                    )
-                )
-                for record in self.target_records
-            ],
+            type="FeatureCollection", features=list(self.iter_features())
         )
 
+    @instrumented()
     def as_dataframe(self) -> GeoDataFrame:
         """
         Converts this coverage response to a `geopandas.GeoDataFrame`.
         """
-        gdf = GeoDataFrame.from_features(self.as_features())
-        gdf["mean_revisit"] = to_timedelta(
-            gdf["mean_revisit"]
-        )  # helper for type coersion
-        return gdf
+        target_ids = [record.target_id for record in self.target_records]
+        count("targets", len(target_ids))
+        return GeoDataFrame(
+            {
+                "target_id": target_ids,
+                "samples": [
+                    [sample.model_dump() for sample in record.samples]
+                    for record in self.target_records
+                ],
+                "mean_revisit": to_timedelta(
+                    [record.mean_revisit for record in self.target_records]
+                ),
+                "number_samples": np.array(
+                    [record.number_samples for record in self.target_records],
+                    dtype=np.int64,
+                ),
+            },
+            geometry=_target_geometry(self.targets)[
+                target_index(self.targets, target_ids)
+            ],
+        )
@@ -0,0 +1,55 @@
+from datetime import timedelta
+from typing import List, Optional
+
+import numpy as np
+from pydantic import AwareDatetime, BaseModel, Field
+
+from .propagation import PropagationResponse
+from .utils import Identifier
+
+
+class CrosslinkRequest(PropagationResponse):
+    grazing_altitude: float = Field(
+        100e3,
+        ge=0,
+        description="Minimum altitude (meters) of the line of sight above a spherical Earth, e.g., to avoid atmospheric grazing.",
+    )
+    max_range: Optional[float] = Field(
+        None, gt=0, description="Maximum range (meters) between satellites."
+    )
+
+
+class CrosslinkSample(BaseModel):
+    start: AwareDatetime = Field(..., description="Crosslink sample start time.")
+    duration: timedelta = Field(..., ge=0, description="Crosslink sample duration.")
+
+
+class CrosslinkRecord(BaseModel):
+    satellite_id: Identifier = Field(..., description="Satellite identifier.")
+    other_satellite_id: Identifier = Field(
+        ..., description="Identifier of the other satellite of the pair."
+    )
+    samples: List[CrosslinkSample] = Field([], description="List of crosslink samples.")
+
+
+class CrosslinkResponse(CrosslinkRequest):
+    pair_records: List[CrosslinkRecord] = Field(
+        [], description="Crosslink results of satellite pairs with visibility."
+    )
+
+    def as_matrix(self) -> np.ndarray:
+        """
+        Converts this crosslink response to a symmetric (S,S) array of the total
+        visible duration (seconds) of each pair of satellites (in the order of
+        the satellite records).
+        """
+        codes = {
+            record.satellite_id: i for i, record in enumerate(self.satellite_records)
+        }
+        matrix = np.zeros((len(codes), len(codes)))
+        for record in self.pair_records:
+            i, j = codes[record.satellite_id], codes[record.other_satellite_id]
+            matrix[i, j] = matrix[j, i] = sum(
+                sample.duration.total_seconds() for sample in record.samples
+            )
+        return matrix
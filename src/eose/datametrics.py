@@ -1,8 +1,18 @@
 from typing import List, Literal, Union
+
+from geopandas import GeoDataFrame
+from pandas import to_datetime, to_timedelta
 from pydantic import AwareDatetime, BaseModel, Field
 
-from .access import AccessResponse, AccessRecord, AccessSample
+from .access import (
+    AccessResponse,
+    AccessRecord,
+    AccessSample,
+    _target_geometry,
+)
+from .instrumentation import count, instrumented
 from .propagation import PropagationResponse
+from .targets import target_index
 
 
 class DataMetricsRequest(AccessResponse, PropagationResponse):
@@ -101,3 +111,32 @@ class DataMetricsResponse(DataMetricsRequest):
     target_records: List[DataMetricsRecord] = Field(
         [], description="List of data metrics records."
     )
+
+    @instrumented()
+    def as_dataframe(self) -> GeoDataFrame:
+        """
+        Converts this data metrics response to a `geopandas.GeoDataFrame`.
+        """
+        samples = [
+            (record.target_id, sample)
+            for record in self.target_records
+            for sample in record.samples
+        ]
+        target_ids = [target_id for target_id, _ in samples]
+        count("samples", len(samples))
+        return GeoDataFrame(
+            {
+                "target_id": target_ids,
+                "satellite_id": [sample.satellite_id for _, sample in samples],
+                "instrument_id": [sample.instrument_id for _, sample in samples],
+                "start": to_datetime([sample.start for _, sample in samples], utc=True),
+                "duration": to_timedelta([sample.duration for _, sample in samples]),
+                "instantaneous_metrics": [
+                    [metrics.model_dump() for metrics in sample.instantaneous_metrics]
+                    for _, sample in samples
+                ],
+            },
+            geometry=_target_geometry(self.targets)[
+                target_index(self.targets, target_ids)
+            ],
+        )
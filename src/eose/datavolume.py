@@ -0,0 +1,149 @@
+"""
+Collected data volume timelines from access and payload data rates.
+
+Accesses of each (satellite, payload) pair are merged across targets so that
+time spent observing several adjacent targets at once (within one swath) is
+only counted once. The collected data volume is the payload data rate times
+the merged access time, accumulated on the request time grid for each
+satellite, so that onboard storage sizing is an array cumulative sum.
+"""
+
+from datetime import datetime, timedelta
+from typing import List
+
+import numpy as np
+from pandas import DataFrame, to_datetime
+
+from .access import AccessResponse
+from .instrumentation import count, instrumented
+from .intervals import IntervalArray
+from .utils import Identifier
+
+
+class DataVolumeTimeline:
+    """
+    Cumulative collected data volume (megabits) per satellite at each time step.
+    """
+
+    def __init__(
+        self,
+        start: datetime,
+        time_step: timedelta,
+        satellite_ids: List[Identifier],
+        cumulative: np.ndarray,
+    ):
+        self.start = start
+        self.time_step = time_step
+        self.satellite_ids = satellite_ids
+        self.cumulative = cumulative
+
+    @property
+    def times(self) -> List[datetime]:
+        """
+        Returns the time of each step.
+        """
+        return [
+            self.start + i * self.time_step for i in range(self.cumulative.shape[1])
+        ]
+
+    @property
+    def volume(self) -> np.ndarray:
+        """
+        Returns the (S,N) data volume (megabits) collected since the prior time step.
+        """
+        return np.diff(self.cumulative, axis=1, prepend=0)
+
+    @property
+    def total(self) -> np.ndarray:
+        """
+        Returns the (N,) cumulative data volume (megabits) of all satellites.
+        """
+        return np.sum(self.cumulative, axis=0)
+
+    @classmethod
+    @instrumented()
+    def from_response(cls, response: AccessResponse) -> "DataVolumeTimeline":
+        """
+        Computes the data volume timeline of an access response from the
+        `data_rate` of each payload (payloads without a data rate collect no data).
+        """
+        index = response.index
+        unit = timedelta(microseconds=1)
+        number_steps = response.duration // response.time_step + 1
+        grid = np.arange(number_steps, dtype=np.int64) * (response.time_step // unit)
+        satellite_ids = [satellite.id for satellite in response.satellites]
+        cumulative = np.zeros((len(satellite_ids), number_steps))
+        # samples identify satellites and payloads by string identifiers
+        satellite_codes = {
+            str(value): code for code, value in enumerate(index.satellite_ids)
+        }
+        instrument_codes = {
+            str(value): code for code, value in enumerate(index.instrument_ids)
+        }
+        payload_ids = {str(value) for value in response.payload_ids}
+        for s, satellite in enumerate(response.satellites):
+            for payload in satellite.payloads:
+                data_rate = getattr(payload, "data_rate", None)
+                if (
+                    data_rate is None
+                    or str(payload.id) not in payload_ids
+                    or str(satellite.id) not in satellite_codes
+                    or str(payload.id) not in instrument_codes
+                ):
+                    continue
+                selected = (index.satellite == satellite_codes[str(satellite.id)]) & (
+                    index.instrument == instrument_codes[str(payload.id)]
+                )
+                merged = IntervalArray(
+                    index.start,
+                    index.sample_start[selected],
+                    index.sample_end[selected],
+                ).coalesce()
+                count("samples", int(np.sum(selected)))
+                if len(merged) == 0:
+                    continue
+                # merged access time (us) up to each grid time
+                prior = np.concatenate(([0], np.cumsum(merged.duration)))
+                k = np.searchsorted(merged.start, grid, side="right") - 1
+                current = np.maximum(k, 0)
+                elapsed = np.where(
+                    k >= 0,
+                    prior[current]
+                    + np.minimum(
+                        grid - merged.start[current], merged.duration[current]
+                    ),
+                    0,
+                )
+                cumulative[s] += data_rate * elapsed / 1e6
+        return cls(response.start, response.time_step, satellite_ids, cumulative)
+
+    def get_peak_storage(self, downlink: float = 0) -> np.ndarray:
+        """
+        Returns the (S,) peak onboard storage (megabits) of each satellite,
+        optionally draining stored data at a constant downlink rate (megabits
+        per second) whenever data is stored.
+        """
+        if downlink <= 0:
+            return self.cumulative[:, -1].copy()
+        # storage max(storage + volume - drain, 0) is the cumulative net volume
+        # less its running minimum (clipped at zero for the empty start)
+        net = np.cumsum(self.volume - downlink * self.time_step.total_seconds(), axis=1)
+        storage = net - np.minimum.accumulate(np.minimum(net, 0), axis=1)
+        return np.max(storage, axis=1, initial=0)
+
+    def as_dataframe(self) -> DataFrame:
+        """
+        Converts this timeline to a `pandas.DataFrame` (one row per satellite
+        and time step).
+        """
+        number_steps = self.cumulative.shape[1]
+        return DataFrame(
+            {
+                "satellite_id": np.repeat(
+                    np.array(self.satellite_ids, dtype=object), number_steps
+                ),
+                "time": to_datetime(self.times * len(self.satellite_ids), utc=True),
+                "volume": self.volume.ravel(),
+                "cumulative": self.cumulative.ravel(),
+            }
+        )
@@ -0,0 +1,222 @@
+"""
+Memory-mapped on-disk store for propagated ephemerides.
+
+An ephemeris file holds the samples of a `PropagationResponse` on its uniform
+`start`/`time_step` grid using a fixed-stride binary layout:
+
+  * an 8-byte magic string (`EOSEEPH1`) followed by a little-endian `uint32`
+    header length and a UTF-8 JSON header (padded to a 64-byte boundary)
+    recording the start time, time step, number of steps, reference frame
+    and satellite identifiers
+  * one contiguous block per satellite (in header order) of `number_steps`
+    rows, each row holding the time offset from start (`int64` microseconds),
+    position (3 x `float64` meters) and velocity (3 x `float64` meters per second)
+
+Files are opened with `numpy.memmap` so that many processes can share one copy
+of the ephemeris in the operating system page cache and read any time slice by
+index arithmetic.
+"""
+
+import json
+import math
+import struct
+from datetime import datetime, timedelta, timezone
+from os import PathLike
+from typing import List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .propagation import (
+    PropagationRecord,
+    PropagationResponse,
+    PropagationSample,
+    hermite_interpolate,
+    time_offsets,
+)
+from .utils import CartesianReferenceFrame, Identifier
+
+MAGIC = b"EOSEEPH1"
+
+SAMPLE_DTYPE = np.dtype(
+    [("time", "<i8"), ("position", "<f8", (3,)), ("velocity", "<f8", (3,))]
+)
+
+_ALIGNMENT = 64
+
+
+def _microseconds(duration: timedelta) -> int:
+    return duration // timedelta(microseconds=1)
+
+
+class EphemerisStore:
+    """
+    Read-only view of an ephemeris file on a uniform time grid.
+    """
+
+    def __init__(self, path: Union[str, PathLike]):
+        with open(path, "rb") as file:
+            if file.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} is not an ephemeris file.")
+            (length,) = struct.unpack("<I", file.read(4))
+            header = json.loads(file.read(length).decode("utf-8"))
+        self.path = path
+        self.start = datetime.fromisoformat(header["start"])
+        self.time_step = timedelta(microseconds=header["time_step"])
+        self.number_steps: int = header["number_steps"]
+        self.frame = CartesianReferenceFrame(header["frame"])
+        self.satellite_ids: List[Identifier] = header["satellite_ids"]
+        self._satellite_index = {
+            satellite_id: i for i, satellite_id in enumerate(self.satellite_ids)
+        }
+        self._data = np.memmap(
+            path,
+            dtype=SAMPLE_DTYPE,
+            mode="r",
+            offset=len(MAGIC) + 4 + length,
+            shape=(len(self.satellite_ids), self.number_steps),
+        )
+
+    @classmethod
+    def write(
+        cls, path: Union[str, PathLike], response: PropagationResponse
+    ) -> "EphemerisStore":
+        """
+        Writes a propagation response to an ephemeris file and opens it.
+
+        All records must share the response `start`/`time_step` grid.
+        """
+        time_step = _microseconds(response.time_step)
+        number_steps = _microseconds(response.duration) // time_step + 1
+        satellite_ids = [record.satellite_id for record in response.satellite_records]
+        header = json.dumps(
+            {
+                "start": response.start.isoformat(),
+                "time_step": time_step,
+                "number_steps": number_steps,
+                "frame": CartesianReferenceFrame(response.frame).value,
+                "satellite_ids": satellite_ids,
+            }
+        ).encode("utf-8")
+        # pad the header with whitespace so that samples start on an aligned offset
+        offset = math.ceil((len(MAGIC) + 4 + len(header)) / _ALIGNMENT) * _ALIGNMENT
+        header = header.ljust(offset - len(MAGIC) - 4, b" ")
+        with open(path, "wb") as file:
+            file.write(MAGIC)
+            file.write(struct.pack("<I", len(header)))
+            file.write(header)
+            file.truncate(
+                offset + SAMPLE_DTYPE.itemsize * len(satellite_ids) * number_steps
+            )
+
+        data = np.memmap(
+            path,
+            dtype=SAMPLE_DTYPE,
+            mode="r+",
+            offset=offset,
+            shape=(len(satellite_ids), number_steps),
+        )
+        for i, record in enumerate(response.satellite_records):
+            if len(record.samples) != number_steps:
+                raise ValueError(
+                    f"Satellite {record.satellite_id} has {len(record.samples)} samples, "
+                    f"expected {number_steps} on the request time grid."
+                )
+            times = np.array(
+                [
+                    _microseconds(sample.time - response.start)
+                    for sample in record.samples
+                ],
+                dtype=np.int64,
+            )
+            if np.any(times != np.arange(number_steps, dtype=np.int64) * time_step):
+                raise ValueError(
+                    f"Satellite {record.satellite_id} samples are not on the request time grid."
+                )
+            data[i]["time"] = times
+            data[i]["position"] = [sample.position for sample in record.samples]
+            data[i]["velocity"] = [sample.velocity for sample in record.samples]
+        data.flush()
+        del data
+        return cls(path)
+
+    def index(self, time: datetime) -> int:
+        """
+        Returns the index of the last time step at or before a time.
+        """
+        return (time - self.start) // self.time_step
+
+    def samples(
+        self,
+        satellite_id: Identifier,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> np.ndarray:
+        """
+        Returns a (read-only, memory-mapped) structured array of the samples for
+        a satellite between `start` and `end` (inclusive).
+        """
+        i = 0 if start is None else max(0, -((self.start - start) // self.time_step))
+        j = (
+            self.number_steps
+            if end is None
+            else min(self.number_steps, self.index(end) + 1)
+        )
+        return self._data[self._satellite_index[satellite_id], i : max(i, j)]
+
+    def times(self, samples: np.ndarray) -> np.ndarray:
+        """
+        Converts the time offsets of a structured sample array to `numpy.datetime64` values.
+        """
+        return np.datetime64(
+            self.start.astimezone(timezone.utc).replace(tzinfo=None), "us"
+        ) + samples["time"].astype("timedelta64[us]")
+
+    def at(
+        self, satellite_id: Identifier, times: Union[np.ndarray, Sequence[datetime]]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the positions (m) and velocities (m/s) of a satellite (in the
+        store frame) at times within the grid (`numpy.datetime64` values,
+        interpreted as UTC, or datetimes) by cubic Hermite interpolation.
+        """
+        query = time_offsets(times, self.start)
+        step = _microseconds(self.time_step)
+        # read only the samples bracketing the query times
+        if query.size and np.min(query) >= 0:
+            i = min(int(np.min(query)) // step, max(self.number_steps - 2, 0))
+        else:
+            i = 0
+        j = min(int(np.max(query)) // step + 2, self.number_steps) if query.size else 0
+        samples = self._data[self._satellite_index[satellite_id], i : max(i, j)]
+        return hermite_interpolate(
+            samples["time"],
+            samples["position"],
+            samples["velocity"],
+            query,
+            step,
+        )
+
+    def to_record(
+        self,
+        satellite_id: Identifier,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> PropagationRecord:
+        """
+        Converts the samples for a satellite (optionally between `start` and `end`)
+        to a `PropagationRecord`.
+        """
+        samples = self.samples(satellite_id, start, end)
+        return PropagationRecord(
+            satellite_id=satellite_id,
+            samples=[
+                PropagationSample(
+                    time=self.start + timedelta(microseconds=int(time)),
+                    position=position.tolist(),
+                    velocity=velocity.tolist(),
+                )
+                for time, position, velocity in zip(
+                    samples["time"], samples["position"], samples["velocity"]
+                )
+            ],
+        )
@@ -0,0 +1,266 @@
+"""
+Vectorized transformations between Cartesian reference frames.
+
+Rotations between frames are computed for a whole array of times at once and
+cached by (frame pair, times) so that all satellites sharing one time grid pay
+for the Earth-orientation computation only once.
+"""
+
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from functools import lru_cache
+from threading import Lock
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+from skyfield.api import load, wgs84
+from skyfield.constants import ANGVEL, AU_M
+from skyfield.framelib import itrs
+from skyfield.sgp4lib import TEME
+from skyfield.timelib import Time, Timescale
+
+from .instrumentation import count, instrumented
+from .utils import CartesianReferenceFrame
+
+_FRAMES: Dict[CartesianReferenceFrame, object] = {
+    CartesianReferenceFrame.ICRF: None,
+    CartesianReferenceFrame.ITRS: itrs,
+    CartesianReferenceFrame.TEME: TEME,
+}
+
+# Angular velocity matrices (per second) of the frames relative to ICRF.
+# Skyfield only exposes frame rates through the private `_dRdt_times_RT_at`
+# method, which returns this constant Earth rotation matrix for ITRS (built
+# here from the public `ANGVEL` constant instead). TEME is quasi-inertial and
+# Skyfield applies no rate to it either.
+_RATES: Dict[CartesianReferenceFrame, np.ndarray] = {
+    CartesianReferenceFrame.ITRS: np.array(
+        [[0.0, ANGVEL, 0.0], [-ANGVEL, 0.0, 0.0], [0.0, 0.0, 0.0]]
+    ),
+}
+
+
+@lru_cache(maxsize=None)
+def get_timescale() -> Timescale:
+    """
+    Returns a (shared) Skyfield timescale using built-in time data.
+    """
+    return load.timescale()
+
+
+def get_times(times: Sequence[datetime]) -> Time:
+    """
+    Converts a sequence of aware datetimes to a vectorized Skyfield `Time`.
+    """
+    return get_timescale().from_datetimes(list(times))
+
+
+def time_grid(
+    start: datetime, duration: timedelta, time_step: timedelta
+) -> Tuple[datetime, ...]:
+    """
+    Enumerates the uniform time grid from `start` to `start + duration` (inclusive).
+    """
+    return tuple(start + i * time_step for i in range(duration // time_step + 1))
+
+
+def _rotation_and_rate(
+    frame: CartesianReferenceFrame, t: Time
+) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """
+    Returns the (N,3,3) rotation from ICRF to a frame and the (3,3) angular
+    velocity matrix (per second) of the frame, if any.
+    """
+    frame = CartesianReferenceFrame(frame)
+    skyfield_frame = _FRAMES[frame]
+    if skyfield_frame is None:
+        return np.broadcast_to(np.eye(3), (len(t), 3, 3)), None
+    rotation = np.moveaxis(np.reshape(skyfield_frame.rotation_at(t), (3, 3, -1)), -1, 0)
+    return np.broadcast_to(rotation, (len(t), 3, 3)), _RATES.get(frame)
+
+
+class FrameRotation:
+    """
+    Rotation between two Cartesian reference frames over an array of times.
+    """
+
+    def __init__(
+        self,
+        matrix: np.ndarray,
+        source_rate: Optional[np.ndarray] = None,
+        target_rate: Optional[np.ndarray] = None,
+    ):
+        self.matrix = matrix
+        self.source_rate = source_rate
+        self.target_rate = target_rate
+
+    def apply(
+        self, position: np.ndarray, velocity: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """
+        Transforms (...,N,3) position (m) and optional velocity (m/s) arrays.
+
+        Velocities account for the rotation rate of non-inertial frames.
+        """
+        position = np.asarray(position, dtype=float)
+        rotated = np.einsum("nij,...nj->...ni", self.matrix, position)
+        if velocity is None:
+            return rotated, None
+        velocity = np.asarray(velocity, dtype=float)
+        if self.source_rate is not None:
+            velocity = velocity - position @ self.source_rate.T
+        velocity = np.einsum("nij,...nj->...ni", self.matrix, velocity)
+        if self.target_rate is not None:
+            velocity = velocity + rotated @ self.target_rate.T
+        return rotated, velocity
+
+
+@instrumented()
+def _frame_rotation(
+    source: CartesianReferenceFrame,
+    target: CartesianReferenceFrame,
+    times: Tuple[datetime, ...],
+) -> FrameRotation:
+    t = get_times(times)
+    source_matrix, source_rate = _rotation_and_rate(source, t)
+    target_matrix, target_rate = _rotation_and_rate(target, t)
+    return FrameRotation(
+        np.einsum("nij,nkj->nik", target_matrix, source_matrix),
+        source_rate,
+        target_rate,
+    )
+
+
+_ROTATION_CACHE_SIZE = 64
+
+_rotations: "OrderedDict[tuple, FrameRotation]" = OrderedDict()
+
+_rotations_lock = Lock()
+
+
+def get_frame_rotation(
+    source: CartesianReferenceFrame,
+    target: CartesianReferenceFrame,
+    times: Tuple[datetime, ...],
+) -> FrameRotation:
+    """
+    Returns the (cached) rotation from a source frame to a target frame at each time.
+    """
+    key = (source, target, times)
+    with _rotations_lock:
+        rotation = _rotations.get(key)
+        if rotation is not None:
+            _rotations.move_to_end(key)
+    if rotation is not None:
+        count("frame_rotation.cache_hit")
+        return rotation
+    count("frame_rotation.cache_miss")
+    rotation = _frame_rotation(source, target, times)
+    with _rotations_lock:
+        _rotations[key] = rotation
+        _rotations.move_to_end(key)
+        while len(_rotations) > _ROTATION_CACHE_SIZE:
+            _rotations.popitem(last=False)
+    return rotation
+
+
+def transform(
+    position: np.ndarray,
+    velocity: Optional[np.ndarray],
+    source: CartesianReferenceFrame,
+    target: CartesianReferenceFrame,
+    times: Sequence[datetime],
+) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """
+    Transforms (...,N,3) position (m) and velocity (m/s) arrays at N times from
+    a source frame to a target frame.
+    """
+    if CartesianReferenceFrame(source) == CartesianReferenceFrame(target):
+        return np.asarray(position, dtype=float), (
+            None if velocity is None else np.asarray(velocity, dtype=float)
+        )
+    rotation = get_frame_rotation(
+        CartesianReferenceFrame(source), CartesianReferenceFrame(target), tuple(times)
+    )
+    return rotation.apply(position, velocity)
+
+
+def itrs_to_geodetic(position: np.ndarray) -> np.ndarray:
+    """
+    Converts (N,3) ITRS positions (m) to (N,3) WGS 84 geodetic longitude
+    (degrees), latitude (degrees) and altitude (m) above the ellipsoid.
+    """
+    x, y, z = np.asarray(position, dtype=float).T
+    a = wgs84.radius.m
+    f = 1.0 / wgs84.inverse_flattening
+    e2 = 2.0 * f - f * f
+    r = np.hypot(x, y)
+    latitude = np.arctan2(z, r)
+    for _ in range(3):
+        e2_sin_latitude = e2 * np.sin(latitude)
+        a_c = a / np.sqrt(1.0 - e2_sin_latitude * np.sin(latitude))
+        hyp = z + a_c * e2_sin_latitude
+        latitude = np.arctan2(hyp, r)
+    longitude = (np.arctan2(y, x) - np.pi) % (2 * np.pi) - np.pi
+    return np.column_stack(
+        (np.degrees(longitude), np.degrees(latitude), np.hypot(hyp, r) - a_c)
+    )
+
+
+def geodetic_to_itrs(coordinates: np.ndarray) -> np.ndarray:
+    """
+    Converts (N,2) or (N,3) WGS 84 geodetic longitude (degrees), latitude
+    (degrees) and optional altitude (m) to (N,3) ITRS positions (m).
+    """
+    coordinates = np.asarray(coordinates, dtype=float).reshape(
+        -1, np.shape(coordinates)[-1]
+    )
+    longitude = np.radians(coordinates[:, 0])
+    latitude = np.radians(coordinates[:, 1])
+    altitude = coordinates[:, 2] if coordinates.shape[1] > 2 else 0.0
+    a = wgs84.radius.m
+    f = 1.0 / wgs84.inverse_flattening
+    e2 = 2.0 * f - f * f
+    n = a / np.sqrt(1.0 - e2 * np.sin(latitude) ** 2)
+    return np.column_stack(
+        (
+            (n + altitude) * np.cos(latitude) * np.cos(longitude),
+            (n + altitude) * np.cos(latitude) * np.sin(longitude),
+            (n * (1.0 - e2) + altitude) * np.sin(latitude),
+        )
+    )
+
+
+def get_sun_position(times: Sequence[datetime]) -> np.ndarray:
+    """
+    Computes (N,3) geocentric ICRF positions (m) of the Sun at N times.
+
+    Uses the low-precision solar coordinates of the Astronomical Almanac
+    (about 0.01 degrees between 1950 and 2050), which avoids loading a
+    planetary ephemeris file.
+    """
+    t = get_times(times)
+    n = np.atleast_1d(t.tt) - 2451545.0
+    mean_longitude = np.radians(280.460 + 0.9856474 * n)
+    mean_anomaly = np.radians(357.528 + 0.9856003 * n)
+    longitude = (
+        mean_longitude
+        + np.radians(1.915) * np.sin(mean_anomaly)
+        + np.radians(0.020) * np.sin(2 * mean_anomaly)
+    )
+    obliquity = np.radians(23.439 - 0.0000004 * n)
+    distance = AU_M * (
+        1.00014 - 0.01671 * np.cos(mean_anomaly) - 0.00014 * np.cos(2 * mean_anomaly)
+    )
+    position = np.column_stack(
+        (
+            distance * np.cos(longitude),
+            distance * np.cos(obliquity) * np.sin(longitude),
+            distance * np.sin(obliquity) * np.sin(longitude),
+        )
+    )
+    # rotate from the equator and equinox of date to ICRF
+    precession_nutation = np.moveaxis(np.reshape(t.M, (3, 3, -1)), -1, 0)
+    return np.einsum(
+        "nji,nj->ni", np.broadcast_to(precession_nutation, (len(n), 3, 3)), position
+    )
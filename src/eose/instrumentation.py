@@ -0,0 +1,222 @@
+"""
+Lightweight instrumentation of analysis functions and converters.
+
+Library code opens named timing spans (with attributes such as sample and
+target counts or bytes serialized) and increments counters (such as cache
+hits and misses) on the innermost open span. Spans are only created while at
+least one hook is registered, so instrumentation costs a single check when
+unused and a few microseconds per span otherwise.
+
+Hooks are callables that receive each `Span` when it closes. A `Tracer` is a
+hook that collects spans while used as a context manager and exports them to
+a JSON trace file (Chrome trace event format, viewable in Perfetto)::
+
+    with Tracer() as tracer:
+        response = analysis.access(request)
+    tracer.write("trace.json")
+"""
+
+import json
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from os import PathLike
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
+
+Hook = Callable[["Span"], None]
+
+_hooks: List[Hook] = []
+
+_current: ContextVar[Optional["Span"]] = ContextVar("span", default=None)
+
+
+class Span:
+    """
+    Timed operation with attributes and counters.
+    """
+
+    __slots__ = ("name", "parent", "start", "duration", "attributes", "counters")
+
+    def __init__(self, name: str, parent: Optional["Span"] = None, **attributes: Any):
+        self.name = name
+        self.parent = parent
+        self.start = time.perf_counter()
+        self.duration: Optional[float] = None
+        self.attributes: Dict[str, Any] = attributes
+        self.counters: Dict[str, int] = {}
+
+    def set(self, **attributes: Any) -> None:
+        """
+        Sets attributes (e.g., `samples`, `targets`, `bytes`) on this span.
+        """
+        self.attributes.update(attributes)
+
+    def count(self, name: str, value: int = 1) -> None:
+        """
+        Increments a counter on this span.
+        """
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        Converts this span to a JSON-compatible dictionary.
+        """
+        return {
+            "name": self.name,
+            "parent": None if self.parent is None else self.parent.name,
+            "start": self.start,
+            "duration": self.duration,
+            "attributes": self.attributes,
+            "counters": self.counters,
+        }
+
+
+class _NullSpan:
+    """
+    Span placeholder used while no hooks are registered.
+    """
+
+    __slots__ = ()
+
+    def set(self, **attributes: Any) -> None:
+        pass
+
+    def count(self, name: str, value: int = 1) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def add_hook(hook: Hook) -> None:
+    """
+    Registers a hook to receive every span when it closes.
+    """
+    _hooks.append(hook)
+
+
+def remove_hook(hook: Hook) -> None:
+    """
+    Unregisters a hook.
+    """
+    _hooks.remove(hook)
+
+
+def enabled() -> bool:
+    """
+    Returns whether any hook is registered (i.e., spans are being recorded).
+    """
+    return bool(_hooks)
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Union[Span, _NullSpan]]:
+    """
+    Opens a named timing span around a block of code.
+    """
+    if not _hooks:
+        yield _NULL_SPAN
+        return
+    current = Span(name, _current.get(), **attributes)
+    token = _current.set(current)
+    try:
+        yield current
+    finally:
+        current.duration = time.perf_counter() - current.start
+        _current.reset(token)
+        for hook in list(_hooks):
+            hook(current)
+
+
+def count(name: str, value: int = 1) -> None:
+    """
+    Increments a counter (e.g., cache hits) on the innermost open span.
+    """
+    current = _current.get()
+    if current is not None:
+        current.count(name, value)
+
+
+def instrumented(name: Optional[str] = None) -> Callable[[Callable], Callable]:
+    """
+    Decorates a function to run inside a span (named after the function by default).
+    """
+
+    def decorator(function: Callable) -> Callable:
+        label = name or function.__qualname__
+
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            if not _hooks:
+                return function(*args, **kwargs)
+            with span(label):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+class Tracer:
+    """
+    Hook that collects spans, usable as a context manager.
+    """
+
+    def __init__(self):
+        self.spans: List[Span] = []
+
+    def __call__(self, span: Span) -> None:
+        self.spans.append(span)
+
+    def __enter__(self) -> "Tracer":
+        add_hook(self)
+        return self
+
+    def __exit__(self, *args) -> None:
+        remove_hook(self)
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Aggregates the number of calls, total duration, numeric attributes and
+        counters of the collected spans by name.
+        """
+        summary: Dict[str, Dict[str, Any]] = {}
+        for item in self.spans:
+            entry = summary.setdefault(item.name, {"calls": 0, "seconds": 0.0})
+            entry["calls"] += 1
+            entry["seconds"] += item.duration
+            for key, value in list(item.attributes.items()) + list(
+                item.counters.items()
+            ):
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    entry[key] = entry.get(key, 0) + value
+        return summary
+
+    def as_trace(self) -> Dict[str, Any]:
+        """
+        Converts the collected spans to Chrome trace event format.
+        """
+        origin = min((item.start for item in self.spans), default=0)
+        return {
+            "traceEvents": [
+                {
+                    "name": item.name,
+                    "ph": "X",
+                    "ts": (item.start - origin) * 1e6,
+                    "dur": item.duration * 1e6,
+                    "pid": 0,
+                    "tid": 0,
+                    "args": dict(item.attributes, **item.counters),
+                }
+                for item in self.spans
+            ],
+            "displayTimeUnit": "ms",
+        }
+
+    def write(self, path: Union[str, PathLike]) -> None:
+        """
+        Writes the collected spans to a JSON trace file.
+        """
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.as_trace(), file, default=str)
@@ -0,0 +1,422 @@
+"""
+Sorted interval arrays with vectorized set algebra.
+
+An `IntervalArray` stores closed intervals as `int64` start and end offsets
+(microseconds) from a reference epoch with categorical satellite and
+instrument codes, so that merging, gap extraction and set operations on the
+accesses of many satellites are array operations rather than sorting lists of
+`AccessSample` objects. Set operations treat intervals as sets of microsecond
+time points; a code of -1 marks an interval without a satellite or instrument
+(e.g., a gap or an arbitrary time window).
+"""
+
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .access import AccessRecord, AccessSample
+from .utils import Identifier
+
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def _offsets(times: Iterable[datetime], epoch: datetime) -> np.ndarray:
+    return np.array([(time - epoch) // _MICROSECOND for time in times], dtype=np.int64)
+
+
+def merge_runs(
+    start: np.ndarray,
+    end: np.ndarray,
+    group: Optional[np.ndarray] = None,
+    min_gap: int = 0,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Finds the runs of overlapping integer (start, end) intervals, optionally
+    per group (e.g., target index), including intervals separated by at most
+    `min_gap`.
+
+    Returns the order sorting the intervals by group, start and end time and
+    the first position (in that order) of each run, so that the merged
+    intervals start at `start[order][runs]` and end at
+    `np.maximum.reduceat(end[order], runs)`.
+    """
+    start = np.asarray(start, dtype=np.int64)
+    end = np.asarray(end, dtype=np.int64)
+    if group is None:
+        order = np.lexsort((end, start))
+        offset = 0
+    else:
+        group = np.asarray(group)
+        order = np.lexsort((end, start, group))
+    if len(order) == 0:
+        return order, np.empty(0, dtype=np.int64)
+    start, end = start[order], end[order]
+    if group is not None:
+        # offset each group so that running maxima do not carry across groups
+        offset = np.unique(group[order], return_inverse=True)[1].ravel() * (
+            int(np.max(end)) - min(0, int(np.min(start))) + min_gap + 1
+        )
+    runs = np.flatnonzero(
+        np.r_[
+            True,
+            (start + offset)[1:] > np.maximum.accumulate(end + offset)[:-1] + min_gap,
+        ]
+    )
+    return order, runs
+
+
+class IntervalArray:
+    """
+    Closed time intervals with categorical satellite and instrument codes.
+    """
+
+    def __init__(
+        self,
+        epoch: datetime,
+        start: np.ndarray,
+        end: np.ndarray,
+        satellite: Optional[np.ndarray] = None,
+        instrument: Optional[np.ndarray] = None,
+        satellite_ids: Optional[List[Identifier]] = None,
+        instrument_ids: Optional[List[Identifier]] = None,
+    ):
+        self.epoch = epoch
+        self.start = np.asarray(start, dtype=np.int64)
+        self.end = np.asarray(end, dtype=np.int64)
+        if np.any(self.end < self.start):
+            raise ValueError("Interval end must not precede start.")
+        self.satellite = (
+            np.full(len(self.start), -1, dtype=np.int32)
+            if satellite is None
+            else np.asarray(satellite, dtype=np.int32)
+        )
+        self.instrument = (
+            np.full(len(self.start), -1, dtype=np.int32)
+            if instrument is None
+            else np.asarray(instrument, dtype=np.int32)
+        )
+        self.satellite_ids: List[Identifier] = list(satellite_ids or [])
+        self.instrument_ids: List[Identifier] = list(instrument_ids or [])
+
+    def __len__(self) -> int:
+        return len(self.start)
+
+    def __repr__(self) -> str:
+        return f"IntervalArray(epoch={self.epoch.isoformat()}, length={len(self)})"
+
+    @classmethod
+    def from_windows(
+        cls, epoch: datetime, windows: Iterable[Tuple[datetime, datetime]]
+    ) -> "IntervalArray":
+        """
+        Creates an (unlabeled) interval array from (start, end) time windows.
+        """
+        windows = list(windows)
+        return cls(
+            epoch,
+            _offsets((start for start, _ in windows), epoch),
+            _offsets((end for _, end in windows), epoch),
+        )
+
+    @classmethod
+    def from_samples(
+        cls, samples: Sequence[AccessSample], epoch: datetime
+    ) -> "IntervalArray":
+        """
+        Creates an interval array from access samples.
+        """
+        satellite_ids = list(dict.fromkeys(sample.satellite_id for sample in samples))
+        instrument_ids = list(dict.fromkeys(sample.instrument_id for sample in samples))
+        satellite_codes = {value: code for code, value in enumerate(satellite_ids)}
+        instrument_codes = {value: code for code, value in enumerate(instrument_ids)}
+        start = _offsets((sample.start for sample in samples), epoch)
+        return cls(
+            epoch,
+            start,
+            start
+            + np.array(
+                [sample.duration // _MICROSECOND for sample in samples], dtype=np.int64
+            ),
+            [satellite_codes[sample.satellite_id] for sample in samples],
+            [instrument_codes[sample.instrument_id] for sample in samples],
+            satellite_ids,
+            instrument_ids,
+        ).sort()
+
+    @classmethod
+    def from_pair_intervals(
+        cls,
+        epoch: datetime,
+        intervals: Sequence[
+            Tuple[Identifier, Identifier, np.ndarray, np.ndarray, np.ndarray]
+        ],
+    ) -> Tuple[np.ndarray, "IntervalArray"]:
+        """
+        Creates an interval array (and the target index of each interval) from
+        the satellite identifier, instrument identifier and arrays of target
+        index, start and end time (integer microseconds from the epoch) of
+        (satellite, payload) pairs (see `Backend.access_intervals`).
+        Identifiers are labeled as strings.
+        """
+        satellite_codes, instrument_codes = {}, {}
+        codes = [
+            (
+                satellite_codes.setdefault(str(satellite_id), len(satellite_codes)),
+                instrument_codes.setdefault(str(instrument_id), len(instrument_codes)),
+                len(index),
+            )
+            for satellite_id, instrument_id, index, _, _ in intervals
+        ]
+        columns = [
+            np.concatenate([np.asarray(column, dtype=np.int64) for column in columns])
+            for columns in zip(*(interval[2:] for interval in intervals))
+        ] or [np.empty(0, dtype=np.int64)] * 3
+        return columns[0], cls(
+            epoch,
+            columns[1],
+            columns[2],
+            np.repeat([code for code, _, _ in codes], [n for _, _, n in codes]),
+            np.repeat([code for _, code, _ in codes], [n for _, _, n in codes]),
+            list(satellite_codes),
+            list(instrument_codes),
+        )
+
+    @classmethod
+    def from_record(cls, record: AccessRecord, epoch: datetime) -> "IntervalArray":
+        """
+        Creates an interval array from the samples of an access record.
+        """
+        return cls.from_samples(record.samples, epoch)
+
+    def to_samples(self) -> List[AccessSample]:
+        """
+        Converts this interval array to a list of access samples.
+        """
+        if np.any(self.satellite < 0) or np.any(self.instrument < 0):
+            raise ValueError("Intervals without satellite or instrument codes.")
+        return [
+            AccessSample(
+                satellite_id=self.satellite_ids[k],
+                instrument_id=self.instrument_ids[m],
+                start=self.epoch + timedelta(microseconds=i),
+                duration=timedelta(microseconds=j - i),
+            )
+            for i, j, k, m in zip(
+                self.start.tolist(),
+                self.end.tolist(),
+                self.satellite.tolist(),
+                self.instrument.tolist(),
+            )
+        ]
+
+    def to_record(self, target_id: Identifier) -> AccessRecord:
+        """
+        Converts this interval array to an access record for a target.
+        """
+        return AccessRecord(target_id=target_id, samples=self.to_samples())
+
+    @property
+    def duration(self) -> np.ndarray:
+        """
+        Returns the duration (microseconds) of each interval.
+        """
+        return self.end - self.start
+
+    def _take(self, indices: np.ndarray) -> "IntervalArray":
+        return IntervalArray(
+            self.epoch,
+            self.start[indices],
+            self.end[indices],
+            self.satellite[indices],
+            self.instrument[indices],
+            self.satellite_ids,
+            self.instrument_ids,
+        )
+
+    def sort(self) -> "IntervalArray":
+        """
+        Returns a copy of this interval array sorted by start then end time.
+        """
+        return self._take(np.lexsort((self.end, self.start)))
+
+    def shift(self, epoch: datetime) -> "IntervalArray":
+        """
+        Returns a copy of this interval array relative to another epoch.
+        """
+        offset = (self.epoch - epoch) // _MICROSECOND
+        return IntervalArray(
+            epoch,
+            self.start + offset,
+            self.end + offset,
+            self.satellite,
+            self.instrument,
+            self.satellite_ids,
+            self.instrument_ids,
+        )
+
+    def concatenate(self, other: "IntervalArray") -> "IntervalArray":
+        """
+        Concatenates two interval arrays (relative to the epoch of this one),
+        merging their satellite and instrument categories.
+        """
+        other = other.shift(self.epoch)
+        satellite_ids = list(dict.fromkeys(self.satellite_ids + other.satellite_ids))
+        instrument_ids = list(dict.fromkeys(self.instrument_ids + other.instrument_ids))
+
+        def recode(codes, categories, merged):
+            mapping = np.array([merged.index(value) for value in categories] + [-1])
+            return mapping[codes]
+
+        return IntervalArray(
+            self.epoch,
+            np.concatenate((self.start, other.start)),
+            np.concatenate((self.end, other.end)),
+            np.concatenate(
+                (
+                    recode(self.satellite, self.satellite_ids, satellite_ids),
+                    recode(other.satellite, other.satellite_ids, satellite_ids),
+                )
+            ),
+            np.concatenate(
+                (
+                    recode(self.instrument, self.instrument_ids, instrument_ids),
+                    recode(other.instrument, other.instrument_ids, instrument_ids),
+                )
+            ),
+            satellite_ids,
+            instrument_ids,
+        )
+
+    def coalesce(self, min_gap: timedelta = timedelta(0)) -> "IntervalArray":
+        """
+        Merges overlapping intervals and intervals separated by at most `min_gap`.
+
+        Merged intervals from different satellites (or instruments) are
+        labeled by joining their identifiers with commas, as in `CoverageSample`.
+        """
+        return self.coalesce_by(None, min_gap)[1]
+
+    def coalesce_by(
+        self, group: Optional[np.ndarray], min_gap: timedelta = timedelta(0)
+    ) -> Tuple[np.ndarray, "IntervalArray"]:
+        """
+        Merges overlapping intervals (and intervals separated by at most
+        `min_gap`) of the same group (e.g., target index) as `coalesce`.
+
+        Returns the group of each merged interval and the merged intervals,
+        sorted by group then time.
+        """
+        if len(self) == 0:
+            return np.empty(0, dtype=np.int64), self
+        order, runs = merge_runs(self.start, self.end, group, min_gap // _MICROSECOND)
+        ordered = self._take(order)
+        satellite_ids = list(ordered.satellite_ids)
+        instrument_ids = list(ordered.instrument_ids)
+
+        def labels(codes, categories):
+            merged = codes[runs].copy()
+            mixed = np.flatnonzero(
+                np.minimum.reduceat(codes, runs) != np.maximum.reduceat(codes, runs)
+            )
+            bounds = np.r_[runs, len(codes)]
+            lookup = {value: code for code, value in enumerate(categories)}
+            for k in mixed.tolist():
+                values = ", ".join(
+                    str(categories[code])
+                    for code in dict.fromkeys(codes[bounds[k] : bounds[k + 1]].tolist())
+                    if code >= 0
+                )
+                if values not in lookup:
+                    lookup[values] = len(categories)
+                    categories.append(values)
+                merged[k] = lookup[values]
+            return merged
+
+        return (
+            (
+                np.zeros(len(runs), dtype=np.int64)
+                if group is None
+                else np.asarray(group)[order][runs]
+            ),
+            IntervalArray(
+                self.epoch,
+                ordered.start[runs],
+                np.maximum.reduceat(ordered.end, runs),
+                labels(ordered.satellite, satellite_ids),
+                labels(ordered.instrument, instrument_ids),
+                satellite_ids,
+                instrument_ids,
+            ),
+        )
+
+    def union(self, other: "IntervalArray") -> "IntervalArray":
+        """
+        Returns the coalesced union of two interval arrays.
+        """
+        return self.concatenate(other).coalesce()
+
+    def _overlaps(
+        self, other: "IntervalArray"
+    ) -> Tuple["IntervalArray", np.ndarray, np.ndarray]:
+        """
+        Returns the coalesced other array and the range of its intervals
+        overlapping each interval of this array.
+        """
+        windows = other.shift(self.epoch).coalesce()
+        first = np.searchsorted(windows.end, self.start, side="left")
+        last = np.searchsorted(windows.start, self.end, side="right")
+        return windows, first, np.maximum(last, first)
+
+    def intersection(self, other: "IntervalArray") -> "IntervalArray":
+        """
+        Clips the intervals of this array to the time covered by another
+        (e.g., daylight windows), keeping the labels of this array.
+        """
+        windows, first, last = self._overlaps(other)
+        counts = last - first
+        source = np.repeat(np.arange(len(self)), counts)
+        window = (
+            np.arange(np.sum(counts)) - np.repeat(np.cumsum(counts) - counts, counts)
+        ) + np.repeat(first, counts)
+        result = self._take(source)
+        result.start = np.maximum(result.start, windows.start[window])
+        result.end = np.minimum(result.end, windows.end[window])
+        return result.sort()
+
+    def difference(self, other: "IntervalArray") -> "IntervalArray":
+        """
+        Removes the time covered by another array from the intervals of this
+        array, keeping the labels of this array.
+        """
+        windows, first, last = self._overlaps(other)
+        if len(windows) == 0:
+            return self.sort()
+        counts = last - first + 1
+        source = np.repeat(np.arange(len(self)), counts)
+        piece = np.arange(np.sum(counts)) - np.repeat(
+            np.cumsum(counts) - counts, counts
+        )
+        window = np.repeat(first, counts) + piece
+        result = self._take(source)
+        start = np.where(
+            piece == 0, result.start, windows.end[np.maximum(window - 1, 0)] + 1
+        )
+        end = np.where(
+            piece == np.repeat(counts - 1, counts),
+            result.end,
+            windows.start[np.minimum(window, len(windows) - 1)] - 1,
+        )
+        keep = start <= end
+        result = result._take(np.flatnonzero(keep))
+        result.start, result.end = start[keep], end[keep]
+        return result.sort()
+
+    def gaps(self) -> "IntervalArray":
+        """
+        Returns the (unlabeled) gaps between the coalesced intervals of this
+        array, spanning from the end of one interval to the start of the next
+        so that their durations are revisit times.
+        """
+        merged = self.coalesce()
+        return IntervalArray(self.epoch, merged.end[:-1], merged.start[1:])
@@ -0,0 +1,79 @@
+"""
+Streaming input and output of GeoJSON features.
+
+Features are written either as a single GeoJSON `FeatureCollection` or as
+newline-delimited GeoJSON (one `Feature` per line), one feature at a time so
+that large responses never need to be materialized as a whole.
+"""
+
+from contextlib import contextmanager
+from os import PathLike
+from typing import IO, Iterable, Iterator, Union
+
+from .geometry import Feature
+from .instrumentation import enabled, span
+
+PathOrStream = Union[str, PathLike, IO[str]]
+
+
+@contextmanager
+def _open(path_or_stream: PathOrStream, mode: str) -> Iterator[IO[str]]:
+    """
+    Opens a path (and closes it afterwards) or passes through an open stream.
+    """
+    if isinstance(path_or_stream, (str, PathLike)):
+        with open(path_or_stream, mode, encoding="utf-8") as stream:
+            yield stream
+    else:
+        yield path_or_stream
+
+
+def write_features(
+    features: Iterable[Feature],
+    path_or_stream: PathOrStream,
+    newline_delimited: bool = False,
+) -> None:
+    """
+    Writes features to a file path or text stream, one feature at a time.
+
+    Writes a GeoJSON `FeatureCollection` by default or newline-delimited
+    GeoJSON if `newline_delimited` is set.
+    """
+    with span("write_features") as current, _open(path_or_stream, "w") as stream:
+        size = 0
+        number_features = 0
+        # encoded sizes are only computed while spans are recorded
+        measure = enabled()
+
+        def write(text: str) -> None:
+            nonlocal size
+            stream.write(text)
+            if measure:
+                size += len(text.encode("utf-8"))
+
+        if newline_delimited:
+            for feature in features:
+                write(feature.model_dump_json() + "\n")
+                number_features += 1
+        else:
+            write('{"type":"FeatureCollection","features":[')
+            for feature in features:
+                write(("," if number_features > 0 else "") + "\n")
+                write(feature.model_dump_json())
+                number_features += 1
+            write("\n]}\n")
+        if measure:
+            current.set(features=number_features, bytes=size)
+
+
+def read_features(path_or_stream: PathOrStream) -> Iterator[Feature]:
+    """
+    Reads features from a newline-delimited GeoJSON file path or text stream.
+
+    Blank lines and GeoJSON text sequence record separators are ignored.
+    """
+    with _open(path_or_stream, "r") as stream:
+        for line in stream:
+            line = line.strip().lstrip("\x1e")
+            if line:
+                yield Feature.model_validate_json(line)
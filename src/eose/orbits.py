@@ -1,4 +1,5 @@
-from datetime import datetime
+import math
+from datetime import datetime, timedelta
 from enum import Enum
 from typing import List, Optional
 
@@ -6,6 +7,10 @@ from pydantic import BaseModel, Field
 from sgp4 import exporter, omm
 from sgp4.api import Satrec
 
+from .instrumentation import instrumented
+
+EARTH_ROTATION_RATE = 7.292115e-5  # rad/s
+
 
 class Propagator(str, Enum):
     """
@@ -16,6 +21,35 @@ class Propagator(str, Enum):
     J2 = "j2"
 
 
+class RepeatCycle(BaseModel):
+    """
+    Repeat ground track cycle of an orbit.
+    """
+
+    revolutions: int = Field(
+        ..., gt=0, description="Number of nodal revolutions per cycle."
+    )
+    days: int = Field(
+        ...,
+        gt=0,
+        description="Number of nodal days (Earth rotations relative to the ascending node) per cycle.",
+    )
+    duration: timedelta = Field(..., gt=0, description="Cycle duration.")
+    drift: float = Field(
+        ...,
+        ge=0,
+        description="Ground track drift per cycle (decimal degrees of longitude at the equator).",
+    )
+
+    def get_drift(self, duration: timedelta) -> float:
+        """
+        Returns the accumulated ground track drift (decimal degrees of longitude
+        at the equator) after a duration, bounding the error of repeating the
+        ground track of the first cycle.
+        """
+        return self.drift * math.ceil(duration / self.duration)
+
+
 class GeneralPerturbationsOrbitState(BaseModel):
     object_name: Optional[str] = Field(None, description="Object name.")
     object_id: Optional[str] = Field(None, description="Object identifier.")
@@ -91,13 +125,18 @@ class GeneralPerturbationsOrbitState(BaseModel):
                     (
                         ""
                         if value is None
-                        else value.isoformat() if isinstance(value, datetime) else value
+                        else (
+                            value.isoformat(timespec="microseconds")
+                            if isinstance(value, datetime)
+                            else value
+                        )
                     ),
                 )
                 for key, value in self.model_dump().items()
             ]
         )
 
+    @instrumented()
     def to_satrec(self) -> Satrec:
         """
         Converts this general perturbations orbit state to an `sgp4.api.Satrec` object.
@@ -111,3 +150,41 @@ class GeneralPerturbationsOrbitState(BaseModel):
         Converts this general perturbations orbit state to Two Line Element (TLE) list of strings.
         """
         return exporter.export_tle(self.to_satrec())
+
+    def get_repeat_cycle(
+        self,
+        max_days: int = 30,
+        tolerance: float = 0.01,
+        duration: Optional[timedelta] = None,
+    ) -> Optional[RepeatCycle]:
+        """
+        Detects the shortest repeat ground track cycle of this orbit from the
+        secular rates of the ascending node, argument of perigee and mean
+        anomaly (including J2 perturbations) of its SGP4 mean elements.
+
+        A cycle repeats if its ground track drift (decimal degrees of longitude
+        at the equator) is within `tolerance` per cycle or, if `duration` is
+        defined, accumulated over the duration. Drag (`mean_motion_dot`) is
+        not considered.
+        """
+        satrec = self.to_satrec()
+        # secular rates (radians per minute) of the SGP4 mean elements
+        nodal_rate = (satrec.mdot + satrec.argpdot) / 60
+        node_rate = satrec.nodedot / 60
+        # nodal revolutions per nodal day
+        ratio = nodal_rate / (EARTH_ROTATION_RATE - node_rate)
+        for days in range(1, max_days + 1):
+            revolutions = round(ratio * days)
+            if revolutions == 0:
+                continue
+            cycle = RepeatCycle(
+                revolutions=revolutions,
+                days=days,
+                duration=timedelta(seconds=revolutions * 2 * math.pi / nodal_rate),
+                drift=360 * abs(revolutions / ratio - days),
+            )
+            if (
+                cycle.drift if duration is None else cycle.get_drift(duration)
+            ) <= tolerance:
+                return cycle
+        return None
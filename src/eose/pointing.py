@@ -1,15 +1,61 @@
+from datetime import timedelta
+from enum import Enum
 from typing import List, Optional, Union
 
-from pydantic import Field
+from pydantic import AwareDatetime, BaseModel, Field
 
-from .utils import Quaternion, FixedOrientation
+from .targets import TargetPoint
+from .utils import Identifier, Quaternion, FixedOrientation
 from .propagation import PropagationSample, PropagationRecord, PropagationResponse
 
 
+class TrackingMode(str, Enum):
+    """
+    Enumeration of target tracking pointing modes.
+    """
+
+    # nadir-pointing body with instrument view tracking targets
+    TARGET_TRACKING = "TARGET_TRACKING"
+
+
+class TrackingWindow(BaseModel):
+    """
+    Time window in which a satellite tracks a target.
+    """
+
+    target_id: Identifier = Field(..., description="Target identifier.")
+    satellite_id: Optional[Identifier] = Field(
+        None, description="Satellite identifier (or all satellites, if not defined)."
+    )
+    start: AwareDatetime = Field(..., description="Tracking window start time.")
+    duration: timedelta = Field(..., ge=0, description="Tracking window duration.")
+    peak_slew_rate: Optional[float] = Field(
+        None,
+        ge=0,
+        description="Peak instrument view slew rate (degrees per second) to acquire and track the target.",
+    )
+    feasible: Optional[bool] = Field(
+        None,
+        description="Whether the peak slew rate is within the maximum slew rate.",
+    )
+
+
 class PointingRequest(PropagationResponse):
-    mode: Union[FixedOrientation] = Field(
+    mode: Union[FixedOrientation, TrackingMode] = Field(
         FixedOrientation.NADIR_GEOCENTRIC, description="Pointing mode."
     )
+    targets: List[TargetPoint] = Field(
+        [], description="Target points to track (for target tracking mode)."
+    )
+    windows: List[TrackingWindow] = Field(
+        [],
+        description="Target tracking windows, in order of priority (for target tracking mode).",
+    )
+    max_slew_rate: Optional[float] = Field(
+        None,
+        gt=0,
+        description="Maximum instrument view slew rate (degrees per second) for target tracking.",
+    )
 
 
 class PointingSample(PropagationSample):
@@ -21,10 +67,23 @@ class PointingSample(PropagationSample):
         [0, 0, 0, 1],
         description="Orientation of the instrument view, relative to the body-fixed frame.",
     )
+    target_id: Optional[Identifier] = Field(
+        None, description="Identifier of the tracked target (for target tracking mode)."
+    )
+    slew_angle: Optional[float] = Field(
+        None,
+        ge=0,
+        le=180,
+        description="Angle (degrees) between the instrument view and the body-fixed Z-axis (for target tracking mode).",
+    )
 
 
 class PointingRecord(PropagationRecord):
     samples: List[PointingSample] = Field([], description="List of pointing samples.")
+    windows: List[TrackingWindow] = Field(
+        [],
+        description="Tracking windows of this satellite with slew rate feasibility (for target tracking mode).",
+    )
 
 
 class PointingResponse(PointingRequest):
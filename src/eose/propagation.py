@@ -1,16 +1,101 @@
-from datetime import timedelta
-from typing import List, Union
+from datetime import datetime, timedelta, timezone
+from itertools import groupby
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple, Union
 
+import numpy as np
 from pandas import to_datetime
-from pydantic import AwareDatetime, BaseModel, Field
+from pydantic import AwareDatetime, BaseModel, Field, PrivateAttr
 from geopandas import GeoDataFrame
-from skyfield.api import load, Distance, Velocity, wgs84
-from skyfield.framelib import itrs
-from skyfield.positionlib import ICRF
+import shapely
 
 from .base import BaseRequest
+from .frames import itrs_to_geodetic, transform
 from .geometry import Point, Feature, FeatureCollection
-from .utils import Vector, CartesianReferenceFrame, Identifier
+from .instrumentation import count, instrumented
+from .io import PathOrStream, write_features
+from .utils import (
+    CachedValue,
+    CartesianReferenceFrame,
+    Identifier,
+    Vector,
+    keyed_cached_property,
+)
+
+
+def time_offsets(
+    times: Union[np.ndarray, Sequence[datetime]], start: datetime
+) -> np.ndarray:
+    """
+    Converts times (`numpy.datetime64` values, interpreted as UTC, or
+    datetimes) to integer microseconds from a start time.
+    """
+    times = np.asarray(times)
+    if times.dtype.kind == "M":
+        return (
+            (
+                times
+                - np.datetime64(
+                    start.astimezone(timezone.utc).replace(tzinfo=None), "us"
+                )
+            )
+            .astype("timedelta64[us]")
+            .astype(np.int64)
+        )
+    unit = timedelta(microseconds=1)
+    return np.array(
+        [(time - start) // unit for time in times.ravel().tolist()], dtype=np.int64
+    ).reshape(times.shape)
+
+
+@instrumented()
+def hermite_interpolate(
+    time: np.ndarray,
+    position: np.ndarray,
+    velocity: np.ndarray,
+    query: np.ndarray,
+    time_step: Optional[int] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Interpolates (N,3) positions (m) and velocities (m/s) at N sorted sample
+    times (integer microseconds) to query times (integer microseconds) by
+    cubic Hermite interpolation between the bracketing samples.
+
+    Samples are located by index arithmetic if the times are on a uniform
+    `time_step` (integer microseconds) starting at `time[0]`, otherwise by
+    binary search. Raises a `ValueError` for query times outside the samples.
+    """
+    query = np.asarray(query, dtype=np.int64)
+    if len(time) == 0 or np.any((query < time[0]) | (query > time[-1])):
+        raise ValueError("Query times must be within the sample times.")
+    count("queries", query.size)
+    if len(time) == 1:
+        return (
+            np.broadcast_to(position[0], query.shape + (3,)).copy(),
+            np.broadcast_to(velocity[0], query.shape + (3,)).copy(),
+        )
+    if time_step is None:
+        k = np.searchsorted(time, query, side="right") - 1
+    else:
+        k = (query - time[0]) // time_step
+    k = np.clip(k, 0, len(time) - 2)
+    h = ((time[k + 1] - time[k]) / 1e6)[..., np.newaxis]
+    s = ((query - time[k]) / 1e6)[..., np.newaxis] / h
+    p0, p1 = position[k], position[k + 1]
+    m0, m1 = velocity[k] * h, velocity[k + 1] * h
+    s2, s3 = s**2, s**3
+    interpolated_position = (
+        (2 * s3 - 3 * s2 + 1) * p0
+        + (s3 - 2 * s2 + s) * m0
+        + (-2 * s3 + 3 * s2) * p1
+        + (s3 - s2) * m1
+    )
+    interpolated_velocity = (
+        (6 * s2 - 6 * s) * p0
+        + (3 * s2 - 4 * s + 1) * m0
+        + (-6 * s2 + 6 * s) * p1
+        + (3 * s2 - 2 * s) * m1
+    ) / h
+    return interpolated_position, interpolated_velocity
 
 
 class PropagationRequest(BaseRequest):
@@ -43,28 +128,15 @@ class PropagationSample(BaseModel):
             properties=dict({"satellite_id": satellite_id}, **self.model_dump()),
         )
 
+    @instrumented()
     def as_geometry(self, frame: CartesianReferenceFrame) -> Point:
         """
         Convert this propagation record to a GeoJSON `Point` geometry.
         """
-        ts = load.timescale()
-        if frame == CartesianReferenceFrame.ICRF:
-            icrf_position = ICRF(
-                Distance(m=self.position).au,
-                Velocity(km_per_s=[i / 1000 for i in self.velocity]).au_per_d,
-                ts.from_datetime(self.time),
-                399,
-            )
-        elif frame == CartesianReferenceFrame.ITRS:
-            icrf_position = ICRF.from_time_and_frame_vectors(
-                ts.from_datetime(self.time),
-                itrs,
-                Distance(m=self.position),
-                Velocity(km_per_s=[i / 1000 for i in self.velocity]),
-            )
-            icrf_position.center = 399
-
-        return Point.from_skyfield(wgs84.geographic_position_of(icrf_position))
+        position, _ = transform(
+            [self.position], None, frame, CartesianReferenceFrame.ITRS, (self.time,)
+        )
+        return Point(coordinates=tuple(itrs_to_geodetic(position)[0]))
 
 
 class PropagationRecord(BaseModel):
@@ -73,29 +145,158 @@ class PropagationRecord(BaseModel):
         [], description="List of propagation samples."
     )
 
+    _state_arrays_cache: CachedValue = PrivateAttr(default_factory=CachedValue)
+
+    @classmethod
+    def iter_from_features(
+        cls, features: Iterable[Feature]
+    ) -> Iterator["PropagationRecord"]:
+        """
+        Incrementally creates propagation records from an iterable of propagation
+        sample GeoJSON `Feature` objects (see `PropagationResponse.iter_features`).
+
+        Consecutive features with the same `satellite_id` are grouped into one record.
+        """
+        for satellite_id, group in groupby(
+            features, key=lambda feature: feature.properties.get("satellite_id")
+        ):
+            yield cls(
+                satellite_id=satellite_id,
+                samples=[
+                    {
+                        key: value
+                        for key, value in feature.properties.items()
+                        if key != "satellite_id"
+                    }
+                    for feature in group
+                ],
+            )
+
+    @keyed_cached_property(
+        lambda record: tuple(
+            (sample.time, *sample.position, *sample.velocity)
+            for sample in record.samples
+        )
+    )
+    def state_arrays(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, Optional[int]]:
+        """
+        Returns arrays of sample times (integer microseconds from the first
+        sample), (N,3) positions and velocities and the uniform time step
+        (integer microseconds, if any) of this record (built on first use and
+        rebuilt if samples change).
+        """
+        if not self.samples:
+            return np.empty(0, dtype=np.int64), np.empty((0, 3)), np.empty((0, 3)), None
+        time = time_offsets(
+            [sample.time for sample in self.samples], self.samples[0].time
+        )
+        steps = np.unique(np.diff(time))
+        return (
+            time,
+            np.array([sample.position for sample in self.samples], dtype=float),
+            np.array([sample.velocity for sample in self.samples], dtype=float),
+            int(steps[0]) if len(steps) == 1 and steps[0] > 0 else None,
+        )
+
+    def at(
+        self, times: Union[np.ndarray, Sequence[datetime]]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the positions (m) and velocities (m/s) of this record (in its
+        frame) at times within the samples (`numpy.datetime64` values,
+        interpreted as UTC, or datetimes) by cubic Hermite interpolation.
+        """
+        if not self.samples:
+            raise ValueError("Propagation record has no samples.")
+        time, position, velocity, time_step = self.state_arrays
+        return hermite_interpolate(
+            time,
+            position,
+            velocity,
+            time_offsets(times, self.samples[0].time),
+            time_step,
+        )
+
+    @instrumented()
+    def as_geodetic(self, frame: CartesianReferenceFrame) -> np.ndarray:
+        """
+        Converts the positions of this propagation record (defined in a frame) to
+        an (N,3) array of geodetic longitude, latitude and altitude.
+
+        Frame rotations are cached by time grid and shared across records.
+        """
+        if not self.samples:
+            return np.empty((0, 3))
+        count("samples", len(self.samples))
+        position, _ = transform(
+            [sample.position for sample in self.samples],
+            None,
+            frame,
+            CartesianReferenceFrame.ITRS,
+            tuple(sample.time for sample in self.samples),
+        )
+        return itrs_to_geodetic(position)
+
 
 class PropagationResponse(PropagationRequest):
     satellite_records: List[PropagationRecord] = Field(
         [], description="Propagation results"
     )
 
+    def iter_features(self) -> Iterator[Feature]:
+        """
+        Iterates over this propagation response as GeoJSON `Feature` objects (one per sample).
+        """
+        for record in self.satellite_records:
+            for sample, coordinates in zip(
+                record.samples, record.as_geodetic(self.frame)
+            ):
+                yield Feature(
+                    type="Feature",
+                    geometry=Point(type="Point", coordinates=tuple(coordinates)),
+                    properties=dict(
+                        {"satellite_id": record.satellite_id}, **sample.model_dump()
+                    ),
+                )
+
     def as_features(self) -> FeatureCollection:
         """
         Converts this propagation response to a GeoJSON `FeatureCollection`.
         """
         return FeatureCollection(
-            type="FeatureCollection",
-            features=[
-                sample.as_feature(record.satellite_id, self.frame)
-                for record in self.satellite_records
-                for sample in record.samples
-            ],
+            type="FeatureCollection", features=list(self.iter_features())
         )
 
+    def write_features(
+        self, path_or_stream: PathOrStream, newline_delimited: bool = False
+    ) -> None:
+        """
+        Writes this response as GeoJSON (or newline-delimited GeoJSON) features
+        to a file path or text stream without building a `FeatureCollection`.
+        """
+        write_features(self.iter_features(), path_or_stream, newline_delimited)
+
+    @instrumented()
     def as_dataframe(self) -> GeoDataFrame:
         """
         Converts this propagation response to a `geopandas.GeoDataFrame`.
         """
-        gdf = GeoDataFrame.from_features(self.as_features())
-        gdf["time"] = to_datetime(gdf["time"])  # helper for type coersion
-        return gdf
+        samples = [
+            (record.satellite_id, sample)
+            for record in self.satellite_records
+            for sample in record.samples
+        ]
+        count("samples", len(samples))
+        coordinates = np.concatenate(
+            [np.empty((0, 3))]
+            + [record.as_geodetic(self.frame) for record in self.satellite_records]
+        )
+        return GeoDataFrame(
+            {
+                "satellite_id": [satellite_id for satellite_id, _ in samples],
+                "time": to_datetime([sample.time for _, sample in samples], utc=True),
+                "position": [sample.position for _, sample in samples],
+                "velocity": [sample.velocity for _, sample in samples],
+            },
+            geometry=shapely.points(coordinates),
+        )
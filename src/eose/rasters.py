@@ -0,0 +1,306 @@
+"""
+Raster-shaped coverage outputs aligned to a `UniformAngularGrid`.
+
+Coverage metrics are stored as 2D arrays indexed by the grid row (latitude
+index j, South-to-North) and column (longitude index i, West-to-East) so that
+the cell of target `id` is `divmod(id, floor(360/delta_longitude))`. Times are
+stored as seconds (with NaN for undefined values) relative to the analysis
+start, following the CF conventions when saved as netCDF.
+"""
+
+import math
+from datetime import datetime, timedelta
+from os import PathLike, fspath
+from typing import Iterator, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .coverage import CoverageRecord, CoverageResponse
+from .grids import UniformAngularGrid
+from .intervals import merge_runs
+from .utils import Identifier
+
+METRICS = ["access_count", "mean_revisit", "max_gap", "first_access"]
+
+
+def get_grid_shape(grid: UniformAngularGrid) -> Tuple[int, int]:
+    """
+    Returns the (rows, columns) shape of the global lattice of a grid.
+    """
+    return (
+        math.floor(180 / grid.delta_latitude),
+        math.floor(360 / grid.delta_longitude),
+    )
+
+
+class CoverageRaster:
+    """
+    Coverage metrics of grid targets stored as 2D arrays.
+
+    Arrays hold the number of (merged) accesses, the mean revisit (s), the
+    maximum gap between accesses (s) and the first access time (s after
+    start) of each grid cell; `mask` flags cells with a target.
+    """
+
+    def __init__(
+        self,
+        grid: UniformAngularGrid,
+        start: datetime,
+        access_count: Optional[np.ndarray] = None,
+        mean_revisit: Optional[np.ndarray] = None,
+        max_gap: Optional[np.ndarray] = None,
+        first_access: Optional[np.ndarray] = None,
+        mask: Optional[np.ndarray] = None,
+    ):
+        shape = get_grid_shape(grid)
+        self.grid = grid
+        self.start = start
+        self.access_count = (
+            np.zeros(shape, dtype=np.int64) if access_count is None else access_count
+        )
+        self.mean_revisit = (
+            np.full(shape, np.nan) if mean_revisit is None else mean_revisit
+        )
+        self.max_gap = np.full(shape, np.nan) if max_gap is None else max_gap
+        self.first_access = (
+            np.full(shape, np.nan) if first_access is None else first_access
+        )
+        self.mask = np.zeros(shape, dtype=bool) if mask is None else mask
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        """
+        Returns the (rows, columns) shape of the metric arrays.
+        """
+        return self.mask.shape
+
+    @property
+    def longitudes(self) -> np.ndarray:
+        """
+        Returns the longitude (decimal degrees) of each column.
+        """
+        return -180 + (np.arange(self.shape[1]) + 0.5) * self.grid.delta_longitude
+
+    @property
+    def latitudes(self) -> np.ndarray:
+        """
+        Returns the latitude (decimal degrees) of each row.
+        """
+        return -90 + (np.arange(self.shape[0]) + 0.5) * self.grid.delta_latitude
+
+    def index(self, target_id: Identifier) -> Tuple[int, int]:
+        """
+        Returns the (row, column) index of a grid target.
+        """
+        return divmod(int(target_id), self.shape[1])
+
+    def set_intervals(
+        self, target_id: Identifier, starts: np.ndarray, ends: np.ndarray
+    ) -> None:
+        """
+        Sets the metrics of a grid target from the start and end times (s
+        after start) of its accesses.
+
+        Overlapping accesses (e.g., from different satellites) are merged
+        before computing gaps (elapsed time since the prior access).
+        """
+        self.set_target_intervals(
+            [target_id],
+            np.zeros(len(starts), dtype=np.int64),
+            np.round(np.asarray(starts, dtype=float) * 1e6).astype(np.int64),
+            np.round(np.asarray(ends, dtype=float) * 1e6).astype(np.int64),
+        )
+
+    def set_target_intervals(
+        self,
+        target_ids: Sequence[Identifier],
+        index: np.ndarray,
+        starts: np.ndarray,
+        ends: np.ndarray,
+    ) -> None:
+        """
+        Sets the metrics of grid targets from the target index (in
+        `target_ids`) and start and end times (integer microseconds after
+        start) of their accesses.
+
+        Overlapping accesses (e.g., from different satellites) of a target are
+        merged before computing gaps (elapsed time since the prior access).
+        Previous metrics of the targets are replaced.
+        """
+        cells = np.array(
+            [self.index(target_id) for target_id in target_ids], dtype=np.int64
+        ).reshape(-1, 2)
+        rows, columns = cells[:, 0], cells[:, 1]
+        number_targets = len(target_ids)
+        self.mask[rows, columns] = True
+        # clear previous metrics of targets without (revisited) accesses
+        self.mean_revisit[rows, columns] = np.nan
+        self.max_gap[rows, columns] = np.nan
+        self.first_access[rows, columns] = np.nan
+        index = np.asarray(index, dtype=np.int64)
+        order, runs = merge_runs(starts, ends, index)
+        index = index[order]
+        starts = np.asarray(starts, dtype=np.int64)[order]
+        ends = np.asarray(ends, dtype=np.int64)[order]
+        self.access_count[rows, columns] = np.bincount(
+            index[runs], minlength=number_targets
+        )
+        if len(runs) == 0:
+            return
+        index, starts, ends = (
+            index[runs],
+            starts[runs],
+            np.maximum.reduceat(ends, runs),
+        )
+        first = np.r_[True, index[1:] != index[:-1]]
+        self.first_access[rows[index[first]], columns[index[first]]] = (
+            starts[first] / 1e6
+        )
+        revisited = ~first
+        gaps = (starts[1:] - ends[:-1])[revisited[1:]] / 1e6
+        gap_index = index[revisited]
+        gap_count = np.bincount(gap_index, minlength=number_targets)
+        max_gap = np.full(number_targets, -np.inf)
+        np.maximum.at(max_gap, gap_index, gaps)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean_gap = (
+                np.bincount(gap_index, weights=gaps, minlength=number_targets)
+                / gap_count
+            )
+        selected = gap_count > 0
+        self.mean_revisit[rows[selected], columns[selected]] = mean_gap[selected]
+        self.max_gap[rows[selected], columns[selected]] = max_gap[selected]
+
+    @classmethod
+    def from_response(
+        cls, response: CoverageResponse, grid: UniformAngularGrid
+    ) -> "CoverageRaster":
+        """
+        Creates a coverage raster from the records of a coverage response for
+        targets generated by a grid.
+        """
+        raster = cls(grid, response.start)
+        unit = timedelta(microseconds=1)
+        samples = [
+            (m, sample)
+            for m, record in enumerate(response.target_records)
+            for sample in record.samples
+        ]
+        starts = np.array(
+            [(sample.start - response.start) // unit for _, sample in samples],
+            dtype=np.int64,
+        )
+        raster.set_target_intervals(
+            [record.target_id for record in response.target_records],
+            np.array([m for m, _ in samples], dtype=np.int64),
+            starts,
+            starts
+            + np.array(
+                [sample.duration // unit for _, sample in samples], dtype=np.int64
+            ),
+        )
+        return raster
+
+    def get_record(self, target_id: Identifier) -> CoverageRecord:
+        """
+        Derives the (summary) coverage record of a grid target.
+
+        Derived records do not include coverage samples.
+        """
+        j, i = self.index(target_id)
+        if not self.mask[j, i]:
+            raise KeyError(f"No target {target_id} in raster.")
+        return CoverageRecord(
+            target_id=target_id,
+            mean_revisit=(
+                None
+                if np.isnan(self.mean_revisit[j, i])
+                else timedelta(seconds=float(self.mean_revisit[j, i]))
+            ),
+            number_samples=int(self.access_count[j, i]),
+        )
+
+    def iter_records(self) -> Iterator[CoverageRecord]:
+        """
+        Iterates over the derived coverage records of all grid targets.
+        """
+        for j, i in zip(*np.nonzero(self.mask)):
+            yield self.get_record(int(i + j * self.shape[1]))
+
+    def save(self, path: Union[str, PathLike]) -> None:
+        """
+        Saves this raster to a NumPy `.npz` file or (with the optional
+        `netCDF4` package) a netCDF `.nc` file, based on the file suffix.
+        """
+        if fspath(path).endswith(".nc"):
+            self._save_netcdf(path)
+            return
+        with open(path, "wb") as file:
+            np.savez_compressed(
+                file,
+                grid=np.array(self.grid.model_dump_json()),
+                start=np.array(self.start.isoformat()),
+                mask=self.mask,
+                **{name: getattr(self, name) for name in METRICS},
+            )
+
+    @classmethod
+    def load(cls, path: Union[str, PathLike]) -> "CoverageRaster":
+        """
+        Loads a raster from a NumPy `.npz` file or a netCDF `.nc` file.
+        """
+        if fspath(path).endswith(".nc"):
+            return cls._load_netcdf(path)
+        with np.load(path) as data:
+            return cls(
+                UniformAngularGrid.model_validate_json(str(data["grid"])),
+                datetime.fromisoformat(str(data["start"])),
+                mask=data["mask"],
+                **{name: data[name] for name in METRICS},
+            )
+
+    def _save_netcdf(self, path: Union[str, PathLike]) -> None:
+        try:
+            from netCDF4 import Dataset
+        except ImportError as error:
+            raise ImportError("Saving netCDF files requires netCDF4.") from error
+        units = f"seconds since {self.start.isoformat()}"
+        with Dataset(path, "w") as dataset:
+            dataset.Conventions = "CF-1.8"
+            dataset.grid = self.grid.model_dump_json()
+            dataset.createDimension("latitude", self.shape[0])
+            dataset.createDimension("longitude", self.shape[1])
+            for name, values in [
+                ("latitude", self.latitudes),
+                ("longitude", self.longitudes),
+            ]:
+                variable = dataset.createVariable(name, "f8", (name,))
+                variable.units = f"degrees_{'north' if name == 'latitude' else 'east'}"
+                variable[:] = values
+            dimensions = ("latitude", "longitude")
+            variable = dataset.createVariable("mask", "i1", dimensions)
+            variable[:] = self.mask.astype(np.int8)
+            variable = dataset.createVariable("access_count", "i8", dimensions)
+            variable[:] = self.access_count
+            for name in ["mean_revisit", "max_gap", "first_access"]:
+                variable = dataset.createVariable(
+                    name, "f8", dimensions, fill_value=np.nan
+                )
+                variable.units = units if name == "first_access" else "seconds"
+                variable[:] = getattr(self, name)
+
+    @classmethod
+    def _load_netcdf(cls, path: Union[str, PathLike]) -> "CoverageRaster":
+        try:
+            from netCDF4 import Dataset
+        except ImportError as error:
+            raise ImportError("Loading netCDF files requires netCDF4.") from error
+        with Dataset(path, "r") as dataset:
+            dataset.set_auto_mask(False)
+            units = dataset["first_access"].units
+            return cls(
+                UniformAngularGrid.model_validate_json(dataset.grid),
+                datetime.fromisoformat(units[len("seconds since ") :]),
+                mask=dataset["mask"][:].astype(bool),
+                **{name: dataset[name][:] for name in METRICS},
+            )
@@ -0,0 +1,338 @@
+"""
+Coverage of target regions by adaptive quadtree refinement.
+
+Each region is covered by coarse latitude-longitude cells which are
+recursively divided into quadrants only where the access of their samples
+(four corners and the center) differs, i.e., where some samples are accessed
+and others are not (or, optionally, where mean revisits differ by more than
+a relative tolerance). Samples are shared between neighboring cells on a lattice of the
+finest level, so fully covered (or uncovered) interiors are evaluated at a
+coarse resolution while swath edges are resolved at the finest resolution.
+Coverage statistics are weighted by the area of each leaf cell within the
+region.
+"""
+
+import math
+from datetime import timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from pydantic import BaseModel, Field
+from shapely.geometry import box, shape
+from shapely.prepared import prep
+
+from .access import AccessRequest
+from .analysis import (
+    _harmonic_mean,
+    access_intervals,
+    get_time_grid,
+    merge_intervals,
+    propagate_states,
+)
+from .geometry import BoundingBox, Feature, FeatureCollection, Polygon
+from .grids import cell_area
+from .instrumentation import count, instrumented
+from .targets import TargetPoint, TargetRegion
+from .utils import CartesianReferenceFrame, Identifier
+
+Cell = Tuple[int, int, int]  # lattice column, row and size
+
+
+class RegionCell(BaseModel):
+    """
+    Leaf cell of the adaptive refinement of a target region.
+    """
+
+    bounds: BoundingBox = Field(
+        ...,
+        description="Cell bounds (minimum longitude, latitude, maximum longitude, latitude).",
+    )
+    level: int = Field(..., ge=0, description="Refinement level (0 is coarsest).")
+    area: float = Field(
+        ..., ge=0, description="Area (square meters) of the cell within the region."
+    )
+    coverage_fraction: float = Field(
+        ..., ge=0, le=1, description="Fraction of cell samples accessed at least once."
+    )
+    harmonic_mean_revisit: Optional[timedelta] = Field(
+        None,
+        ge=0,
+        description="Harmonic mean of the mean revisit times of cell samples.",
+    )
+
+    def as_feature(self) -> Feature:
+        """
+        Convert this region cell to a GeoJSON `Feature`.
+        """
+        min_lon, min_lat, max_lon, max_lat = self.bounds
+        return Feature(
+            type="Feature",
+            geometry=Polygon(
+                type="Polygon",
+                coordinates=[
+                    [
+                        (min_lon, min_lat),
+                        (max_lon, min_lat),
+                        (max_lon, max_lat),
+                        (min_lon, max_lat),
+                        (min_lon, min_lat),
+                    ]
+                ],
+            ),
+            properties={
+                "level": self.level,
+                "area": self.area,
+                "coverage_fraction": self.coverage_fraction,
+                "harmonic_mean_revisit": (
+                    None
+                    if self.harmonic_mean_revisit is None
+                    else self.harmonic_mean_revisit.total_seconds()
+                ),
+            },
+        )
+
+
+class RegionCoverageRecord(BaseModel):
+    """
+    Area-weighted coverage statistics of a target region.
+    """
+
+    target_id: Identifier = Field(..., description="Target identifier.")
+    area: float = Field(0, ge=0, description="Area (square meters) of the region.")
+    coverage_fraction: float = Field(
+        0, ge=0, le=1, description="Fraction of the region area accessed at least once."
+    )
+    harmonic_mean_revisit: Optional[timedelta] = Field(
+        None, ge=0, description="Area-weighted harmonic mean revisit time."
+    )
+    number_evaluations: int = Field(
+        0, ge=0, description="Number of sample points evaluated."
+    )
+    cells: List[RegionCell] = Field([], description="Leaf cells of the refinement.")
+
+    def as_features(self) -> FeatureCollection:
+        """
+        Converts the leaf cells of this record to a GeoJSON `FeatureCollection`.
+        """
+        return FeatureCollection(
+            type="FeatureCollection",
+            features=[cell.as_feature() for cell in self.cells],
+        )
+
+
+def _corners(cell: Cell) -> List[Tuple[int, int]]:
+    i, j, size = cell
+    return [
+        (i, j),
+        (i + size, j),
+        (i, j + size),
+        (i + size, j + size),
+        (i + size // 2, j + size // 2),
+    ]
+
+
+@instrumented()
+def evaluate_points(
+    request: AccessRequest,
+    positions: np.ndarray,
+    states: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Computes the number of merged accesses and the mean revisit (s, `NaN`
+    without revisits) of (K,2) or (K,3) target positions, optionally from
+    precomputed satellite `states` (see `analysis.access_intervals`).
+    """
+    targets = [
+        TargetPoint(id=k, position=position)
+        for k, position in enumerate(positions.tolist())
+    ]
+    _, _, index, first, last = access_intervals(
+        request.model_copy(update=dict(targets=targets)), states
+    )
+    count("evaluations", len(targets))
+    time_step = request.time_step // timedelta(microseconds=1)
+    index, start, end, *_ = merge_intervals(index, first * time_step, last * time_step)
+    same = index[1:] == index[:-1]
+    gaps = np.bincount(
+        index[1:][same], weights=(start[1:] - end[:-1])[same], minlength=len(targets)
+    )
+    number_accesses = np.bincount(index, minlength=len(targets))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean_revisit = np.where(
+            number_accesses > 1, gaps / 1e6 / (number_accesses - 1), np.nan
+        )
+    return number_accesses, mean_revisit
+
+
+@instrumented()
+def region_coverage(
+    request: AccessRequest,
+    regions: Sequence[TargetRegion],
+    delta_longitude: float = 5,
+    delta_latitude: float = 5,
+    max_depth: int = 3,
+    revisit_tolerance: Optional[float] = None,
+) -> List[RegionCoverageRecord]:
+    """
+    Computes the coverage of target regions by adaptive quadtree refinement.
+
+    The satellites, payloads and times of the request are evaluated (its
+    targets are ignored) starting from `delta_longitude` by `delta_latitude`
+    cells, refined at most `max_depth` times. A cell is refined unless its
+    samples are all accessed or all not accessed (and, if `revisit_tolerance` is
+    defined, mean revisits within that relative tolerance), so the initial
+    cells should be smaller than the swath width. Cell revisits are the
+    harmonic mean of sample revisits, consistent with the area-weighted
+    harmonic mean revisit of the region. Satellites are propagated once and
+    their states reused at every refinement level.
+    """
+    states = (
+        propagate_states(
+            request.satellites, get_time_grid(request), CartesianReferenceFrame.ITRS
+        )
+        if request.satellites
+        else None
+    )
+    records = []
+    for target in regions:
+        geometry = shape(target.region)
+        region = prep(geometry)
+        min_lon, min_lat, max_lon, max_lat = geometry.bounds
+        scale = 2 ** (max_depth + 1)
+        step_lon, step_lat = delta_longitude / scale, delta_latitude / scale
+
+        def bounds(cell: Cell) -> Tuple[float, float, float, float]:
+            i, j, size = cell
+            return (
+                max(-180, min_lon + i * step_lon),
+                max(-90, min_lat + j * step_lat),
+                min(180, min_lon + (i + size) * step_lon),
+                min(90, min_lat + (j + size) * step_lat),
+            )
+
+        cells = [
+            (i * scale, j * scale, scale)
+            for j in range(max(1, math.ceil((max_lat - min_lat) / delta_latitude)))
+            for i in range(max(1, math.ceil((max_lon - min_lon) / delta_longitude)))
+        ]
+        samples: Dict[Tuple[int, int], int] = {}
+        number_accesses = np.empty(0, dtype=np.int64)
+        mean_revisit = np.empty(0)
+        leaves = []
+        for level in range(max_depth + 1):
+            cells = [cell for cell in cells if region.intersects(box(*bounds(cell)))]
+            new = [
+                key
+                for key in dict.fromkeys(k for cell in cells for k in _corners(cell))
+                if key not in samples
+            ]
+            if new:
+                keys = np.array(new)
+                positions = np.column_stack(
+                    (
+                        np.clip(min_lon + keys[:, 0] * step_lon, -180, 180),
+                        np.clip(min_lat + keys[:, 1] * step_lat, -90, 90),
+                    )
+                    + (
+                        ()
+                        if target.altitude is None
+                        else (np.full(len(keys), target.altitude),)
+                    )
+                )
+                counts, revisits = evaluate_points(request, positions, states)
+                samples.update({key: len(samples) + k for k, key in enumerate(new)})
+                number_accesses = np.concatenate((number_accesses, counts))
+                mean_revisit = np.concatenate((mean_revisit, revisits))
+            refined = []
+            for cell in cells:
+                k = [samples[key] for key in _corners(cell)]
+                counts, revisits = number_accesses[k], mean_revisit[k]
+                accessed = counts > 0
+                homogeneous = np.all(accessed == accessed[0]) and (
+                    revisit_tolerance is None
+                    or np.all(np.isnan(revisits))
+                    or (
+                        not np.any(np.isnan(revisits))
+                        and np.ptp(revisits) <= revisit_tolerance * np.min(revisits)
+                    )
+                )
+                if homogeneous or level == max_depth:
+                    leaves.append((cell, level, k))
+                else:
+                    i, j, size = cell
+                    half = size // 2
+                    refined.extend(
+                        [
+                            (i, j, half),
+                            (i + half, j, half),
+                            (i, j + half, half),
+                            (i + half, j + half, half),
+                        ]
+                    )
+            cells = refined
+
+        region_cells = []
+        for cell, level, k in leaves:
+            cell_bounds = bounds(cell)
+            cell_box = box(*cell_bounds)
+            fraction = (
+                1
+                if region.contains(cell_box)
+                else cell_box.intersection(geometry).area / cell_box.area
+            )
+            revisits = mean_revisit[k][~np.isnan(mean_revisit[k])]
+            region_cells.append(
+                RegionCell(
+                    bounds=cell_bounds,
+                    level=level,
+                    area=fraction
+                    * cell_area(
+                        cell_bounds[1], cell_bounds[3], cell_bounds[2] - cell_bounds[0]
+                    ),
+                    coverage_fraction=np.mean(number_accesses[k] > 0),
+                    harmonic_mean_revisit=_harmonic_mean(
+                        [timedelta(seconds=revisit) for revisit in revisits.tolist()]
+                    ),
+                )
+            )
+        area = np.array([cell.area for cell in region_cells])
+        accessed = np.array([cell.coverage_fraction for cell in region_cells])
+        revisited = np.array(
+            [np.mean(~np.isnan(mean_revisit[k])) for _, _, k in leaves]
+        )
+        revisit = np.array(
+            [
+                (
+                    np.nan
+                    if cell.harmonic_mean_revisit is None
+                    else cell.harmonic_mean_revisit.total_seconds()
+                )
+                for cell in region_cells
+            ]
+        )
+        weights = area * revisited
+        has_revisit = weights > 0
+        records.append(
+            RegionCoverageRecord(
+                target_id=target.id,
+                area=np.sum(area),
+                coverage_fraction=(
+                    np.sum(area * accessed) / np.sum(area) if np.sum(area) > 0 else 0
+                ),
+                harmonic_mean_revisit=(
+                    None
+                    if not np.any(has_revisit)
+                    else timedelta(
+                        seconds=(
+                            0
+                            if np.any(revisit[has_revisit] == 0)
+                            else np.sum(weights[has_revisit])
+                            / np.sum(weights[has_revisit] / revisit[has_revisit])
+                        )
+                    )
+                ),
+                number_evaluations=len(samples),
+                cells=region_cells,
+            )
+        )
+    return records
@@ -0,0 +1,369 @@
+"""
+Scatter/gather execution of coverage analyses via file-based work manifests.
+
+An access or coverage request is split into self-contained work units (a
+contiguous range of targets, e.g. target-id ranges of a
+`UniformAngularGrid`, over one time window), each written as a JSON manifest
+in a shared directory. Any node with access to the directory can execute
+units (e.g., `python -m eose.scatter run DIRECTORY --worker 0 --workers 4`);
+results are written atomically and completed units are skipped, so runs can
+be restarted. The reducer merges the partial access results and computes one
+`CoverageResponse`.
+
+Adjacent time windows share their boundary time step, so an access spanning
+a boundary appears in both windows and the partial intervals are stitched
+(merged per satellite and payload) before computing revisits.
+
+A study directory contains `manifest.json` (a `WorkManifest`), one
+`units/<id>.json` per `WorkUnit` and one `results/<id>.json` per completed
+unit. A result is the compact encoding of the access response of its unit
+(`AccessResponse.to_compact`): the response fields with all samples
+dictionary-encoded as a `SampleTable` under `"samples"` (target indices are
+relative to the unit targets and sample times to the unit start). Results
+are written with `write_result` and read with `read_result`.
+"""
+
+import argparse
+import json
+import os
+import sys
+from datetime import timedelta
+from os import PathLike
+from typing import Dict, Iterator, List, Optional, Union
+
+import numpy as np
+from pydantic import BaseModel, Field
+
+from .access import AccessRequest, AccessResponse, RepeatTilingRecord, SampleTable
+from .analysis import assemble_access, coverage, merge_intervals
+from .backends import DEFAULT_BACKEND, get_backend
+from .coverage import CoverageRequest, CoverageResponse
+from .instrumentation import count, instrumented
+from .utils import Identifier
+
+Path = Union[str, PathLike]
+
+MANIFEST = "manifest.json"
+
+
+class WorkUnit(BaseModel):
+    """
+    Self-contained access computation over a range of targets and a time window.
+    """
+
+    id: str = Field(..., description="Work unit identifier.")
+    target_offset: int = Field(
+        ..., ge=0, description="Index of the first target of this unit in the study."
+    )
+    request: AccessRequest = Field(..., description="Access request of this unit.")
+
+
+class WorkManifest(BaseModel):
+    """
+    Study of work units whose partial results are merged into one coverage response.
+    """
+
+    request: AccessRequest = Field(..., description="Access request of the study.")
+    omit_payload_ids: List[Identifier] = Field(
+        [], description="List of payload identifiers to omit from coverage analysis."
+    )
+    omit_satellite_ids: List[Identifier] = Field(
+        [], description="List of satellite identifiers to omit from coverage analysis."
+    )
+    unit_ids: List[str] = Field([], description="Identifiers of the work units.")
+
+
+def _unit_path(directory: Path, unit_id: str) -> str:
+    return os.path.join(directory, "units", f"{unit_id}.json")
+
+
+def _result_path(directory: Path, unit_id: str) -> str:
+    return os.path.join(directory, "results", f"{unit_id}.json")
+
+
+def _write(path: str, text: str) -> None:
+    """
+    Writes a text file atomically (via a temporary file in the same directory).
+    """
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, "w", encoding="utf-8") as file:
+        file.write(text)
+    os.replace(temporary, path)
+
+
+def write_result(directory: Path, unit_id: str, response: AccessResponse) -> None:
+    """
+    Writes the result of a work unit: the compact encoding of its access
+    response (see `AccessResponse.to_compact`).
+    """
+    _write(_result_path(directory, unit_id), json.dumps(response.to_compact()))
+
+
+def read_result(directory: Path, unit_id: str) -> dict:
+    """
+    Reads the result of a work unit as the compact encoding of its access
+    response (restored with `AccessResponse.from_compact`).
+    """
+    with open(_result_path(directory, unit_id), "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+def split_request(
+    request: AccessRequest,
+    targets_per_unit: Optional[int] = None,
+    window: Optional[timedelta] = None,
+) -> Iterator[WorkUnit]:
+    """
+    Splits an access request into work units of at most `targets_per_unit`
+    (contiguous) targets over time windows of `window` duration (rounded
+    down to a multiple of the time step). Adjacent windows share their
+    boundary time step.
+    """
+    number_targets = len(request.targets)
+    size = targets_per_unit or max(number_targets, 1)
+    number_steps = request.duration // request.time_step
+    steps = (
+        number_steps if window is None else max(window // request.time_step, 1)
+    ) or 1
+    fields = request.model_dump(
+        include=set(AccessRequest.model_fields), exclude={"propagation_records"}
+    )
+    for first_step in range(0, max(number_steps, 1), steps):
+        last_step = min(first_step + steps, number_steps)
+        for offset in range(0, number_targets, size):
+            yield WorkUnit(
+                id=(
+                    f"t{offset:08d}-{min(offset + size, number_targets):08d}"
+                    f"-w{first_step:08d}-{last_step:08d}"
+                ),
+                target_offset=offset,
+                request=AccessRequest(
+                    **dict(
+                        fields,
+                        start=request.start + first_step * request.time_step,
+                        duration=(last_step - first_step) * request.time_step,
+                        targets=fields["targets"][offset : offset + size],
+                    )
+                ),
+            )
+
+
+def scatter(
+    request: Union[AccessRequest, CoverageRequest],
+    directory: Path,
+    targets_per_unit: Optional[int] = None,
+    window: Optional[timedelta] = None,
+) -> WorkManifest:
+    """
+    Writes the work unit manifests of a request to a (shared) directory.
+
+    Existing unit manifests and results are kept so that a study can be
+    re-scattered and resumed (use a new directory if the request changes).
+    """
+    os.makedirs(os.path.join(directory, "units"), exist_ok=True)
+    os.makedirs(os.path.join(directory, "results"), exist_ok=True)
+    manifest = WorkManifest(
+        request=request.model_dump(include=set(AccessRequest.model_fields)),
+        omit_payload_ids=getattr(request, "omit_payload_ids", []),
+        omit_satellite_ids=getattr(request, "omit_satellite_ids", []),
+    )
+    for unit in split_request(manifest.request, targets_per_unit, window):
+        if not os.path.exists(_unit_path(directory, unit.id)):
+            _write(_unit_path(directory, unit.id), unit.model_dump_json())
+        manifest.unit_ids.append(unit.id)
+    _write(os.path.join(directory, MANIFEST), manifest.model_dump_json())
+    return manifest
+
+
+def load_manifest(directory: Path) -> WorkManifest:
+    """
+    Loads the manifest of a study directory.
+    """
+    with open(os.path.join(directory, MANIFEST), "r", encoding="utf-8") as file:
+        return WorkManifest.model_validate_json(file.read())
+
+
+def get_pending(directory: Path) -> List[str]:
+    """
+    Returns the identifiers of work units without results.
+    """
+    return [
+        unit_id
+        for unit_id in load_manifest(directory).unit_ids
+        if not os.path.exists(_result_path(directory, unit_id))
+    ]
+
+
+@instrumented()
+def run_unit(directory: Path, unit_id: str, backend: str = DEFAULT_BACKEND) -> bool:
+    """
+    Executes a work unit unless completed; returns whether it was executed.
+    """
+    if os.path.exists(_result_path(directory, unit_id)):
+        count("skipped")
+        return False
+    with open(_unit_path(directory, unit_id), "r", encoding="utf-8") as file:
+        unit = WorkUnit.model_validate_json(file.read())
+    write_result(directory, unit_id, get_backend(backend).access(unit.request))
+    count("executed")
+    return True
+
+
+def run(
+    directory: Path, worker: int = 0, workers: int = 1, backend: str = DEFAULT_BACKEND
+) -> int:
+    """
+    Executes the pending work units assigned to a worker (every `workers`-th
+    unit starting at index `worker`); returns the number executed.
+    """
+    unit_ids = load_manifest(directory).unit_ids
+    return sum(
+        run_unit(directory, unit_id, backend) for unit_id in unit_ids[worker::workers]
+    )
+
+
+@instrumented()
+def gather(directory: Path) -> CoverageResponse:
+    """
+    Merges the partial results of all work units into one coverage response.
+
+    Satellites tiled from a repeat ground track cycle in any unit are
+    reported with the largest drift bound of their units.
+    """
+    manifest = load_manifest(directory)
+    pending = get_pending(directory)
+    if pending:
+        raise RuntimeError(f"{len(pending)} work units are not complete.")
+    request = manifest.request
+    unit = timedelta(microseconds=1)
+    omit_satellite_ids = {str(value) for value in manifest.omit_satellite_ids}
+    omit_payload_ids = {str(value) for value in manifest.omit_payload_ids}
+    pairs = {}
+    columns = []
+    tiling_records: Dict[str, RepeatTilingRecord] = {}
+    for unit_id in manifest.unit_ids:
+        with open(_unit_path(directory, unit_id), "r", encoding="utf-8") as file:
+            offset = WorkUnit.model_validate_json(file.read()).target_offset
+        result = read_result(directory, unit_id)
+        table = SampleTable.from_dict(result["samples"])
+        for record in result.get("tiling_records", []):
+            record = RepeatTilingRecord.model_validate(record)
+            previous = tiling_records.get(str(record.satellite_id))
+            if previous is None or record.drift > previous.drift:
+                tiling_records[str(record.satellite_id)] = record
+        # map the (satellite, instrument) codes present in this unit to study pairs
+        present, inverse = np.unique(
+            table.satellite.astype(np.int64) * len(table.instrument_ids)
+            + table.instrument,
+            return_inverse=True,
+        )
+        codes = np.array(
+            [
+                (
+                    -1
+                    if str(satellite_id) in omit_satellite_ids
+                    or str(instrument_id) in omit_payload_ids
+                    else pairs.setdefault((satellite_id, instrument_id), len(pairs))
+                )
+                for satellite, instrument in zip(
+                    *np.divmod(present, max(len(table.instrument_ids), 1))
+                )
+                for satellite_id in [table.satellite_ids[satellite]]
+                for instrument_id in [table.instrument_ids[instrument]]
+            ],
+            dtype=np.int64,
+        )
+        pair = codes[inverse.ravel()]
+        selected = pair >= 0
+        start = table.sample_start + (table.start - request.start) // unit
+        columns.append(
+            (
+                pair[selected],
+                table.target[selected] + offset,
+                start[selected],
+                start[selected] + table.duration[selected],
+            )
+        )
+    pair, index, start, end = (
+        np.concatenate(column).astype(np.int64)
+        for column in zip(*(columns or [([],) * 4]))
+    )
+    count("samples", len(index))
+    # stitch intervals split at window boundaries per (target, satellite, payload)
+    key, start, end, *_ = merge_intervals(index * max(len(pairs), 1) + pair, start, end)
+    index, pair = np.divmod(key, max(len(pairs), 1))
+    intervals = []
+    for (satellite_id, instrument_id), k in pairs.items():
+        selected = pair == k
+        intervals.append(
+            (
+                satellite_id,
+                instrument_id,
+                index[selected],
+                start[selected],
+                end[selected],
+            )
+        )
+    access = assemble_access(request, intervals, list(tiling_records.values()))
+    return coverage(
+        CoverageRequest(
+            **access.model_dump(),
+            omit_payload_ids=manifest.omit_payload_ids,
+            omit_satellite_ids=manifest.omit_satellite_ids,
+        )
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Command-line entry point to scatter, run and gather work units.
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m eose.scatter", description=__doc__.split("\n\n")[0]
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    command = commands.add_parser("scatter", help="Write work unit manifests.")
+    command.add_argument("request", help="Path of an access or coverage request JSON.")
+    command.add_argument("directory", help="Shared study directory.")
+    command.add_argument("--targets-per-unit", type=int, help="Targets per unit.")
+    command.add_argument("--window", type=float, help="Time window (hours) per unit.")
+    command = commands.add_parser("run", help="Execute pending work units.")
+    command.add_argument("directory", help="Shared study directory.")
+    command.add_argument("--worker", type=int, default=0, help="Index of this worker.")
+    command.add_argument("--workers", type=int, default=1, help="Number of workers.")
+    command.add_argument("--backend", default=DEFAULT_BACKEND, help="Backend name.")
+    command = commands.add_parser("gather", help="Merge results into coverage.")
+    command.add_argument("directory", help="Shared study directory.")
+    command.add_argument("--output", help="Path to save the coverage response JSON.")
+    args = parser.parse_args(argv)
+
+    if args.command == "scatter":
+        with open(args.request, "r", encoding="utf-8") as file:
+            request = CoverageRequest.model_validate_json(file.read())
+        manifest = scatter(
+            request,
+            args.directory,
+            args.targets_per_unit,
+            None if args.window is None else timedelta(hours=args.window),
+        )
+        print(f"{len(manifest.unit_ids)} work units")
+    elif args.command == "run":
+        executed = run(args.directory, args.worker, args.workers, args.backend)
+        print(f"{executed} work units executed")
+    else:
+        pending = get_pending(args.directory)
+        if pending:
+            print(f"{len(pending)} work units are not complete")
+            return 1
+        response = gather(args.directory)
+        if args.output:
+            _write(args.output, response.model_dump_json())
+        print(
+            f"coverage fraction {response.coverage_fraction:.1%}, "
+            f"harmonic mean revisit {response.harmonic_mean_revisit}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,311 @@
+"""
+Asyncio service layer for propagation and access analyses.
+
+Requests are evaluated by a named backend (see `eose.backends`) in a process
+pool. Requests with the same scope (all fields other than `start` and
+`duration`) whose windows overlap (or abut) on a common time grid are
+coalesced into one computation over the union of their windows; each caller
+receives the shared response clipped to its own window. Requests arriving
+while a covering computation is running attach to it. Segments of one
+stream are never coalesced with each other, so they are computed (and
+yielded) independently. Backpressure is
+applied by bounding the number of outstanding requests (callers wait for
+admission) and the number of computations submitted to the pool (queued
+computations keep coalescing new requests).
+"""
+
+import asyncio
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Dict, List, Optional, Union
+
+from .access import AccessRequest, AccessResponse
+from .backends import DEFAULT_BACKEND, get_backend
+from .instrumentation import count, span
+from .propagation import PropagationRequest, PropagationResponse
+
+Request = Union[PropagationRequest, AccessRequest]
+Response = Union[PropagationResponse, AccessResponse]
+
+OPERATIONS = {PropagationRequest: "propagate", AccessRequest: "access"}
+
+
+def _evaluate(backend: str, operation: str, request: Request) -> Response:
+    return getattr(get_backend(backend), operation)(request)
+
+
+def _end(request: Request) -> datetime:
+    """
+    Returns the last time step of a request.
+    """
+    return request.start + request.duration // request.time_step * request.time_step
+
+
+def clip_response(response: Response, request: Request) -> Response:
+    """
+    Restricts a response computed over a window covering a request (on the
+    same time grid) to the window of the request.
+    """
+    start, end = request.start, _end(request)
+    fields = request.model_dump(
+        exclude={"satellite_records", "target_records", "tiling_records"}
+    )
+    if isinstance(response, PropagationResponse):
+        return PropagationResponse(
+            **fields,
+            satellite_records=[
+                record.model_copy(
+                    update=dict(
+                        samples=[s for s in record.samples if start <= s.time <= end]
+                    )
+                )
+                for record in response.satellite_records
+            ],
+        )
+    satellite_ids = {str(satellite.id) for satellite in request.satellites}
+    return AccessResponse(
+        **fields,
+        tiling_records=[
+            record
+            for record in response.tiling_records
+            if str(record.satellite_id) in satellite_ids
+        ],
+        target_records=[
+            record.model_copy(
+                update=dict(
+                    samples=[
+                        sample.model_copy(
+                            update=dict(
+                                start=max(sample.start, start),
+                                duration=min(sample.start + sample.duration, end)
+                                - max(sample.start, start),
+                            )
+                        )
+                        for sample in record.samples
+                        if sample.start <= end
+                        and sample.start + sample.duration >= start
+                    ]
+                )
+            )
+            for record in response.target_records
+        ],
+    )
+
+
+class _Batch:
+    """
+    Computation over the union of the windows of coalesced requests.
+    """
+
+    def __init__(
+        self,
+        operation: str,
+        request: Request,
+        result: asyncio.Future,
+        stream: Optional[object] = None,
+    ):
+        self.operation = operation
+        self.request = request
+        self.result = result
+        self.streams = set() if stream is None else {stream}
+
+    def is_aligned(self, request: Request) -> bool:
+        return (
+            request.start - self.request.start
+        ) % self.request.time_step == timedelta(0)
+
+    def covers(self, request: Request) -> bool:
+        return (
+            self.is_aligned(request)
+            and self.request.start <= request.start
+            and _end(request) <= _end(self.request)
+        )
+
+    def extend(self, request: Request, stream: Optional[object] = None) -> bool:
+        """
+        Extends the window of this batch to include an overlapping or
+        abutting request (on the same time grid), if possible and not a
+        segment of a stream with a segment in this batch.
+        """
+        step = self.request.time_step
+        if (
+            stream in self.streams
+            or not self.is_aligned(request)
+            or request.start > _end(self.request) + step
+            or _end(request) < self.request.start - step
+        ):
+            return False
+        if stream is not None:
+            self.streams.add(stream)
+        start = min(self.request.start, request.start)
+        end = max(_end(self.request), _end(request))
+        self.request = self.request.model_copy(
+            update=dict(start=start, duration=end - start)
+        )
+        return True
+
+
+class AnalysisService:
+    """
+    Asyncio service coalescing and evaluating analysis requests.
+
+    Uses a `ProcessPoolExecutor` (with `max_workers` processes) unless
+    another executor is provided. At most `max_queued` requests are
+    outstanding and at most `max_pending` computations are submitted to the
+    executor at once. Requests wait `coalesce_delay` for other requests to
+    coalesce with before being computed.
+    """
+
+    def __init__(
+        self,
+        backend: str = DEFAULT_BACKEND,
+        executor: Optional[Executor] = None,
+        max_workers: Optional[int] = None,
+        max_pending: int = 4,
+        max_queued: int = 256,
+        coalesce_delay: timedelta = timedelta(milliseconds=10),
+    ):
+        self.backend = backend
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.max_queued = max_queued
+        self.coalesce_delay = coalesce_delay
+        self._executor = executor
+        self._owns_executor = executor is None
+        self._admission: Optional[asyncio.Semaphore] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._open: Dict[str, List[_Batch]] = {}
+        self._running: Dict[str, List[_Batch]] = {}
+
+    @property
+    def executor(self) -> Executor:
+        """
+        Returns the executor evaluating requests (created on first use).
+        """
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(self.max_workers)
+        return self._executor
+
+    def close(self) -> None:
+        """
+        Shuts down the executor (if created by this service).
+        """
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    async def __aenter__(self) -> "AnalysisService":
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        self.close()
+
+    async def propagate(self, request: PropagationRequest) -> PropagationResponse:
+        """
+        Propagates the satellites of a request.
+        """
+        return await self.submit("propagate", request)
+
+    async def access(self, request: AccessRequest) -> AccessResponse:
+        """
+        Computes access of a request.
+        """
+        return await self.submit("access", request)
+
+    async def submit(self, operation: str, request: Request) -> Response:
+        """
+        Evaluates an operation (`propagate` or `access`) of a request,
+        coalescing it with other requests of the same scope.
+        """
+        return await self._submit(operation, request)
+
+    async def _submit(
+        self, operation: str, request: Request, stream: Optional[object] = None
+    ) -> Response:
+        if self._admission is None:
+            self._admission = asyncio.Semaphore(self.max_queued)
+            self._slots = asyncio.Semaphore(self.max_pending)
+        async with self._admission:
+            with span("AnalysisService.submit", operation=operation):
+                key = operation + request.model_dump_json(
+                    exclude={"start", "duration", "satellite_records", "target_records"}
+                )
+                batch = next(
+                    (b for b in self._running.get(key, []) if b.covers(request)),
+                    None,
+                ) or next(
+                    (b for b in self._open.get(key, []) if b.extend(request, stream)),
+                    None,
+                )
+                if batch is None:
+                    loop = asyncio.get_running_loop()
+                    batch = _Batch(operation, request, loop.create_future(), stream)
+                    self._open.setdefault(key, []).append(batch)
+                    loop.create_task(self._dispatch(key, batch))
+                else:
+                    count("coalesced")
+                response = await asyncio.shield(batch.result)
+                return clip_response(response, request)
+
+    async def _dispatch(self, key: str, batch: _Batch) -> None:
+        await asyncio.sleep(self.coalesce_delay.total_seconds())
+        async with self._slots:
+            self._open[key].remove(batch)
+            self._running.setdefault(key, []).append(batch)
+            with span("AnalysisService.compute", operation=batch.operation):
+                count("computations")
+                try:
+                    response = await asyncio.get_running_loop().run_in_executor(
+                        self.executor,
+                        _evaluate,
+                        self.backend,
+                        batch.operation,
+                        batch.request,
+                    )
+                except Exception as error:
+                    batch.result.set_exception(error)
+                else:
+                    batch.result.set_result(response)
+                finally:
+                    self._running[key].remove(batch)
+
+    async def stream(
+        self, request: Request, segment: timedelta
+    ) -> AsyncIterator[Response]:
+        """
+        Yields the responses of consecutive segments (of at least one time
+        step) of a request window in order as they complete.
+
+        Segments are disjoint on the request time grid, so accesses spanning
+        segment boundaries are split. Segments are computed independently
+        (never coalesced with each other) and at most `max_pending` segments
+        are computed ahead of the consumer.
+        """
+        operation = OPERATIONS[type(request)]
+        number_steps = request.duration // request.time_step
+        size = max(segment // request.time_step, 1)
+        stream = object()
+        pending = deque()
+        try:
+            for first in range(0, number_steps + 1, size):
+                last = min(first + size - 1, number_steps)
+                part = request.model_copy(
+                    update=dict(
+                        start=request.start + first * request.time_step,
+                        duration=(last - first) * request.time_step,
+                    )
+                )
+                pending.append(
+                    asyncio.ensure_future(self._submit(operation, part, stream))
+                )
+                if len(pending) >= self.max_pending:
+                    yield await pending.popleft()
+                # yield completed segments without waiting for a full queue
+                while pending and pending[0].done():
+                    yield pending.popleft().result()
+            while pending:
+                yield await pending.popleft()
+        finally:
+            for task in pending:
+                task.cancel()
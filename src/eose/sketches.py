@@ -0,0 +1,310 @@
+"""
+Streaming, mergeable summaries of per-target revisit distributions.
+
+A `RevisitSketch` summarizes the gaps between merged accesses of each target
+(the revisit of `CoverageSample`) with running counts, sums and extrema and a
+fixed-bin (logarithmic) histogram, so that percentile revisit, maximum gap and
+time-weighted average gap are available without storing access samples.
+Sketches are updated with arrays of access intervals in chronological chunks
+and merged across shards of consecutive time windows (or of disjoint
+targets).
+"""
+
+import json
+from datetime import datetime, timedelta
+from os import PathLike
+from typing import List, Optional, Sequence, Union
+
+import numpy as np
+from pandas import DataFrame
+
+from .access import AccessIndex, AccessResponse
+from .analysis import merge_intervals
+from .utils import Identifier
+
+#: Default histogram bin edges (seconds) of revisit: 128 logarithmic bins
+#: from 1 minute to 60 days (about 9% relative bin width).
+REVISIT_EDGES = np.geomspace(60, 60 * 86400, 129)
+
+_MICROSECOND = timedelta(microseconds=1)
+
+
+class RevisitSketch:
+    """
+    Revisit distribution summaries of targets.
+
+    Arrays hold, for each target, the number of (merged) accesses, the first
+    access start, the last access start and end (integer microseconds from
+    `start`), the sum, sum of squares, minimum and maximum of gaps (s) and
+    the number of gaps in each histogram bin. The histogram has one bin per
+    pair of consecutive edges plus an underflow bin (gaps below the first
+    edge) before and an overflow bin (gaps at or above the last edge) after.
+    """
+
+    def __init__(
+        self,
+        start: datetime,
+        target_ids: Sequence[Identifier],
+        edges: np.ndarray = REVISIT_EDGES,
+        access_count: Optional[np.ndarray] = None,
+        first_start: Optional[np.ndarray] = None,
+        last_start: Optional[np.ndarray] = None,
+        last_end: Optional[np.ndarray] = None,
+        gap_sum: Optional[np.ndarray] = None,
+        gap_square_sum: Optional[np.ndarray] = None,
+        min_gap: Optional[np.ndarray] = None,
+        max_gap: Optional[np.ndarray] = None,
+        histogram: Optional[np.ndarray] = None,
+    ):
+        number_targets = len(target_ids)
+        self.start = start
+        self.target_ids: List[Identifier] = list(target_ids)
+        self.edges = np.asarray(edges, dtype=float)
+
+        def array(values, fill, dtype):
+            if values is None:
+                return np.full(number_targets, fill, dtype=dtype)
+            return np.asarray(values, dtype=dtype)
+
+        self.access_count = array(access_count, 0, np.int64)
+        self.first_start = array(first_start, 0, np.int64)
+        self.last_start = array(last_start, 0, np.int64)
+        self.last_end = array(last_end, 0, np.int64)
+        self.gap_sum = array(gap_sum, 0, float)
+        self.gap_square_sum = array(gap_square_sum, 0, float)
+        self.min_gap = array(min_gap, np.nan, float)
+        self.max_gap = array(max_gap, np.nan, float)
+        self.histogram = (
+            np.zeros((number_targets, len(self.edges) + 1), dtype=np.int64)
+            if histogram is None
+            else np.asarray(histogram, dtype=np.int64)
+        )
+
+    def __len__(self) -> int:
+        return len(self.target_ids)
+
+    @classmethod
+    def from_index(
+        cls, index: AccessIndex, edges: np.ndarray = REVISIT_EDGES
+    ) -> "RevisitSketch":
+        """
+        Creates a sketch from the samples of an access index.
+        """
+        sketch = cls(index.start, index.target_ids, edges)
+        sketch.update(index.target, index.sample_start, index.sample_end)
+        return sketch
+
+    @classmethod
+    def from_response(
+        cls, response: AccessResponse, edges: np.ndarray = REVISIT_EDGES
+    ) -> "RevisitSketch":
+        """
+        Creates a sketch from the records of an access (or coverage) response.
+        """
+        return cls.from_index(response.index, edges)
+
+    @property
+    def gap_count(self) -> np.ndarray:
+        """
+        Returns the number of gaps of each target.
+        """
+        return np.maximum(self.access_count - 1, 0)
+
+    @property
+    def mean_gap(self) -> np.ndarray:
+        """
+        Returns the mean gap (s) of each target (`NaN` without gaps), as
+        `CoverageRecord.mean_revisit`.
+        """
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(self.gap_count > 0, self.gap_sum / self.gap_count, np.nan)
+
+    @property
+    def time_weighted_gap(self) -> np.ndarray:
+        """
+        Returns the time-weighted average gap (s) of each target, i.e., the
+        mean length of the gap containing a time between the first and last
+        access (`NaN` without gaps).
+        """
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(
+                self.gap_sum > 0, self.gap_square_sum / self.gap_sum, np.nan
+            )
+
+    def _add_gaps(self, index: np.ndarray, gaps: np.ndarray) -> None:
+        """
+        Adds gaps (s) of targets to the summaries.
+        """
+        number_targets, number_bins = self.histogram.shape
+        self.gap_sum += np.bincount(index, weights=gaps, minlength=number_targets)
+        self.gap_square_sum += np.bincount(
+            index, weights=gaps**2, minlength=number_targets
+        )
+        np.fmin.at(self.min_gap, index, gaps)
+        np.fmax.at(self.max_gap, index, gaps)
+        bins = np.searchsorted(self.edges, gaps, side="right")
+        self.histogram += np.bincount(
+            index * number_bins + bins, minlength=number_targets * number_bins
+        ).reshape(number_targets, number_bins)
+
+    def update(self, index: np.ndarray, start: np.ndarray, end: np.ndarray) -> None:
+        """
+        Adds access intervals (target index, start and end time in integer
+        microseconds from `start`) from any satellites and payloads.
+
+        Intervals of a target must not start before the start of its last
+        access added previously; overlapping intervals are merged.
+        """
+        index = np.asarray(index, dtype=np.int64)
+        start = np.asarray(start, dtype=np.int64)
+        end = np.asarray(end, dtype=np.int64)
+        if len(index) == 0:
+            return
+        prior = self.access_count[index] > 0
+        if np.any(start[prior] < self.last_start[index[prior]]):
+            raise ValueError("Access intervals must be added in chronological order.")
+        # continue from the last access of each target added previously
+        known = np.unique(index[prior])
+        index, start, end, *_ = merge_intervals(
+            np.concatenate((index, known)),
+            np.concatenate((start, self.last_start[known])),
+            np.concatenate((end, self.last_end[known])),
+        )
+        first = np.r_[True, index[1:] != index[:-1]]
+        last = np.r_[index[1:] != index[:-1], True]
+        targets = index[first]
+        self.first_start[targets] = np.where(
+            self.access_count[targets] > 0, self.first_start[targets], start[first]
+        )
+        self.access_count += np.bincount(index, minlength=len(self))
+        self.access_count[known] -= 1
+        self.last_start[index[last]] = start[last]
+        self.last_end[index[last]] = end[last]
+        gaps = ~first[1:]
+        self._add_gaps(index[1:][gaps], (start[1:] - end[:-1])[gaps] / 1e6)
+
+    def merge(self, other: "RevisitSketch") -> "RevisitSketch":
+        """
+        Merges the sketch of the same targets over a later time window (which
+        may share its boundary with this window) or of other targets.
+        """
+        if self.target_ids != other.target_ids or not np.array_equal(
+            self.edges, other.edges
+        ):
+            raise ValueError("Sketches must have the same targets and bin edges.")
+        offset = (other.start - self.start) // _MICROSECOND
+        first_start = other.first_start + offset
+        last_start = other.last_start + offset
+        last_end = other.last_end + offset
+        mine, theirs = self.access_count > 0, other.access_count > 0
+        both = mine & theirs
+        if np.any(first_start[both] < self.last_start[both]):
+            raise ValueError("Sketches must cover consecutive time windows.")
+        joined = both & (first_start <= self.last_end)
+        extended = joined & (other.access_count == 1)
+        merged = RevisitSketch(
+            self.start,
+            self.target_ids,
+            self.edges,
+            access_count=self.access_count + other.access_count - joined,
+            first_start=np.where(
+                mine, self.first_start, np.where(theirs, first_start, 0)
+            ),
+            last_start=np.where(theirs & ~extended, last_start, self.last_start),
+            last_end=np.where(
+                theirs,
+                np.where(extended, np.maximum(last_end, self.last_end), last_end),
+                self.last_end,
+            ),
+            gap_sum=self.gap_sum + other.gap_sum,
+            gap_square_sum=self.gap_square_sum + other.gap_square_sum,
+            min_gap=np.fmin(self.min_gap, other.min_gap),
+            max_gap=np.fmax(self.max_gap, other.max_gap),
+            histogram=self.histogram + other.histogram,
+        )
+        boundary = np.flatnonzero(both & ~joined)
+        merged._add_gaps(
+            boundary, (first_start[boundary] - self.last_end[boundary]) / 1e6
+        )
+        return merged
+
+    def get_quantile(self, q: float) -> np.ndarray:
+        """
+        Estimates the `q`-quantile (0 to 1) of the gaps (s) of each target
+        (`NaN` without gaps) by interpolating within histogram bins bounded
+        by the minimum and maximum gaps.
+        """
+        counts = self.histogram
+        total = np.sum(counts, axis=1)
+        cumulative = np.cumsum(counts, axis=1)
+        rank = q * total
+        # first non-empty bin reaching the rank (e.g., the first non-empty bin for q=0)
+        k = np.argmax((cumulative >= rank[:, np.newaxis]) & (counts > 0), axis=1)
+        rows = np.arange(len(self))
+        lower = np.fmax(np.r_[0, self.edges][k], self.min_gap)
+        upper = np.fmin(np.r_[self.edges, np.inf][k], self.max_gap)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            fraction = np.clip(
+                (rank - cumulative[rows, k] + counts[rows, k]) / counts[rows, k], 0, 1
+            )
+            value = lower + fraction * np.maximum(upper - lower, 0)
+        return np.where(total > 0, value, np.nan)
+
+    def as_dataframe(self, quantiles: Sequence[float] = (0.5, 0.95)) -> DataFrame:
+        """
+        Converts this sketch to a `pandas.DataFrame` (one row per target)
+        of access counts and gap statistics (s), including one column per
+        quantile (e.g., `p95`).
+        """
+        return DataFrame(
+            {
+                "target_id": self.target_ids,
+                "access_count": self.access_count,
+                "mean_gap": self.mean_gap,
+                "time_weighted_gap": self.time_weighted_gap,
+                "max_gap": self.max_gap,
+                **{f"p{100 * q:g}": self.get_quantile(q) for q in quantiles},
+            }
+        )
+
+    def save(self, path: Union[str, PathLike]) -> None:
+        """
+        Saves this sketch to a NumPy `.npz` file.
+        """
+        with open(path, "wb") as file:
+            np.savez_compressed(
+                file,
+                header=np.array(
+                    json.dumps(
+                        {"start": self.start.isoformat(), "target_ids": self.target_ids}
+                    )
+                ),
+                **{name: getattr(self, name) for name in _ARRAYS},
+            )
+
+    @classmethod
+    def load(cls, path: Union[str, PathLike]) -> "RevisitSketch":
+        """
+        Loads a sketch from a NumPy `.npz` file.
+        """
+        with np.load(path) as data:
+            header = json.loads(str(data["header"]))
+            return cls(
+                datetime.fromisoformat(header["start"]),
+                header["target_ids"],
+                **{name: data[name] for name in _ARRAYS},
+            )
+
+
+_ARRAYS = [
+    "edges",
+    "access_count",
+    "first_start",
+    "last_start",
+    "last_end",
+    "gap_sum",
+    "gap_square_sum",
+    "min_gap",
+    "max_gap",
+    "histogram",
+]
@@ -2,12 +2,13 @@
 Models to represent observation targets.
 """
 
-from typing import Optional
+from typing import Iterable, Iterator, Optional, Sequence, Union
 
+import numpy as np
 from pydantic import BaseModel, Field
 
 from .utils import PlanetaryCoordinateReferenceSystem, Identifier
-from .geometry import Position, Point, Feature
+from .geometry import Altitude, Position, Point, Feature, MultiPolygon, Polygon
 
 
 class TargetPoint(BaseModel):
@@ -20,6 +21,11 @@ class TargetPoint(BaseModel):
         None, description="Coordinate reference system in which this target is defined."
     )
     position: Position = Field(..., description="Position of this target.")
+    area: Optional[float] = Field(
+        None,
+        gt=0,
+        description="Surface area (square meters) represented by this target, used to weight coverage statistics (optional).",
+    )
 
     def as_geometry(self) -> Point:
         """
@@ -34,7 +40,11 @@ class TargetPoint(BaseModel):
         return Feature(
             type="Feature",
             geometry=self.as_geometry(),
-            properties={"id": self.id, "crs": self.crs},
+            properties=(
+                {"id": self.id, "crs": self.crs}
+                if self.area is None
+                else {"id": self.id, "crs": self.crs, "area": self.area}
+            ),
         )
 
     @classmethod
@@ -54,5 +64,65 @@ class TargetPoint(BaseModel):
         return TargetPoint(
             id=feature.properties.get("id"),
             crs=feature.properties.get("crs"),
+            area=feature.properties.get("area"),
             position=feature.geometry.coordinates,
         )
+
+    @classmethod
+    def iter_from_features(cls, features: Iterable[Feature]) -> Iterator["TargetPoint"]:
+        """
+        Incrementally creates target points from an iterable of GeoJSON `Feature` objects.
+        """
+        for feature in features:
+            yield cls.from_feature(feature)
+
+
+class TargetRegion(BaseModel):
+    """
+    Target area of interest on or above the surface of a planetary body.
+    """
+
+    id: Identifier = Field(..., description="Target identifier.")
+    crs: Optional[PlanetaryCoordinateReferenceSystem] = Field(
+        None, description="Coordinate reference system in which this target is defined."
+    )
+    region: Union[Polygon, MultiPolygon] = Field(
+        ..., description="Spatial region of this target."
+    )
+    altitude: Optional[Altitude] = Field(
+        None, description="Target altitude (optional)."
+    )
+
+    def as_feature(self) -> Feature:
+        """
+        Convert this target region to a GeoJSON `Feature`.
+        """
+        return Feature(
+            type="Feature",
+            geometry=self.region,
+            properties={"id": self.id, "crs": self.crs},
+        )
+
+
+def target_index(
+    targets: Sequence[TargetPoint], target_ids: Sequence[Identifier]
+) -> np.ndarray:
+    """
+    Maps target identifiers to positional indices in a list of targets.
+    """
+    lookup = {target.id: i for i, target in enumerate(targets)}
+    return np.fromiter(
+        (lookup[target_id] for target_id in target_ids),
+        dtype=np.int64,
+        count=len(target_ids),
+    )
+
+
+def target_weights(targets: Sequence[TargetPoint]) -> np.ndarray:
+    """
+    Returns the area weights of targets (or unit weights unless every target
+    defines an area).
+    """
+    if targets and all(target.area is not None for target in targets):
+        return np.array([target.area for target in targets], dtype=float)
+    return np.ones(len(targets))
@@ -0,0 +1,276 @@
+"""
+Trade-space evaluation of constellations drawn from candidate satellites.
+
+Access is computed once per unique (orbit, payload, body orientation) key for
+the targets and time span of a template `AccessRequest` and cached as arrays
+of intervals. Access and coverage responses (and vectorized revisit
+statistics) for any subset or re-combination of candidate satellites are then
+assembled by merging the cached intervals rather than recomputing geometry.
+"""
+
+import hashlib
+import json
+from datetime import timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from pydantic import BaseModel, Field
+
+from .access import AccessRequest, AccessResponse, RepeatTilingRecord
+from .analysis import (
+    REPEAT_TOLERANCE,
+    AnyPayload,
+    _body_orientation,
+    assemble_access,
+    assemble_coverage,
+    get_repeat_cycles,
+    get_tiling_records,
+    merge_intervals,
+    payload_intervals,
+)
+from .coverage import CoverageRequest, CoverageResponse
+from .instrumentation import count, instrumented
+from .intervals import IntervalArray
+from .satellites import Satellite
+from .sketches import RevisitSketch
+from .targets import target_weights
+from .utils import Identifier
+
+Intervals = Tuple[np.ndarray, np.ndarray, np.ndarray]
+
+
+class TradeSpaceStatistics(BaseModel):
+    """
+    Aggregate coverage statistics of one combination of satellites.
+    """
+
+    satellite_ids: List[Identifier] = Field(
+        ..., description="Identifiers of the satellites in this combination."
+    )
+    coverage_fraction: float = Field(
+        0,
+        ge=0,
+        le=1,
+        description="Fraction of targets (weighted by area, if defined) accessed at least once.",
+    )
+    harmonic_mean_revisit: Optional[timedelta] = Field(
+        None,
+        ge=0,
+        description="Harmonic mean revisit time over all targets (weighted by area, if defined).",
+    )
+    max_revisit: Optional[timedelta] = Field(
+        None, ge=0, description="Maximum revisit time over all targets."
+    )
+
+
+class TradeSpace:
+    """
+    Cache of per-satellite access intervals for a template access request.
+
+    The template defines the targets, time span, propagator and payload
+    identifiers; its satellites (if any) are computed on creation. Access of
+    satellites in repeat ground track orbits is tiled from one cycle unless
+    `tile_repeats` is disabled (see `analysis.payload_intervals`).
+    """
+
+    def __init__(
+        self,
+        request: AccessRequest,
+        tile_repeats: bool = True,
+        repeat_tolerance: float = REPEAT_TOLERANCE,
+    ):
+        self.request = request.model_copy(update=dict(satellites=[]))
+        self.tile_repeats = tile_repeats
+        self.repeat_tolerance = repeat_tolerance
+        self._scope = request.model_dump_json(
+            include={
+                "start",
+                "duration",
+                "time_step",
+                "propagator",
+                "targets",
+                "constraints",
+            }
+        )
+        self._intervals: Dict[str, Intervals] = {}
+        self._weights = target_weights(request.targets)
+        self.add(request.satellites)
+
+    def get_key(self, satellite: Satellite, payload: AnyPayload) -> str:
+        """
+        Returns the cache key of a (satellite, payload) pair, which ignores
+        satellite and payload identifiers and names.
+        """
+        return hashlib.sha1(
+            json.dumps(
+                [
+                    self._scope,
+                    satellite.orbit.model_dump_json(
+                        exclude={"object_name", "object_id", "norad_cat_id"}
+                    ),
+                    payload.model_dump_json(exclude={"id", "name"}),
+                    _body_orientation(satellite),
+                ]
+            ).encode("utf-8")
+        ).hexdigest()
+
+    def _pairs(
+        self, satellites: Sequence[Satellite]
+    ) -> List[Tuple[Satellite, AnyPayload, str]]:
+        return [
+            (satellite, payload, self.get_key(satellite, payload))
+            for satellite in satellites
+            for payload in satellite.payloads
+            if payload.id in self.request.payload_ids
+        ]
+
+    @instrumented()
+    def add(self, satellites: Sequence[Satellite]) -> None:
+        """
+        Computes and caches access of candidate satellites not yet cached.
+        """
+        missing = {}
+        for satellite, _, key in self._pairs(satellites):
+            if key not in self._intervals and key not in missing:
+                missing[key] = satellite
+        count("cache_hit", len(self._pairs(satellites)) - len(missing))
+        count("cache_miss", len(missing))
+        if not missing:
+            return
+        unique = list(
+            {id(satellite): satellite for satellite in missing.values()}.values()
+        )
+        request = self.request.model_copy(
+            update=dict(
+                satellites=[
+                    satellite.model_copy(update=dict(id=str(k)))
+                    for k, satellite in enumerate(unique)
+                ]
+            )
+        )
+        for satellite, payload, index, start, end in payload_intervals(
+            request, self.tile_repeats, self.repeat_tolerance
+        ):
+            key = self.get_key(unique[int(satellite.id)], payload)
+            self._intervals.setdefault(key, (index, start, end))
+
+    def get_intervals(
+        self, satellites: Sequence[Satellite]
+    ) -> List[Tuple[Identifier, Identifier, np.ndarray, np.ndarray, np.ndarray]]:
+        """
+        Returns the (cached) satellite identifier, instrument identifier and
+        arrays of target index, start and end time (integer microseconds from
+        the request start) of each (satellite, payload) pair.
+        """
+        self.add(satellites)
+        return [
+            (satellite.id, payload.id) + self._intervals[key]
+            for satellite, payload, key in self._pairs(satellites)
+        ]
+
+    def tiling_records(
+        self, satellites: Sequence[Satellite]
+    ) -> List[RepeatTilingRecord]:
+        """
+        Returns the records of satellites of a combination whose access is
+        tiled from a repeat ground track cycle.
+        """
+        if not self.tile_repeats:
+            return []
+        request = self.request.model_copy(update=dict(satellites=list(satellites)))
+        return get_tiling_records(
+            request, get_repeat_cycles(request, self.repeat_tolerance)
+        )
+
+    def access(self, satellites: Sequence[Satellite]) -> AccessResponse:
+        """
+        Assembles the access response of a combination of satellites.
+        """
+        return assemble_access(
+            self.request.model_copy(update=dict(satellites=list(satellites))),
+            self.get_intervals(satellites),
+            self.tiling_records(satellites),
+        )
+
+    def _merge(
+        self, satellites: Sequence[Satellite]
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        intervals = self.get_intervals(satellites)
+        if not intervals:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty, empty
+        index, start, end = (
+            np.concatenate(column)
+            for column in zip(*(interval[2:] for interval in intervals))
+        )
+        return merge_intervals(index, start, end)[:3]
+
+    def statistics(self, satellites: Sequence[Satellite]) -> TradeSpaceStatistics:
+        """
+        Computes vectorized coverage statistics of a combination of satellites.
+        """
+        index, start, end = self._merge(satellites)
+        number_targets = len(self.request.targets)
+        same = index[1:] == index[:-1]
+        gaps = (start[1:] - end[:-1])[same]
+        revisited = index[1:][same]
+        number_gaps = np.bincount(revisited, minlength=number_targets)
+        mean_revisit = np.bincount(
+            revisited, weights=gaps, minlength=number_targets
+        ) / np.maximum(number_gaps, 1)
+        has_revisit = number_gaps > 0
+        accessed = np.bincount(index, minlength=number_targets) > 0
+        weights = self._weights
+        return TradeSpaceStatistics(
+            satellite_ids=[satellite.id for satellite in satellites],
+            coverage_fraction=(
+                np.sum(weights[accessed]) / np.sum(weights) if number_targets else 0
+            ),
+            harmonic_mean_revisit=(
+                None
+                if not np.any(has_revisit)
+                else timedelta(
+                    microseconds=(
+                        0
+                        if np.any(mean_revisit[has_revisit] == 0)
+                        else np.sum(weights[has_revisit])
+                        / np.sum(weights[has_revisit] / mean_revisit[has_revisit])
+                    )
+                )
+            ),
+            max_revisit=(
+                None if len(gaps) == 0 else timedelta(microseconds=int(np.max(gaps)))
+            ),
+        )
+
+    def sketch(self, satellites: Sequence[Satellite]) -> RevisitSketch:
+        """
+        Computes the revisit sketch of a combination of satellites (e.g., for
+        percentile revisit maps) without assembling coverage samples.
+        """
+        index, start, end = self._merge(satellites)
+        sketch = RevisitSketch(
+            self.request.start, [target.id for target in self.request.targets]
+        )
+        sketch.update(index, start, end)
+        return sketch
+
+    @instrumented()
+    def coverage(self, satellites: Sequence[Satellite]) -> CoverageResponse:
+        """
+        Assembles the coverage response of a combination of satellites.
+
+        Overlapping access samples (e.g., from different satellites) are
+        merged before computing the revisit (elapsed time since the prior
+        access).
+        """
+        index, intervals = IntervalArray.from_pair_intervals(
+            self.request.start, self.get_intervals(satellites)
+        )
+        return assemble_coverage(
+            CoverageRequest.model_construct(
+                **dict(self.request, satellites=list(satellites)),
+                tiling_records=self.tiling_records(satellites),
+            ),
+            *intervals.coalesce_by(index),
+        )
@@ -0,0 +1,227 @@
+"""
+Incremental coverage re-analysis for updated satellites.
+
+When orbit elements (e.g., daily TLE or OMM updates) or payloads of some
+satellites change, `update_coverage` re-computes access only for the changed
+satellites and only re-assembles the coverage records of targets accessed by
+changed (or removed) satellites before or after the update; records of other
+targets are reused from the previous response. Previous coverage samples of
+one unchanged satellite are kept as intervals, while targets with samples
+merged from several satellites (whose individual contributions are unknown)
+are re-computed for the unchanged satellites.
+"""
+
+from datetime import timedelta
+from typing import Dict, List, Set, Tuple, Union
+
+import numpy as np
+
+from .access import AccessRequest
+from .analysis import assemble_coverage
+from .backends import DEFAULT_BACKEND, get_backend
+from .coverage import CoverageRequest, CoverageResponse
+from .instrumentation import count, instrumented
+from .intervals import IntervalArray
+from .utils import Identifier
+
+# request fields which must agree to update a previous response
+_SCOPE = {
+    "start",
+    "duration",
+    "time_step",
+    "propagator",
+    "targets",
+    "payload_ids",
+    "constraints",
+}
+
+
+def get_changed_satellites(
+    previous: CoverageResponse, request: AccessRequest
+) -> Tuple[Set[Identifier], Set[Identifier]]:
+    """
+    Returns the identifiers of satellites of a request which are new or whose
+    content (e.g., `GeneralPerturbationsOrbitState` elements or payloads)
+    differs from a previous response and of satellites which were removed.
+    """
+    contents = {
+        satellite.id: satellite.model_dump_json() for satellite in previous.satellites
+    }
+    changed = {
+        satellite.id
+        for satellite in request.satellites
+        if contents.get(satellite.id) != satellite.model_dump_json()
+    }
+    removed = set(contents) - {satellite.id for satellite in request.satellites}
+    return changed, removed
+
+
+@instrumented()
+def update_coverage(
+    previous: CoverageResponse,
+    request: Union[AccessRequest, CoverageRequest],
+    backend: str = DEFAULT_BACKEND,
+) -> CoverageResponse:
+    """
+    Updates a previous coverage response for a request whose satellites
+    differ (are changed, added or removed) with access computed by a named
+    backend.
+
+    The request must otherwise have the same scope (time span, propagator,
+    targets, payloads, constraints and omitted identifiers) as the previous
+    response.
+    """
+    omit_payload_ids = getattr(request, "omit_payload_ids", [])
+    omit_satellite_ids = getattr(request, "omit_satellite_ids", [])
+    omitted_payloads = {str(payload_id) for payload_id in omit_payload_ids}
+    omitted = {str(satellite_id) for satellite_id in omit_satellite_ids}
+    if (
+        request.model_dump(include=_SCOPE) != previous.model_dump(include=_SCOPE)
+        or omitted_payloads != {str(value) for value in previous.omit_payload_ids}
+        or omitted != {str(value) for value in previous.omit_satellite_ids}
+    ):
+        raise ValueError("Request scope differs from the previous response.")
+    changed, removed = get_changed_satellites(previous, request)
+    updated = {str(satellite_id) for satellite_id in changed | removed}
+    count("changed_satellites", len(changed))
+    count("removed_satellites", len(removed))
+
+    # targets accessed by changed or removed satellites before the update;
+    # samples are attributed by exact satellite identifier, so samples merged
+    # from several satellites mark their targets as mixed
+    satellite_ids = {str(satellite.id) for satellite in previous.satellites}
+    affected, mixed = set(), set()
+    for m, record in enumerate(previous.target_records):
+        for sample in record.samples:
+            if sample.satellite_id not in satellite_ids:
+                affected.add(m)
+                mixed.add(m)
+            elif sample.satellite_id in updated:
+                affected.add(m)
+
+    satellite_codes: Dict[str, int] = {}
+    instrument_codes: Dict[str, int] = {}
+    columns: List[Tuple[np.ndarray, ...]] = []
+
+    # access of changed satellites (all targets) and of unchanged satellites
+    # for targets with samples merged from several satellites
+    access_backend = get_backend(backend)
+    for satellites, targets in [
+        (
+            [s for s in request.satellites if s.id in changed],
+            list(range(len(request.targets))),
+        ),
+        ([s for s in request.satellites if s.id not in changed], sorted(mixed)),
+    ]:
+        satellites = [s for s in satellites if str(s.id) not in omitted]
+        if not satellites or not targets:
+            continue
+        subset = request.model_copy(
+            update=dict(
+                satellites=satellites, targets=[request.targets[m] for m in targets]
+            )
+        )
+        results = access_backend.access_intervals(subset)
+        for satellite_id, instrument_id, index, start, end in results:
+            if str(instrument_id) in omitted_payloads:
+                continue
+            index = np.asarray(targets, dtype=np.int64)[index]
+            affected.update(np.unique(index).tolist())
+            columns.append(
+                (
+                    np.full(
+                        len(index),
+                        satellite_codes.setdefault(
+                            str(satellite_id), len(satellite_codes)
+                        ),
+                    ),
+                    np.full(
+                        len(index),
+                        instrument_codes.setdefault(
+                            str(instrument_id), len(instrument_codes)
+                        ),
+                    ),
+                    index,
+                    np.asarray(start, dtype=np.int64),
+                    np.asarray(end, dtype=np.int64),
+                )
+            )
+
+    # previous samples of affected targets contributed by unchanged satellites
+    unit = timedelta(microseconds=1)
+    reused = [
+        (m, sample)
+        for m in sorted(affected - mixed)
+        for sample in previous.target_records[m].samples
+        if sample.satellite_id not in updated
+    ]
+    start = np.array(
+        [(sample.start - request.start) // unit for _, sample in reused],
+        dtype=np.int64,
+    )
+    columns.append(
+        (
+            np.array(
+                [
+                    satellite_codes.setdefault(
+                        sample.satellite_id, len(satellite_codes)
+                    )
+                    for _, sample in reused
+                ],
+                dtype=np.int64,
+            ),
+            np.array(
+                [
+                    instrument_codes.setdefault(
+                        sample.instrument_id, len(instrument_codes)
+                    )
+                    for _, sample in reused
+                ],
+                dtype=np.int64,
+            ),
+            np.array([m for m, _ in reused], dtype=np.int64),
+            start,
+            start
+            + np.array(
+                [sample.duration // unit for _, sample in reused], dtype=np.int64
+            ),
+        )
+    )
+    count("affected_targets", len(affected))
+    count("reused_targets", len(request.targets) - len(affected))
+
+    satellite, instrument, index, start, end = (
+        np.concatenate(column) for column in zip(*columns)
+    )
+    index, intervals = IntervalArray(
+        request.start,
+        start,
+        end,
+        satellite,
+        instrument,
+        list(satellite_codes),
+        list(instrument_codes),
+    ).coalesce_by(index)
+    return assemble_coverage(
+        CoverageRequest.model_construct(
+            **{
+                name: getattr(request, name)
+                for name in AccessRequest.model_fields
+                if name != "propagation_records"
+            },
+            omit_payload_ids=omit_payload_ids,
+            omit_satellite_ids=omit_satellite_ids,
+            tiling_records=[
+                record
+                for record in access_backend.tiling_records(request)
+                if str(record.satellite_id) not in omitted
+            ],
+        ),
+        index,
+        intervals,
+        {
+            m: record
+            for m, record in enumerate(previous.target_records)
+            if m not in affected
+        },
+    )
@@ -3,7 +3,8 @@ Utility data types.
 """
 
 from enum import Enum
-from typing import List, Union
+from functools import wraps
+from typing import Any, Callable, List, Union
 from typing_extensions import Annotated
 
 from pydantic import Field, StrictInt, StrictStr
@@ -38,6 +39,7 @@ class CartesianReferenceFrame(str, Enum):
     """
     ITRS = "ITRS"  # International Terrestrial Reference System (ITRS)
     ICRF = "ICRF"  # International Celestial Reference Frame
+    TEME = "TEME"  # True Equator Mean Equinox (SGP4 output frame)
 
 
 class FixedOrientation(str, Enum):
@@ -56,3 +58,55 @@ class FixedOrientation(str, Enum):
 
     NADIR_GEOCENTRIC = "NADIR_GEOCENTRIC"  # nadir pointing through geocenter
     NADIR_GEODETIC = "NADIR_GEODETIC"  # nadir normal to ellipsoid surface
+
+
+class CachedValue:
+    """
+    Value cached on a model (as a private attribute) with the key it was built
+    from. Cached values compare equal to each other so that caches do not
+    affect model equality.
+    """
+
+    __slots__ = ("key", "value")
+
+    def __init__(self, key: Any = None, value: Any = None):
+        self.key = key
+        self.value = value
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, CachedValue)
+
+    __hash__ = None
+
+
+def keyed_cached_property(
+    key: Callable[[Any], Any],
+) -> Callable[[Callable[[Any], Any]], property]:
+    """
+    Decorates a model method as a property cached until the value returned
+    by `key` (e.g., a snapshot of the sample fields it is built from) changes.
+
+    The model must declare a private attribute `_<name>_cache` of type
+    `CachedValue` (e.g., `PrivateAttr(default_factory=CachedValue)`), so the
+    cached value is neither serialized nor compared. Unlike
+    `functools.cached_property`, the cached value is not reused after
+    `model_copy` with updated fields or after samples are modified in place.
+    """
+
+    def decorator(function: Callable[[Any], Any]) -> property:
+        name = f"_{function.__name__}_cache"
+
+        @wraps(function)
+        def getter(self):
+            snapshot = key(self)
+            cached = getattr(self, name)
+            if cached.value is None or cached.key != snapshot:
+                # replace (rather than update) the cached value as private
+                # attributes are shared by shallow copies
+                cached = CachedValue(snapshot, function(self))
+                setattr(self, name, cached)
+            return cached.value
+
+        return property(getter)
+
+    return decorator
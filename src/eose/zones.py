@@ -0,0 +1,281 @@
+"""
+Zonal aggregation of coverage statistics by regions.
+
+A `ZoneIndex` holds zone polygons (e.g., latitude bands, countries or ocean
+basins) in a `shapely.STRtree` and assigns target points to the zones that
+contain them in one bulk query, cached for recently used target sets.
+Targets on the boundary of zones (e.g., on the edge between two latitude
+bands) but inside none are assigned to the last of those zones only.
+Coverage statistics per zone are then computed with grouped array
+reductions over the (target, zone) assignment, weighted by target area if
+every target defines one. Zones may overlap, in which case a target counts
+in each of the zones containing it.
+"""
+
+import hashlib
+from collections import OrderedDict
+from datetime import timedelta
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import shapely
+from pydantic import BaseModel, Field
+from shapely.geometry import shape
+
+from .access import _target_geometry
+from .coverage import CoverageResponse
+from .geometry import Feature, FeatureCollection, MultiPolygon, Polygon
+from .instrumentation import count, instrumented
+from .targets import TargetPoint, target_index, target_weights
+from .utils import Identifier
+
+_ASSIGNMENT_CACHE_SIZE = 8
+
+
+class ZoneStatistics(BaseModel):
+    """
+    Aggregate coverage statistics of the targets in one zone.
+    """
+
+    zone_id: Identifier = Field(..., description="Zone identifier.")
+    number_targets: int = Field(0, ge=0, description="Number of targets in the zone.")
+    area: float = Field(
+        0,
+        ge=0,
+        description="Total area (square meters, if defined for every target) or number of targets.",
+    )
+    coverage_fraction: float = Field(
+        0,
+        ge=0,
+        le=1,
+        description="Fraction of targets (weighted by area, if defined) accessed at least once.",
+    )
+    mean_revisit: Optional[timedelta] = Field(
+        None,
+        ge=0,
+        description="Mean of target mean revisit times (weighted by area, if defined).",
+    )
+    harmonic_mean_revisit: Optional[timedelta] = Field(
+        None,
+        ge=0,
+        description="Harmonic mean of target mean revisit times (weighted by area, if defined).",
+    )
+    percentile_revisit: Dict[str, timedelta] = Field(
+        {},
+        description="Percentiles (e.g., `p90`) of target mean revisit times (weighted by area, if defined).",
+    )
+
+
+def latitude_bands(delta_latitude: float = 10) -> FeatureCollection:
+    """
+    Creates a `FeatureCollection` of latitude band zones of `delta_latitude`
+    decimal degrees, identified by their southern and northern latitudes
+    (e.g., `-10:0`). Targets on the edge between two bands are assigned to
+    the northern band (see `ZoneIndex.assign`).
+    """
+    edges = np.unique(np.r_[np.arange(-90, 90, delta_latitude), 90]).tolist()
+    return FeatureCollection(
+        type="FeatureCollection",
+        features=[
+            Feature(
+                type="Feature",
+                id=f"{south:g}:{north:g}",
+                geometry=Polygon(
+                    type="Polygon",
+                    coordinates=[
+                        [
+                            (-180, south),
+                            (180, south),
+                            (180, north),
+                            (-180, north),
+                            (-180, south),
+                        ]
+                    ],
+                ),
+                properties={},
+            )
+            for south, north in zip(edges[:-1], edges[1:])
+        ],
+    )
+
+
+class ZoneIndex:
+    """
+    Spatial index of zones assigning target points for zonal aggregation.
+
+    Zones are a `FeatureCollection` (identified by feature `id`, an `id`
+    property or position) or a sequence of `Polygon` or `MultiPolygon`
+    geometries (identified by `zone_ids` or position).
+    """
+
+    def __init__(
+        self,
+        zones: Union[FeatureCollection, Sequence[Union[Polygon, MultiPolygon]]],
+        zone_ids: Optional[Sequence[Identifier]] = None,
+    ):
+        if isinstance(zones, FeatureCollection):
+            geometries = [feature.geometry for feature in zones.features]
+            ids = [
+                (
+                    feature.id
+                    if feature.id is not None
+                    else (feature.properties or {}).get("id", k)
+                )
+                for k, feature in enumerate(zones.features)
+            ]
+        else:
+            geometries = list(zones)
+            ids = list(range(len(geometries)))
+        self.zone_ids: List[Identifier] = ids if zone_ids is None else list(zone_ids)
+        if len(self.zone_ids) != len(geometries):
+            raise ValueError("Number of zone identifiers must match zones.")
+        self.geometries = np.array(
+            [shape(geometry) for geometry in geometries], dtype=object
+        )
+        self._tree = shapely.STRtree(self.geometries)
+        self._assignments: "OrderedDict[str, Tuple[np.ndarray, np.ndarray]]" = (
+            OrderedDict()
+        )
+
+    def __len__(self) -> int:
+        return len(self.zone_ids)
+
+    @instrumented()
+    def assign(self, targets: Sequence[TargetPoint]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns arrays of target index and zone index of each target in each
+        zone, sorted by zone (cached for recently used sets of target
+        positions).
+
+        Targets are assigned to each zone containing them or, if on the
+        boundary of zones but inside none, to the last of those zones only.
+        """
+        key = hashlib.sha1(
+            np.array([target.position[:2] for target in targets], dtype=float).tobytes()
+        ).hexdigest()
+        if key in self._assignments:
+            count("cache_hit")
+            self._assignments.move_to_end(key)
+            return self._assignments[key]
+        count("cache_miss")
+        geometry = _target_geometry(list(targets))
+        target, zone = self._tree.query(geometry, predicate="intersects")
+        contained = shapely.contains(self.geometries[zone], geometry[target])
+        inside = np.zeros(len(geometry), dtype=bool)
+        inside[target[contained]] = True
+        # break ties of boundary targets in favor of the last zone
+        boundary = np.flatnonzero(~inside[target])
+        boundary = boundary[np.lexsort((zone[boundary], target[boundary]))]
+        last = np.ones(len(boundary), dtype=bool)
+        last[:-1] = target[boundary][1:] != target[boundary][:-1]
+        selected = contained.copy()
+        selected[boundary[last]] = True
+        target, zone = target[selected], zone[selected]
+        order = np.lexsort((target, zone))
+        self._assignments[key] = (target[order], zone[order])
+        while len(self._assignments) > _ASSIGNMENT_CACHE_SIZE:
+            self._assignments.popitem(last=False)
+        return self._assignments[key]
+
+    @instrumented()
+    def aggregate(
+        self, response: CoverageResponse, quantiles: Sequence[float] = (0.5, 0.9)
+    ) -> List[ZoneStatistics]:
+        """
+        Computes the coverage statistics of each zone from a coverage response,
+        including `quantiles` (0 to 1) of target mean revisit times.
+        """
+        number_zones = len(self)
+        records = response.target_records
+        index = target_index(response.targets, [record.target_id for record in records])
+        weights = target_weights(response.targets)[index]
+        accessed = np.array(
+            [record.number_samples > 0 for record in records], dtype=bool
+        )
+        revisit = np.array(
+            [
+                (
+                    np.nan
+                    if record.mean_revisit is None
+                    else record.mean_revisit.total_seconds()
+                )
+                for record in records
+            ]
+        )
+        # map record positions to assigned target positions
+        position = np.full(len(response.targets), -1)
+        position[index] = np.arange(len(records))
+        target, zone = self.assign(response.targets)
+        selected = position[target] >= 0
+        record, zone = position[target][selected], zone[selected]
+        weight = weights[record]
+
+        number_targets = np.bincount(zone, minlength=number_zones)
+        area = np.bincount(zone, weights=weight, minlength=number_zones)
+        covered = np.bincount(
+            zone, weights=weight * accessed[record], minlength=number_zones
+        )
+        revisited = ~np.isnan(revisit[record])
+        zone_r, weight_r, revisit_r = (
+            zone[revisited],
+            weight[revisited],
+            revisit[record][revisited],
+        )
+        revisit_area = np.bincount(zone_r, weights=weight_r, minlength=number_zones)
+        revisit_sum = np.bincount(
+            zone_r, weights=weight_r * revisit_r, minlength=number_zones
+        )
+        with np.errstate(divide="ignore"):
+            inverse_sum = np.bincount(
+                zone_r, weights=weight_r / revisit_r, minlength=number_zones
+            )
+
+        # weighted quantiles from cumulative weights of sorted revisits per zone
+        order = np.lexsort((revisit_r, zone_r))
+        zone_r, weight_r, revisit_r = zone_r[order], weight_r[order], revisit_r[order]
+        bounds = np.searchsorted(zone_r, np.arange(number_zones + 1))
+        cumulative = np.cumsum(weight_r)
+        prior = np.r_[0, cumulative][bounds[:-1]]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            rank = zone_r + (cumulative - prior[zone_r]) / revisit_area[zone_r]
+        percentiles = {}
+        for q in quantiles:
+            k = np.searchsorted(rank, np.arange(number_zones) + q, side="left")
+            k = np.clip(k, bounds[:-1], np.maximum(bounds[1:] - 1, bounds[:-1]))
+            percentiles[f"p{100 * q:g}"] = (
+                revisit_r[np.minimum(k, len(revisit_r) - 1)]
+                if len(revisit_r)
+                else np.zeros(number_zones)
+            )
+        count("assignments", len(zone))
+
+        statistics = []
+        for z, zone_id in enumerate(self.zone_ids):
+            has_revisit = bounds[z + 1] > bounds[z]
+            statistics.append(
+                ZoneStatistics(
+                    zone_id=zone_id,
+                    number_targets=int(number_targets[z]),
+                    area=area[z],
+                    coverage_fraction=covered[z] / area[z] if area[z] > 0 else 0,
+                    mean_revisit=(
+                        timedelta(seconds=revisit_sum[z] / revisit_area[z])
+                        if has_revisit
+                        else None
+                    ),
+                    harmonic_mean_revisit=(
+                        timedelta(seconds=revisit_area[z] / inverse_sum[z])
+                        if has_revisit
+                        else None
+                    ),
+                    percentile_revisit=(
+                        {
+                            name: timedelta(seconds=values[z])
+                            for name, values in percentiles.items()
+                        }
+                        if has_revisit
+                        else {}
+                    ),
+                )
+            )
+        return statistics
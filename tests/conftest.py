@@ -0,0 +1,26 @@
+from datetime import timedelta
+
+import pytest
+
+from eose.access import AccessRequest
+from eose.benchmarks import EPOCH, walker_constellation
+from eose.grids import UniformAngularGrid
+from eose.orbits import Propagator
+
+
+@pytest.fixture
+def satellites():
+    return walker_constellation(4, 2)
+
+
+@pytest.fixture
+def access_request(satellites):
+    return AccessRequest(
+        start=EPOCH,
+        duration=timedelta(hours=6),
+        time_step=timedelta(seconds=60),
+        satellites=satellites,
+        targets=UniformAngularGrid(delta_latitude=30, delta_longitude=30).as_targets(),
+        payload_ids=["sensor"],
+        propagator=Propagator.SGP4,
+    )
@@ -0,0 +1,34 @@
+from datetime import timedelta
+
+from eose import analysis
+from eose.access import AccessResponse
+from eose.coverage import CoverageRequest, CoverageResponse
+
+
+def test_default_json_unchanged(access_request):
+    response = analysis.access(access_request)
+    data = response.model_dump(mode="json")
+    assert "samples" not in data
+    assert any(record["samples"] for record in data["target_records"])
+    schema = AccessResponse.model_json_schema(mode="serialization")
+    assert "target_records" in schema["properties"]
+
+
+def test_compact_round_trip(access_request):
+    response = analysis.access(access_request)
+    record = next(record for record in response.target_records if record.samples)
+    record.samples[0].duration += timedelta(microseconds=123)
+    data = response.to_compact()
+    assert all("samples" not in record for record in data["target_records"])
+    assert AccessResponse.from_compact(data) == response
+
+
+def test_coverage_compact_round_trip(access_request):
+    response = analysis.coverage(
+        CoverageRequest(**analysis.access(access_request).model_dump())
+    )
+    assert CoverageResponse.from_compact(response.to_compact()) == response
+    table = response.to_sample_table()
+    assert len(table) == sum(len(record.samples) for record in response.target_records)
+    empty = response.model_copy(update=dict(target_records=[]))
+    assert len(empty.to_sample_table()) == 0
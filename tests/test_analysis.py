@@ -0,0 +1,149 @@
+from datetime import timedelta
+
+import numpy as np
+import pytest
+
+from eose import analysis
+from eose.coverage import CoverageRequest
+from eose.crosslinks import CrosslinkRequest
+from eose.datametrics import DataMetricsRequest
+from eose.propagation import PropagationRequest
+
+
+def integer_ids(request):
+    return request.model_copy(
+        update=dict(
+            satellites=[
+                satellite.model_copy(update=dict(id=k))
+                for k, satellite in enumerate(request.satellites)
+            ]
+        )
+    )
+
+
+def test_datametrics_integer_satellite_ids(access_request):
+    access = analysis.access(integer_ids(access_request))
+    response = analysis.datametrics(DataMetricsRequest(**access.model_dump()))
+    samples = [
+        sample for record in response.target_records for sample in record.samples
+    ]
+    assert samples
+    assert all(sample.instantaneous_metrics for sample in samples)
+
+
+def test_coverage_omits_integer_satellite_ids(access_request):
+    access = analysis.access(integer_ids(access_request))
+    omitted = analysis.coverage(
+        CoverageRequest(**access.model_dump(), omit_satellite_ids=[0, 1, 2, 3])
+    )
+    assert omitted.coverage_fraction == 0
+    assert all(record.number_samples == 0 for record in omitted.target_records)
+    assert (
+        analysis.coverage(CoverageRequest(**access.model_dump())).coverage_fraction > 0
+    )
+
+
+def test_tile_intervals_snap_to_time_grid():
+    time_step = 60_000_000
+    period = 5_400_123_456
+    index, start, end = analysis.tile_intervals(
+        np.array([0, 1]),
+        np.array([0, 10 * time_step]),
+        np.array([2 * time_step, 12 * time_step]),
+        period,
+        10 * period,
+        time_step,
+    )
+    assert len(index) == 21
+    assert np.all(start % time_step == 0)
+    assert np.all(end[end < 10 * period] % time_step == 0)
+    assert np.all(np.abs(start[index == 0] - period * np.arange(11)) <= time_step / 2)
+
+
+def test_access_reports_repeat_tiling(access_request):
+    # 15 revolutions per nodal day (a one-day repeat ground track)
+    satellite = access_request.satellites[0]
+    satellite = satellite.model_copy(
+        update=dict(orbit=satellite.orbit.model_copy(update=dict(mean_motion=15.19722)))
+    )
+    request = access_request.model_copy(
+        update=dict(satellites=[satellite], duration=timedelta(days=3))
+    )
+    tiled = analysis.access(request)
+    (record,) = tiled.tiling_records
+    assert record.satellite_id == satellite.id
+    assert (record.cycle.revolutions, record.cycle.days) == (15, 1)
+    assert 0 < record.drift <= analysis.REPEAT_TOLERANCE
+    assert record.time_error == request.time_step / 2
+
+    # tiled samples of positive duration are within a time step of computed
+    # samples (grazing samples may appear or vanish within the error bounds)
+    untiled = analysis.access(request, tile_repeats=False)
+    assert untiled.tiling_records == []
+    for samples, others in [
+        (r.samples, u.samples)
+        for r, u in zip(tiled.target_records, untiled.target_records)
+    ] + [
+        (u.samples, r.samples)
+        for r, u in zip(tiled.target_records, untiled.target_records)
+    ]:
+        for sample in samples:
+            assert sample.duration == timedelta(0) or any(
+                abs(sample.start - other.start) <= request.time_step
+                and abs(sample.duration - other.duration) <= request.time_step
+                for other in others
+            )
+    coverage = analysis.coverage(CoverageRequest(**tiled.model_dump()))
+    assert coverage.tiling_records == tiled.tiling_records
+
+    with pytest.raises(ValueError):
+        analysis.access(request, repeat_tolerance=-1)
+
+
+def test_access_index_not_stale(access_request):
+    response = analysis.access(access_request)
+    assert len(response.index) > 0
+    empty = response.model_copy(
+        update=dict(
+            target_records=[
+                record.model_copy(update=dict(samples=[]))
+                for record in response.target_records
+            ]
+        )
+    )
+    assert len(empty.index) == 0
+    assert len(response.index) > 0
+    response.target_records[0] = empty.target_records[0]
+    response.target_records[1].samples.clear()
+    assert len(response.index) == sum(
+        len(record.samples) for record in response.target_records
+    )
+    assert response == response.model_copy(deep=True)
+    sample = next(
+        sample for record in response.target_records for sample in record.samples
+    )
+    sample.duration += timedelta(hours=1)
+    assert np.max(response.index.sample_end - response.index.sample_start) >= 3.6e9
+
+
+def test_crosslinks_require_identical_time_grid(access_request):
+    propagation = analysis.propagate(
+        PropagationRequest(
+            **access_request.model_dump(
+                include={"start", "duration", "time_step", "satellites", "propagator"}
+            )
+        )
+    )
+    request = CrosslinkRequest(**propagation.model_dump())
+    assert analysis.crosslinks(request).pair_records
+    records = list(request.satellite_records)
+    records[1] = records[1].model_copy(
+        update=dict(
+            samples=[
+                sample.model_copy(update=dict(time=sample.time + timedelta(seconds=1)))
+                for sample in records[1].samples
+            ]
+        )
+    )
+    with pytest.raises(ValueError):
+        analysis.crosslinks(request.model_copy(update=dict(satellite_records=records)))
@@ -0,0 +1,49 @@
+import importlib.util
+
+import numpy as np
+import pytest
+
+from eose.backends import Backend, TatcBackend, get_backend
+from eose.propagation import PropagationRequest
+
+
+def test_backend_is_abstract():
+    with pytest.raises(TypeError):
+        Backend()
+
+
+@pytest.mark.skipif(
+    importlib.util.find_spec("tatc") is not None, reason="tatc is installed"
+)
+def test_tatc_backend_requires_tatc():
+    with pytest.raises(ImportError):
+        get_backend("tatc")
+
+
+def test_tatc_backend_matches_builtin(access_request):
+    pytest.importorskip("tatc")
+    builtin, tatc = get_backend("builtin"), TatcBackend()
+
+    request = PropagationRequest(
+        **access_request.model_dump(include=set(PropagationRequest.model_fields))
+    )
+    expected = builtin.propagate(request)
+    response = tatc.propagate(request)
+    for record, other in zip(response.satellite_records, expected.satellite_records):
+        assert np.allclose(
+            [sample.position for sample in record.samples],
+            [sample.position for sample in other.samples],
+            atol=1e3,
+        )
+
+    def accessed(intervals):
+        return {
+            (str(satellite_id), str(instrument_id)): set(index.tolist())
+            for satellite_id, instrument_id, index, _, _ in intervals
+        }
+
+    expected = accessed(builtin.access_intervals(access_request))
+    actual = accessed(tatc.access_intervals(access_request))
+    assert set(actual) == set(expected)
+    for key, targets in expected.items():
+        assert len(targets & actual[key]) >= 0.9 * len(targets | actual[key])
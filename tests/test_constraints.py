@@ -0,0 +1,96 @@
+import math
+
+import numpy as np
+import pytest
+
+from eose import analysis
+from eose.access import AccessConstraints
+
+RADIUS = 6378137.0
+ALTITUDE = 550e3
+# Earth central angles (degrees) of equatorial targets from the sub-satellite point
+ANGLES = np.array([0.0, 5.0, 10.0, 15.0])
+
+
+@pytest.fixture
+def geometry():
+    angle = np.radians(ANGLES)
+    normals = np.column_stack((np.cos(angle), np.sin(angle), np.zeros(len(angle))))
+    position = np.tile([RADIUS + ALTITUDE, 0.0, 0.0], (len(angle), 1))
+    return position, RADIUS * normals - position, normals
+
+
+def spherical_angles(angle):
+    # slant range, elevation and look angle by the laws of cosines and sines
+    angle = math.radians(angle)
+    distance = math.sqrt(
+        (RADIUS + ALTITUDE) ** 2
+        + RADIUS**2
+        - 2 * RADIUS * (RADIUS + ALTITUDE) * math.cos(angle)
+    )
+    elevation = math.degrees(
+        math.acos((RADIUS + ALTITUDE) * math.sin(angle) / distance)
+    )
+    look = math.degrees(math.asin(RADIUS * math.sin(angle) / distance))
+    return distance, elevation, look
+
+
+def test_geometric_constraints(geometry):
+    distance, elevation, look = spherical_angles(ANGLES[2])
+    for constraints in [
+        AccessConstraints(max_range=distance + 1),
+        AccessConstraints(min_elevation=elevation - 0.01),
+        AccessConstraints(max_look_angle=look + 0.01),
+    ]:
+        mask = analysis.constraint_mask(*geometry, constraints)
+        assert mask.tolist() == [True, True, True, False]
+    mask = analysis.constraint_mask(
+        *geometry, AccessConstraints(min_elevation=elevation + 0.01, max_range=1e7)
+    )
+    assert mask.tolist() == [True, True, False, False]
+    assert analysis.constraint_mask(*geometry, AccessConstraints()).all()
+
+
+def test_solar_zenith_constraint(geometry):
+    sun = np.array([[1.0, 0.0, 0.0], [0.0, -1.0, 0.0]])
+    constraints = AccessConstraints(max_solar_zenith=7.5)
+    mask = analysis.constraint_mask(
+        *geometry, constraints, sun, np.zeros(len(ANGLES), dtype=int)
+    )
+    assert mask.tolist() == [True, True, False, False]
+    mask = analysis.constraint_mask(
+        *geometry, constraints, sun, np.ones(len(ANGLES), dtype=int)
+    )
+    assert not mask.any()
+    with pytest.raises(ValueError):
+        analysis.constraint_mask(*geometry, constraints)
+
+
+def test_constrained_access_is_subset(access_request):
+    unconstrained = analysis.access(access_request)
+    for constraints in [
+        AccessConstraints(min_elevation=60),
+        AccessConstraints(max_solar_zenith=90),
+    ]:
+        response = analysis.access(
+            access_request.model_copy(update=dict(constraints=constraints))
+        )
+        samples = [
+            (sample, other.samples)
+            for record, other in zip(
+                response.target_records, unconstrained.target_records
+            )
+            for sample in record.samples
+        ]
+        assert (
+            0
+            < len(samples)
+            < sum(len(record.samples) for record in unconstrained.target_records)
+        )
+        for sample, others in samples:
+            assert any(
+                other.start <= sample.start
+                and sample.start + sample.duration <= other.start + other.duration
+                and sample.satellite_id == other.satellite_id
+                for other in others
+            )
@@ -0,0 +1,58 @@
+from pandas import isna
+
+from eose import analysis
+from eose.coverage import CoverageRequest
+from eose.datametrics import DataMetricsRequest
+
+
+def assert_geometry(data, targets):
+    positions = {target.id: target.position for target in targets}
+    for target_id, point in zip(data["target_id"], data.geometry):
+        assert point.coords[0] == tuple(positions[target_id])
+
+
+def assert_samples(data, response):
+    samples = [
+        (record.target_id, sample)
+        for record in response.target_records
+        for sample in record.samples
+    ]
+    assert samples
+    assert len(data) == len(samples)
+    assert str(data["start"].dt.tz) == "UTC"
+    assert data["duration"].dtype.kind == "m"
+    assert list(data["target_id"]) == [target_id for target_id, _ in samples]
+    assert list(data["satellite_id"]) == [sample.satellite_id for _, sample in samples]
+    assert list(data["start"]) == [sample.start for _, sample in samples]
+    assert list(data["duration"]) == [sample.duration for _, sample in samples]
+    assert_geometry(data, response.targets)
+
+
+def test_access_dataframe(access_request):
+    response = analysis.access(access_request)
+    assert_samples(response.as_dataframe(), response)
+
+
+def test_coverage_dataframe(access_request):
+    response = analysis.coverage(
+        CoverageRequest(**analysis.access(access_request).model_dump())
+    )
+    data = response.as_dataframe()
+    assert list(data["target_id"]) == [
+        record.target_id for record in response.target_records
+    ]
+    assert list(data["number_samples"]) == [
+        record.number_samples for record in response.target_records
+    ]
+    assert [None if isna(value) else value for value in data["mean_revisit"]] == [
+        record.mean_revisit for record in response.target_records
+    ]
+    assert_geometry(data, response.targets)
+
+
+def test_datametrics_dataframe(access_request):
+    access = analysis.access(access_request)
+    response = analysis.datametrics(DataMetricsRequest(**access.model_dump()))
+    data = response.as_dataframe()
+    assert_samples(data, response)
+    assert all(len(metrics) > 0 for metrics in data["instantaneous_metrics"])
@@ -0,0 +1,23 @@
+import numpy as np
+
+from eose import analysis
+from eose.datavolume import DataVolumeTimeline
+
+
+def test_data_volume_integer_satellite_ids(access_request):
+    response = analysis.access(access_request)
+    renamed = analysis.access(
+        access_request.model_copy(
+            update=dict(
+                satellites=[
+                    satellite.model_copy(update=dict(id=k))
+                    for k, satellite in enumerate(access_request.satellites)
+                ]
+            )
+        )
+    )
+    expected = DataVolumeTimeline.from_response(response)
+    timeline = DataVolumeTimeline.from_response(renamed)
+    assert np.all(expected.cumulative[:, -1] > 0)
+    assert np.allclose(timeline.cumulative, expected.cumulative)
+    assert np.allclose(timeline.get_peak_storage(0.5), expected.get_peak_storage(0.5))
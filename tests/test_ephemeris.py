@@ -0,0 +1,68 @@
+from datetime import timedelta
+
+import numpy as np
+import pytest
+
+from eose import analysis
+from eose.ephemeris import EphemerisStore
+from eose.propagation import PropagationRequest
+
+
+@pytest.fixture
+def propagation_request(access_request):
+    return PropagationRequest(
+        **access_request.model_dump(include=set(PropagationRequest.model_fields))
+    )
+
+
+def test_write_load_round_trip(propagation_request, tmp_path):
+    response = analysis.propagate(propagation_request)
+    EphemerisStore.write(tmp_path / "ephemeris.bin", response)
+    store = EphemerisStore(tmp_path / "ephemeris.bin")
+    assert store.start == response.start
+    assert store.time_step == response.time_step
+    assert store.frame == response.frame
+    assert store.satellite_ids == [
+        record.satellite_id for record in response.satellite_records
+    ]
+    for record in response.satellite_records:
+        assert store.to_record(record.satellite_id) == record
+
+    record = response.satellite_records[1]
+    start = response.start + timedelta(minutes=90)
+    end = start + timedelta(minutes=30)
+    samples = store.samples(record.satellite_id, start, end)
+    assert isinstance(samples.base, np.memmap)
+    assert list(store.times(samples).astype(object)) == [
+        sample.time.replace(tzinfo=None)
+        for sample in record.samples
+        if start <= sample.time <= end
+    ]
+    assert store.to_record(record.satellite_id, start, end).samples == [
+        sample for sample in record.samples if start <= sample.time <= end
+    ]
+
+
+def test_interpolate_between_steps(propagation_request, tmp_path):
+    store = EphemerisStore.write(
+        tmp_path / "ephemeris.bin", analysis.propagate(propagation_request)
+    )
+    fine = analysis.propagate(
+        propagation_request.model_copy(update=dict(time_step=timedelta(seconds=20)))
+    )
+    record = fine.satellite_records[0]
+    position, velocity = store.at(
+        record.satellite_id, [sample.time for sample in record.samples]
+    )
+    assert np.allclose(position, [s.position for s in record.samples], atol=1)
+    assert np.allclose(velocity, [s.velocity for s in record.samples], atol=0.1)
+
+
+def test_invalid_files(propagation_request, tmp_path):
+    (tmp_path / "other.bin").write_bytes(b"not an ephemeris")
+    with pytest.raises(ValueError):
+        EphemerisStore(tmp_path / "other.bin")
+    response = analysis.propagate(propagation_request)
+    response.satellite_records[0].samples.pop()
+    with pytest.raises(ValueError):
+        EphemerisStore.write(tmp_path / "ephemeris.bin", response)
@@ -0,0 +1,106 @@
+from datetime import timedelta
+
+import numpy as np
+from skyfield.constants import AU_M, DAY_S
+from skyfield.framelib import itrs
+from skyfield.positionlib import ICRF
+from skyfield.sgp4lib import TEME
+
+from eose.benchmarks import EPOCH
+from eose.frames import (
+    geodetic_to_itrs,
+    get_times,
+    itrs_to_geodetic,
+    time_grid,
+    transform,
+)
+from eose.instrumentation import Tracer, span
+from eose.utils import CartesianReferenceFrame
+
+TIMES = time_grid(EPOCH, timedelta(hours=2), timedelta(minutes=10))
+
+# (N,3) circular low Earth orbit states (m, m/s) in ICRF
+_ANGLE = np.linspace(0, 2 * np.pi, len(TIMES))
+POSITION = 6.9e6 * np.column_stack(
+    (np.cos(_ANGLE), 0.6 * np.sin(_ANGLE), 0.8 * np.sin(_ANGLE))
+)
+VELOCITY = 7.6e3 * np.column_stack(
+    (-np.sin(_ANGLE), 0.6 * np.cos(_ANGLE), 0.8 * np.cos(_ANGLE))
+)
+
+
+def skyfield_states(frame):
+    position = ICRF(
+        (POSITION / AU_M).T, (VELOCITY / AU_M * DAY_S).T, t=get_times(TIMES)
+    )
+    xyz, velocity = position.frame_xyz_and_velocity(frame)
+    return xyz.m.T, velocity.m_per_s.T
+
+
+def test_icrf_to_itrs_matches_skyfield():
+    position, velocity = transform(
+        POSITION,
+        VELOCITY,
+        CartesianReferenceFrame.ICRF,
+        CartesianReferenceFrame.ITRS,
+        TIMES,
+    )
+    expected_position, expected_velocity = skyfield_states(itrs)
+    assert np.allclose(position, expected_position, atol=1e-3)
+    assert np.allclose(velocity, expected_velocity, atol=1e-6)
+
+
+def test_icrf_to_teme_matches_skyfield():
+    position, velocity = transform(
+        POSITION,
+        VELOCITY,
+        CartesianReferenceFrame.ICRF,
+        CartesianReferenceFrame.TEME,
+        TIMES,
+    )
+    expected_position, expected_velocity = skyfield_states(TEME)
+    assert np.allclose(position, expected_position, atol=1e-3)
+    assert np.allclose(velocity, expected_velocity, atol=1e-6)
+
+
+def test_round_trips():
+    for frames in [
+        (CartesianReferenceFrame.ITRS, CartesianReferenceFrame.ICRF),
+        (CartesianReferenceFrame.TEME, CartesianReferenceFrame.ITRS),
+    ]:
+        position, velocity = transform(POSITION, VELOCITY, *frames, TIMES)
+        position, velocity = transform(position, velocity, *frames[::-1], TIMES)
+        assert np.allclose(position, POSITION, atol=1e-3)
+        assert np.allclose(velocity, VELOCITY, atol=1e-6)
+    # (S,N,3) arrays of several satellites share one rotation
+    stacked, _ = transform(
+        np.stack((POSITION, -POSITION)),
+        None,
+        CartesianReferenceFrame.ICRF,
+        CartesianReferenceFrame.ITRS,
+        TIMES,
+    )
+    assert np.allclose(stacked[0], -stacked[1])
+
+
+def test_rotations_are_cached():
+    times = time_grid(EPOCH, timedelta(hours=1), timedelta(minutes=7))
+    with Tracer() as tracer, span("transforms"):
+        for _ in range(3):
+            transform(
+                POSITION[: len(times)],
+                None,
+                CartesianReferenceFrame.ITRS,
+                CartesianReferenceFrame.TEME,
+                times,
+            )
+    summary = tracer.summary()["transforms"]
+    assert summary["frame_rotation.cache_miss"] == 1
+    assert summary["frame_rotation.cache_hit"] == 2
+
+
+def test_geodetic_round_trip():
+    coordinates = np.array([[-120.0, 35.0, 500.0], [45.0, -80.0, 0.0], [0, 0, 1e5]])
+    itrs_position = geodetic_to_itrs(coordinates)
+    assert np.allclose(itrs_position[2], [6378137.0 + 1e5, 0, 0])
+    assert np.allclose(itrs_to_geodetic(itrs_position), coordinates, atol=1e-6)
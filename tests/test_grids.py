@@ -0,0 +1,14 @@
+import math
+
+import pytest
+
+from eose.grids import AUTHALIC_RADIUS, UniformAngularGrid
+
+
+def test_uniform_angular_grid_area_opt_in():
+    grid = UniformAngularGrid(delta_longitude=30, delta_latitude=30)
+    assert all(target.area is None for target in grid.as_targets())
+    targets = grid.model_copy(update=dict(assign_area=True)).as_targets()
+    assert sum(target.area for target in targets) == pytest.approx(
+        4 * math.pi * AUTHALIC_RADIUS**2
+    )
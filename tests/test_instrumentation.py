@@ -0,0 +1,42 @@
+import io
+from datetime import timedelta
+
+import numpy as np
+
+from eose.benchmarks import EPOCH
+from eose.frames import transform
+from eose.instrumentation import Tracer, span
+from eose.io import write_features
+from eose.utils import CartesianReferenceFrame
+
+
+def test_frame_rotation_cache_counters():
+    times = [EPOCH + timedelta(seconds=k) for k in range(3)]
+    position = np.ones((3, 3))
+    with Tracer() as tracer, span("transforms"):
+        for _ in range(2):
+            transform(
+                position,
+                None,
+                CartesianReferenceFrame.ICRF,
+                CartesianReferenceFrame.ITRS,
+                times,
+            )
+    summary = tracer.summary()["transforms"]
+    assert summary["frame_rotation.cache_miss"] == 1
+    assert summary["frame_rotation.cache_hit"] == 1
+
+
+def test_write_features_bytes(access_request):
+    features = [target.as_feature() for target in access_request.targets]
+    stream = io.StringIO()
+    with Tracer() as tracer:
+        write_features(features, stream)
+    written = stream.getvalue()
+    summary = tracer.summary()["write_features"]
+    assert summary["bytes"] == len(written.encode("utf-8"))
+    assert summary["features"] == len(features)
+    # no byte accounting without hooks
+    stream = io.StringIO()
+    write_features(features, stream)
+    assert stream.getvalue() == written
@@ -0,0 +1,26 @@
+import numpy as np
+
+from eose.benchmarks import EPOCH
+from eose.intervals import IntervalArray
+
+
+def test_coalesce_by_group():
+    intervals = IntervalArray(
+        EPOCH,
+        np.array([0, 5, 0, 20, 30]),
+        np.array([10, 15, 10, 25, 40]),
+        np.array([0, 1, 1, 0, 1]),
+        np.array([0, 0, 0, 0, 0]),
+        ["A", "B"],
+        ["P"],
+    )
+    group, merged = intervals.coalesce_by(np.array([0, 0, 1, 1, 1]))
+    assert group.tolist() == [0, 1, 1, 1]
+    assert merged.start.tolist() == [0, 0, 20, 30]
+    assert merged.end.tolist() == [15, 10, 25, 40]
+    assert [merged.satellite_ids[k] for k in merged.satellite] == [
+        "A, B",
+        "B",
+        "A",
+        "B",
+    ]
@@ -0,0 +1,73 @@
+import io
+import json
+
+from eose import analysis
+from eose.access import AccessRecord
+from eose.coverage import CoverageRecord, CoverageRequest
+from eose.instrumentation import Tracer
+from eose.io import read_features, write_features
+from eose.propagation import PropagationRecord, PropagationRequest
+from eose.targets import TargetPoint
+
+
+def test_access_features_round_trip(access_request):
+    response = analysis.access(access_request)
+    stream = io.StringIO()
+    response.write_features(stream, newline_delimited=True)
+    stream.seek(0)
+    targets, records = zip(*AccessRecord.iter_from_features(read_features(stream)))
+    expected = [record for record in response.target_records if record.samples]
+    assert list(records) == expected
+    positions = {target.id: target.position for target in response.targets}
+    assert [target.position for target in targets] == [
+        positions[record.target_id] for record in expected
+    ]
+
+
+def test_feature_collection_matches_features(access_request, tmp_path):
+    response = analysis.access(access_request)
+    with Tracer() as tracer:
+        response.write_features(tmp_path / "access.geojson")
+    text = (tmp_path / "access.geojson").read_text()
+    assert json.loads(text) == json.loads(response.as_features().model_dump_json())
+    summary = tracer.summary()["write_features"]
+    assert summary["features"] == len(response.as_features().features)
+    assert summary["bytes"] == len(text.encode("utf-8"))
+
+
+def test_coverage_features_round_trip(access_request, tmp_path):
+    response = analysis.coverage(
+        CoverageRequest(**analysis.access(access_request).model_dump())
+    )
+    response.write_features(tmp_path / "coverage.ndjson", newline_delimited=True)
+    records = [
+        record
+        for _, record in CoverageRecord.iter_from_features(
+            read_features(tmp_path / "coverage.ndjson")
+        )
+    ]
+    assert records == response.target_records
+
+
+def test_propagation_features_round_trip(access_request):
+    response = analysis.propagate(
+        PropagationRequest(
+            **access_request.model_dump(include=set(PropagationRequest.model_fields))
+        )
+    )
+    stream = io.StringIO()
+    response.write_features(stream, newline_delimited=True)
+    stream.seek(0)
+    records = list(PropagationRecord.iter_from_features(read_features(stream)))
+    assert records == response.satellite_records
+
+
+def test_target_features_round_trip(access_request):
+    stream = io.StringIO()
+    write_features(
+        (target.as_feature() for target in access_request.targets), stream, True
+    )
+    # GeoJSON text sequence record separators are ignored
+    stream = io.StringIO("\x1e" + stream.getvalue().replace("\n", "\n\n\x1e"))
+    targets = list(TargetPoint.iter_from_features(read_features(stream)))
+    assert targets == access_request.targets
@@ -0,0 +1,128 @@
+from datetime import timedelta
+
+import numpy as np
+import pytest
+
+from eose import analysis
+from eose.frames import geodetic_to_itrs
+from eose.pointing import PointingRequest, TrackingMode, TrackingWindow
+from eose.propagation import PropagationRequest
+from eose.utils import CartesianReferenceFrame
+
+
+def rotate(quaternion, vector):
+    q, w = np.asarray(quaternion[:3]), quaternion[3]
+    t = 2 * np.cross(q, vector)
+    return vector + w * t + np.cross(q, t)
+
+
+def test_view_quaternions():
+    line_of_sight = np.array([[0, 0, 2.0], [1.0, 2.0, 3.0], [0.3, -0.2, -1.0]])
+    quaternions = analysis.view_quaternions(line_of_sight)
+    for quaternion, direction in zip(quaternions, line_of_sight):
+        assert np.allclose(
+            rotate(quaternion, [0, 0, 1]), direction / np.linalg.norm(direction)
+        )
+    assert np.allclose(
+        analysis.view_quaternions(np.array([[0, 0, -1.0]])), [[1, 0, 0, 0]]
+    )
+
+
+@pytest.fixture
+def tracking_request(access_request):
+    access = analysis.access(access_request)
+    # the first access of a target (accessed for at least one time step)
+    record, sample = next(
+        (record, sample)
+        for record in access.target_records
+        for sample in record.samples
+        if sample.duration > timedelta(0)
+    )
+    propagation = analysis.propagate(
+        PropagationRequest(
+            **access_request.model_dump(include=set(PropagationRequest.model_fields)),
+            frame=CartesianReferenceFrame.ITRS,
+        )
+    )
+    return PointingRequest(
+        **propagation.model_dump(),
+        mode=TrackingMode.TARGET_TRACKING,
+        targets=access_request.targets,
+        windows=[
+            TrackingWindow(
+                target_id=record.target_id,
+                satellite_id=sample.satellite_id,
+                start=sample.start,
+                duration=sample.duration,
+            )
+        ],
+    )
+
+
+def test_track_targets(tracking_request):
+    response = analysis.pointing(tracking_request)
+    (window,) = tracking_request.windows
+    target = next(t for t in tracking_request.targets if t.id == window.target_id)
+    target_position = geodetic_to_itrs([target.position])[0]
+    record = next(
+        r for r in response.satellite_records if r.satellite_id == window.satellite_id
+    )
+    assert any(sample.target_id is not None for sample in record.samples)
+    for sample in record.samples:
+        if window.start <= sample.time <= window.start + window.duration:
+            assert sample.target_id == window.target_id
+            # the slew angle is the off-nadir angle of the target
+            line_of_sight = target_position - np.array(sample.position)
+            nadir = -np.array(sample.position) / np.linalg.norm(sample.position)
+            off_nadir = np.degrees(
+                np.arccos(nadir @ line_of_sight / np.linalg.norm(line_of_sight))
+            )
+            assert sample.slew_angle == pytest.approx(off_nadir, abs=1e-6)
+            assert sample.view_orientation != [0, 0, 0, 1]
+        else:
+            assert sample.target_id is None
+            assert sample.slew_angle is None
+            assert sample.view_orientation == [0, 0, 0, 1]
+    (evaluated,) = record.windows
+    assert evaluated.peak_slew_rate > 0
+    assert evaluated.feasible is None
+    for other in response.satellite_records:
+        if other.satellite_id != window.satellite_id:
+            assert other.windows == []
+            assert all(sample.target_id is None for sample in other.samples)
+
+
+def test_slew_rate_feasibility(tracking_request):
+    for max_slew_rate, feasible in [(1e3, True), (1e-3, False)]:
+        response = analysis.pointing(
+            tracking_request.model_copy(update=dict(max_slew_rate=max_slew_rate))
+        )
+        windows = [w for r in response.satellite_records for w in r.windows]
+        assert [window.feasible for window in windows] == [feasible]
+
+
+def test_hidden_targets_are_not_tracked(tracking_request):
+    (window,) = tracking_request.windows
+    target = next(t for t in tracking_request.targets if t.id == window.target_id)
+    # the antipode of the tracked target is below the horizon
+    antipode = next(
+        t
+        for t in tracking_request.targets
+        if t.position[1] == -target.position[1]
+        and abs(t.position[0] - target.position[0]) == 180
+    )
+    response = analysis.pointing(
+        tracking_request.model_copy(
+            update=dict(
+                windows=[window.model_copy(update=dict(target_id=antipode.id))],
+                max_slew_rate=1.0,
+            )
+        )
+    )
+    windows = [w for r in response.satellite_records for w in r.windows]
+    assert [(w.peak_slew_rate, w.feasible) for w in windows] == [(None, None)]
+    assert all(
+        sample.target_id is None
+        for record in response.satellite_records
+        for sample in record.samples
+    )
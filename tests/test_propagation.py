@@ -0,0 +1,39 @@
+from datetime import timedelta
+
+from eose.benchmarks import EPOCH
+from eose.propagation import PropagationRecord, PropagationSample
+
+
+def test_state_arrays_not_stale():
+    samples = [
+        PropagationSample(
+            time=EPOCH + timedelta(seconds=60 * k),
+            position=[7e6, 1e3 * k, 0],
+            velocity=[0, 7.5e3, 0],
+        )
+        for k in range(3)
+    ]
+    record = PropagationRecord(satellite_id="sat", samples=samples)
+    time, position, _, step = record.state_arrays
+    assert step == 60_000_000 and position[2, 1] == 2e3
+    assert record == record.model_copy(deep=True)
+    record.samples[2].position[1] = 3e3
+    assert record.state_arrays[1][2, 1] == 3e3
+    shifted = record.model_copy(
+        update=dict(
+            samples=[
+                sample.model_copy(update=dict(time=sample.time + timedelta(hours=1)))
+                for sample in samples[:2]
+            ]
+        )
+    )
+    assert len(shifted.state_arrays[0]) == 2
+    assert len(record.state_arrays[0]) == 3
+    record.samples.append(
+        PropagationSample(
+            time=EPOCH + timedelta(seconds=150),
+            position=[7e6, 0, 0],
+            velocity=[0, 0, 0],
+        )
+    )
+    assert record.state_arrays[3] is None
@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from eose import analysis
+from eose.coverage import CoverageRequest
+from eose.grids import UniformAngularGrid
+from eose.rasters import METRICS, CoverageRaster
+
+GRID = UniformAngularGrid(delta_latitude=30, delta_longitude=30)
+
+
+@pytest.fixture
+def raster(access_request):
+    response = analysis.coverage(
+        CoverageRequest(**analysis.access(access_request).model_dump())
+    )
+    return response, CoverageRaster.from_response(response, GRID)
+
+
+def assert_rasters_equal(loaded, raster):
+    assert loaded.grid == raster.grid
+    assert loaded.start == raster.start
+    np.testing.assert_array_equal(loaded.mask, raster.mask)
+    for name in METRICS:
+        np.testing.assert_array_equal(getattr(loaded, name), getattr(raster, name))
+
+
+def test_records_match_coverage(raster):
+    response, raster = raster
+    records = list(raster.iter_records())
+    assert [record.target_id for record in records] == [
+        record.target_id for record in response.target_records
+    ]
+    for record, expected in zip(records, response.target_records):
+        assert record.number_samples == expected.number_samples
+        assert record.mean_revisit == expected.mean_revisit
+        assert record == raster.get_record(expected.target_id)
+    with pytest.raises(KeyError):
+        CoverageRaster(GRID, response.start).get_record(0)
+
+
+def test_save_load_npz(raster, tmp_path):
+    _, raster = raster
+    raster.save(tmp_path / "coverage.npz")
+    assert_rasters_equal(CoverageRaster.load(tmp_path / "coverage.npz"), raster)
+
+
+def test_save_load_netcdf(raster, tmp_path):
+    pytest.importorskip("netCDF4")
+    _, raster = raster
+    raster.save(tmp_path / "coverage.nc")
+    assert_rasters_equal(CoverageRaster.load(tmp_path / "coverage.nc"), raster)
+
+
+def test_set_intervals_replaces_metrics(access_request):
+    raster = CoverageRaster(GRID, access_request.start)
+    raster.set_intervals(0, np.array([0, 100, 300]), np.array([10, 110, 310]))
+    assert raster.get_record(0).number_samples == 3
+    assert raster.max_gap[0, 0] == 190
+    raster.set_intervals(0, np.array([50]), np.array([60]))
+    assert raster.get_record(0).mean_revisit is None
+    assert np.isnan(raster.max_gap[0, 0])
+    assert raster.first_access[0, 0] == 50
+    raster.set_intervals(0, np.array([]), np.array([]))
+    assert raster.get_record(0).number_samples == 0
+    assert np.isnan(raster.first_access[0, 0])
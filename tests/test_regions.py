@@ -0,0 +1,22 @@
+from eose.geometry import Polygon
+from eose.instrumentation import Tracer
+from eose.regions import region_coverage
+from eose.targets import TargetRegion
+
+
+def test_region_coverage_propagates_once_and_clips_bounds(access_request):
+    region = TargetRegion(
+        id="edge",
+        region=Polygon(
+            type="Polygon",
+            coordinates=[[(170, 0), (180, 0), (180, 10), (170, 10), (170, 0)]],
+        ),
+    )
+    with Tracer() as tracer:
+        (record,) = region_coverage(
+            access_request, [region], delta_longitude=7, delta_latitude=7
+        )
+    assert tracer.summary()["propagate_states"]["calls"] == 1
+    assert record.number_evaluations > 0
+    assert all(-180 <= cell.bounds[0] <= cell.bounds[2] <= 180 for cell in record.cells)
+    assert abs(sum(cell.area for cell in record.cells) - record.area) < 1
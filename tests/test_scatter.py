@@ -0,0 +1,56 @@
+import math
+from datetime import timedelta
+
+from eose import analysis, scatter
+from eose.access import AccessResponse
+from eose.coverage import CoverageRequest
+from eose.instrumentation import Tracer
+
+
+def test_gather_matches_coverage(access_request, tmp_path):
+    access_request = access_request.model_copy(
+        update=dict(time_step=timedelta(seconds=10))
+    )
+    expected = analysis.coverage(
+        CoverageRequest(**analysis.access(access_request).model_dump())
+    )
+    # two windows split within the first access after half of the duration
+    boundary = min(
+        sample.start + access_request.time_step
+        for record in expected.target_records
+        for sample in record.samples
+        if sample.start >= access_request.start + access_request.duration / 2
+        and sample.duration >= 2 * access_request.time_step
+    )
+    manifest = scatter.scatter(
+        access_request,
+        tmp_path,
+        targets_per_unit=math.ceil(len(access_request.targets) / 6),
+        window=boundary - access_request.start,
+    )
+    assert len(manifest.unit_ids) == 12
+
+    assert scatter.run(tmp_path, worker=0, workers=2) == 6
+    assert len(scatter.get_pending(tmp_path)) == 6
+    assert scatter.run(tmp_path, worker=1, workers=2) == 6
+    assert scatter.get_pending(tmp_path) == []
+    # completed units are skipped when a run is restarted
+    with Tracer() as tracer:
+        assert scatter.run(tmp_path, worker=0, workers=1) == 0
+    assert tracer.summary()["run_unit"]["skipped"] == 12
+
+    unit_id = manifest.unit_ids[0]
+    result = AccessResponse.from_compact(scatter.read_result(tmp_path, unit_id))
+    unit = scatter.WorkUnit.model_validate_json(
+        (tmp_path / "units" / f"{unit_id}.json").read_text()
+    )
+    assert result.model_dump() == analysis.access(unit.request).model_dump()
+
+    response = scatter.gather(tmp_path)
+    assert response.model_dump() == expected.model_dump()
+    # samples spanning the window boundary are stitched
+    assert any(
+        sample.start < boundary < sample.start + sample.duration
+        for record in response.target_records
+        for sample in record.samples
+    )
@@ -0,0 +1,83 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from eose import analysis
+from eose.instrumentation import Tracer
+from eose.service import AnalysisService
+
+
+def window(request, start, duration):
+    return request.model_copy(
+        update=dict(start=request.start + start, duration=duration)
+    )
+
+
+def service(**kwargs):
+    return AnalysisService(executor=ThreadPoolExecutor(2), **kwargs)
+
+
+def test_overlapping_requests_coalesce(access_request):
+    first = window(access_request, timedelta(0), timedelta(hours=2))
+    second = window(access_request, timedelta(hours=1), timedelta(hours=2))
+
+    async def run():
+        async with service() as analyses:
+            return await asyncio.gather(analyses.access(first), analyses.access(second))
+
+    with Tracer() as tracer:
+        responses = asyncio.run(run())
+    summary = tracer.summary()
+    assert summary["AnalysisService.compute"]["computations"] == 1
+    assert summary["AnalysisService.submit"]["coalesced"] == 1
+    assert responses == [analysis.access(first), analysis.access(second)]
+
+
+def test_stream_segments_in_order(access_request):
+    request = window(access_request, timedelta(0), timedelta(hours=2))
+
+    async def run():
+        async with service(max_pending=2) as analyses:
+            return [
+                response
+                async for response in analyses.stream(request, timedelta(minutes=30))
+            ]
+
+    with Tracer() as tracer:
+        responses = asyncio.run(run())
+    assert [response.start for response in responses] == [
+        request.start + k * timedelta(minutes=30) for k in range(5)
+    ]
+    assert tracer.summary()["AnalysisService.compute"]["computations"] == 5
+    assert "coalesced" not in tracer.summary()["AnalysisService.submit"]
+
+
+def test_cancellation(access_request):
+    request = window(access_request, timedelta(0), timedelta(hours=2))
+
+    async def run():
+        async with service(max_pending=2) as analyses:
+            # a cancelled caller does not cancel a shared computation
+            cancelled = asyncio.ensure_future(analyses.access(request))
+            shared = asyncio.ensure_future(analyses.access(request))
+            await asyncio.sleep(0)
+            cancelled.cancel()
+            response = await shared
+            # closing a stream cancels its segments computed ahead
+            segments = analyses.stream(request, timedelta(minutes=10))
+            await segments.__anext__()
+            await segments.aclose()
+            await asyncio.sleep(0)
+            pending = [
+                task
+                for task in asyncio.all_tasks()
+                if task is not asyncio.current_task()
+                and task.get_coro().__qualname__ == "AnalysisService._submit"
+                and not task.done()
+            ]
+            return cancelled, response, pending
+
+    cancelled, response, pending = asyncio.run(run())
+    assert cancelled.cancelled()
+    assert response == analysis.access(request)
+    assert not pending
@@ -0,0 +1,18 @@
+import numpy as np
+
+from eose.benchmarks import EPOCH
+from eose.sketches import RevisitSketch
+
+
+def test_quantile_bounds():
+    sketch = RevisitSketch(EPOCH, ["A", "B"])
+    second = 1_000_000
+    sketch.update(
+        np.array([0, 0, 0]),
+        np.array([0, 130, 800]) * second,
+        np.array([10, 140, 810]) * second,
+    )
+    assert sketch.get_quantile(0)[0] == 120
+    assert sketch.get_quantile(1)[0] == 660
+    assert np.isnan(sketch.get_quantile(0)[1])
+    assert np.sum(sketch.histogram) == 2
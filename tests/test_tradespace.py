@@ -0,0 +1,39 @@
+from eose import analysis
+from eose.coverage import CoverageRequest
+from eose.instrumentation import Tracer
+from eose.tradespace import TradeSpace
+
+
+def test_subsets_match_analysis(access_request):
+    trade_space = TradeSpace(access_request)
+    for satellites in [
+        access_request.satellites[:1],
+        access_request.satellites[1:3],
+        access_request.satellites,
+    ]:
+        request = access_request.model_copy(update=dict(satellites=satellites))
+        access = analysis.access(request)
+        assert trade_space.access(satellites) == access
+        coverage = analysis.coverage(CoverageRequest(**access.model_dump()))
+        assert trade_space.coverage(satellites) == coverage
+        statistics = trade_space.statistics(satellites)
+        assert statistics.coverage_fraction == coverage.coverage_fraction
+        assert statistics.harmonic_mean_revisit == coverage.harmonic_mean_revisit
+
+
+def test_cache_hits(access_request):
+    satellites = access_request.satellites
+    trade_space = TradeSpace(access_request.model_copy(update=dict(satellites=[])))
+    with Tracer() as tracer:
+        trade_space.add(satellites[:2])
+        trade_space.coverage(satellites[:3])
+        # renamed copies of cached satellites share their access
+        trade_space.access(
+            [
+                satellite.model_copy(update=dict(id=f"copy-{satellite.id}"))
+                for satellite in satellites
+            ]
+        )
+    summary = tracer.summary()["TradeSpace.add"]
+    assert summary["cache_miss"] == 4
+    assert summary["cache_hit"] == 2 + 3
@@ -0,0 +1,31 @@
+from eose import analysis
+from eose.coverage import CoverageRequest
+from eose.updates import update_coverage
+
+
+def full_coverage(request, **kwargs):
+    return analysis.coverage(
+        CoverageRequest(**analysis.access(request).model_dump(), **kwargs)
+    )
+
+
+def test_update_matches_full_coverage(access_request):
+    previous = full_coverage(access_request, omit_payload_ids=["other"])
+    satellites = list(access_request.satellites)
+    orbit = satellites[1].orbit
+    satellites[1] = satellites[1].model_copy(
+        update=dict(
+            orbit=orbit.model_copy(
+                update=dict(mean_anomaly=(orbit.mean_anomaly + 20) % 360)
+            )
+        )
+    )
+    request = CoverageRequest(
+        **access_request.model_copy(
+            update=dict(satellites=satellites[:-1])
+        ).model_dump(),
+        omit_payload_ids=["other"],
+    )
+    assert update_coverage(previous, request) == full_coverage(
+        request, omit_payload_ids=["other"]
+    )
@@ -0,0 +1,29 @@
+from eose import zones
+from eose.targets import TargetPoint
+from eose.zones import ZoneIndex, latitude_bands
+
+
+def test_band_edges_assigned_once():
+    index = ZoneIndex(latitude_bands(10))
+    latitudes = [-90, -5, 0, 10, 45, 90]
+    targets = [
+        TargetPoint(id=k, position=[180 if k % 2 else 0, latitude])
+        for k, latitude in enumerate(latitudes)
+    ]
+    target, zone = index.assign(targets)
+    assert sorted(target.tolist()) == list(range(len(targets)))
+    assert [index.zone_ids[z] for z in zone[target.argsort()]] == [
+        "-90:-80",
+        "-10:0",
+        "0:10",
+        "10:20",
+        "40:50",
+        "80:90",
+    ]
+
+
+def test_assignment_cache_is_bounded():
+    index = ZoneIndex(latitude_bands(30))
+    for k in range(2 * zones._ASSIGNMENT_CACHE_SIZE):
+        index.assign([TargetPoint(id=0, position=[0, k])])
+    assert len(index._assignments) == zones._ASSIGNMENT_CACHE_SIZE